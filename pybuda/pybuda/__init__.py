@@ -46,7 +46,7 @@ from .cpudevice import CPUDevice
 from .gpudevice import GPUDevice
 from .ttdevice import TTDevice
 from .ttcluster import TTCluster
-from .run import run_inference, run_training, shutdown, initialize_pipeline, run_forward, run_backward, run_optimizer, run_schedulers, run_generate, run_generative_inference, get_parameter_checkpoint, get_parameter_gradients, update_device_parameters, error_raised, get_loss_queue, sync, get_intermediates_queue
+from .run import run_inference, run_training, shutdown, initialize_pipeline, run_forward, run_backward, run_optimizer, run_schedulers, run_generate, run_generative_inference, get_parameter_checkpoint, get_parameter_gradients, update_device_parameters, error_raised, get_loss_queue, sync, get_dispatch_stats, get_intermediates_queue
 from .compile import pybuda_compile
 from .torch_compile import compile_torch#, get_default_device, get_available_devices, torch_device
 from .compiled_graph_state import CompiledGraphState 
@@ -60,6 +60,14 @@ from ._C.backend_api import BackendType, BackendDevice
 from ._C import DataFormat, MathFidelity
 from ._C import k_dim
 from .run.api import detect_available_devices
+from .run.async_api import AsyncInferencePipeline
+from .run.batching import DynamicBatcher
 
 import pybuda.op as op
-import pybuda.transformers
+
+def __getattr__(name):
+    # pybuda.transformers pulls in HuggingFace transformers, so only import it when it's used
+    if name == "transformers":
+        import importlib
+        return importlib.import_module(".transformers", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,7 +6,7 @@
 import threading
 import queue
 import time
-from typing import Optional, List, Tuple, Dict, Union
+from typing import Callable, Optional, List, Tuple, Dict, Union
 
 import torch
 import torch.multiprocessing as mp
@@ -24,6 +24,8 @@ from pybuda._C.balancer import OutputHostTM
 from .tensor import Tensor, consteval_input, pytorch_tensor_to_tensor_desc, pad_pytorch_tensor_to_buda, tensor_desc_to_pytorch_tensor, get_device_constant_and_parameters, const_eval_tensor
 from .utils import detach_tensors
 from .config import PerfTraceLevel
+from .dispatch import get_or_shutdown, register_queue
+from . import timeline
 
 class BackendAPI:
 
@@ -86,7 +88,8 @@ class BackendAPI:
         # Create and start a feeder thread, if requested
         if feeder_thread:
             self.feeder_thread_queue = queue.Queue()
-            self.feeder_thread = threading.Thread(target=self.feeder_thread_main, args=(self.feeder_thread_queue,))
+            register_queue(self.shutdown_event, self.feeder_thread_queue, local=True)
+            self.feeder_thread = threading.Thread(target=self.feeder_thread_main, args=(self.feeder_thread_queue,), name="pybuda_feeder")
             self.feeder_thread.start()
 
     def shutdown(self):
@@ -123,17 +126,12 @@ class BackendAPI:
         """
         logger.info("Feeder thread on {} starting", self)
         while True:
-            while True:
-                try:
-                    cmd = cmdqueue.get(timeout=0.1)
-                    break
-                except queue.Empty as _:
-                    if self.shutdown_event is not None and self.shutdown_event.is_set():
-                        logger.debug("Ending feeder thread on {} due to shutdown event", self)
-                        if self.final_barrier is not None:
-                            self.final_barrier.abort()
-                        return # got a signal to shutdown and end the process
-                    continue
+            cmd = get_or_shutdown(cmdqueue, self.shutdown_event)
+            if cmd is None:
+                logger.debug("Ending feeder thread on {} due to shutdown event", self)
+                if self.final_barrier is not None:
+                    self.final_barrier.abort()
+                return # got a signal to shutdown and end the process
             
             if cmd == "token":
                 continue
@@ -163,6 +161,7 @@ class BackendAPI:
             else:
                 raise RuntimeError(f"Invalid feeder thread command: {cmd}")
 
+    @timeline.traced()
     def schedule_run_forward(self, loop_count: int):
         if self.feeder_thread_queue:
             self._schedule_feeder_cmd(("fwd", loop_count))
@@ -299,6 +298,7 @@ class BackendAPI:
         return [self.get_output_queue_descriptor(output_queue_name) for op_name, output_queue_name in self.compiled_graph_state.ordered_intermediate_activation_names]
 
     @classmethod
+    @timeline.traced()
     def read_queues(
         cls, 
         queues: List[DramIODesc], 
@@ -309,8 +309,15 @@ class BackendAPI:
         rd_ptr: int = -1, 
         shutdown_event: Optional[EventClass] = None, 
         clone: bool = False,
-        has_microbatch_dim: bool = True
+        has_microbatch_dim: bool = True,
+        out_tensors: Optional[List[Optional[torch.Tensor]]] = None,
+        narrow_plans: Optional[List[Callable]] = None
     ) -> List[Tensor]:
+        """
+        Read outputs from queues, narrowing them to original shapes. If out_tensors are given, outputs are copied
+        into the non-None ones instead of being cloned or returned as views into the backend's buffers. If
+        narrow_plans are given (see `compile_narrow_plan`), they're used for narrowing instead of the shapes and transforms.
+        """
         ret = []
         tensors = []
         out_descs = []
@@ -321,13 +328,14 @@ class BackendAPI:
             out_desc = PytorchTensorDesc()
             timeout = 10 # TODO: add control
             resp = BackendStatusCode.RuntimeError
-            for _ in range(timeout):
-                resp = get_output(outq, out_desc, single_output, 1, rd_ptr)
-                if resp != BackendStatusCode.TimeoutError:
-                    break
+            with timeline.span("get_output", queue=outq.name):
+                for _ in range(timeout):
+                    resp = get_output(outq, out_desc, single_output, 1, rd_ptr)
+                    if resp != BackendStatusCode.TimeoutError:
+                        break
 
-                if shutdown_event and shutdown_event.is_set():
-                    break
+                    if shutdown_event and shutdown_event.is_set():
+                        break
 
             if resp == BackendStatusCode.TimeoutError:
                 shutdown_event.set()
@@ -366,21 +374,27 @@ class BackendAPI:
         assert len(original_shapes) == len(tensors)
         assert len(requires_grad) == len(tensors)
         for i, tensor in enumerate(tensors):
-            tensor = tensors[i].narrow_to_original_shape(tuple(original_shapes[i]), runtime_tensor_transforms[i].reinterpreted_shape.as_list() if runtime_tensor_transforms[i] is not None else None, \
-                                                     has_microbatch_dim=has_microbatch_dim, unpadded_shape=runtime_tensor_transforms[i].unpadded_shape.as_list() if runtime_tensor_transforms[i] is not None else None)
+            out = out_tensors[i] if out_tensors is not None else None
+            if narrow_plans is not None:
+                tensor = narrow_plans[i](tensors[i], out)
+            else:
+                tensor = tensors[i].narrow_to_original_shape(tuple(original_shapes[i]), runtime_tensor_transforms[i].reinterpreted_shape.as_list() if runtime_tensor_transforms[i] is not None else None, \
+                                                         has_microbatch_dim=has_microbatch_dim, unpadded_shape=runtime_tensor_transforms[i].unpadded_shape.as_list() if runtime_tensor_transforms[i] is not None else None, out=out)
 
             if requires_grad[i]:
                 tensor = tensor.detach()
                 tensor.set_requires_grad(True)
 
             if clone:
-                tensor = tensor.clone()
+                if out is None:
+                    tensor = tensor.clone()
                 free_tensor(out_descs[i])
             ret.append(tensor)
         logger.debug("Done reading queues")
         return ret
 
     @classmethod
+    @timeline.traced()
     def pop_queues(cls, queues: List[DramIODesc], single_output: bool):
         for outq in queues:
             logger.debug("Popping from queue {}", outq.name)
@@ -411,6 +425,7 @@ class BackendAPI:
             assert push_input(queue_desc, tensor_desc, single_input, timeout_secs, ram_address) == BackendStatusCode.Success, "Error while pushing inputs"
 
     @classmethod
+    @timeline.traced()
     def push_to_queues(cls, ordered_input_queues: List[DramIODesc], tensors: List[PytorchTensorDesc], single_input: bool):
         assert len(tensors) == len(ordered_input_queues), "Incorrect number of tensors provided on input"
         for i, inq in enumerate(ordered_input_queues):
@@ -8,7 +8,7 @@ import torch
 from loguru import logger
 
 from .ttdevice import TTDevice
-from .tensor import Tensor, pad_pytorch_tensor_to_buda
+from .tensor import Tensor, TensorFromTrace, pad_pytorch_tensor_to_buda
 from pybuda._C import (
     BudaNetlist,
     link_past_cache_ios,
@@ -55,6 +55,7 @@ from pybuda import PyBudaModule
 from .tensor import Tensor, to_pt_tensors, to_buda_tensors
 from . import ci, utils
 from pybuda.tools.net2reportify import net2placement
+from pybuda.op.eval.sparse_utils import get_picker_matrix_cache_stats
 
 LAST_SUCCESSFUL_STAGE = None
 def init_log_last_successful_compile_stage():
@@ -116,7 +117,6 @@ class CompileResults:
     and, optionally golden results for final output and intermediates, if desired.
     """
     outputs: List[Tensor]
-    golden_outputs: List[torch.Tensor]
     golden_intermediates: Dict[str, torch.Tensor]
     initial_graph: Graph
     lowered_graph: Graph
@@ -125,6 +125,20 @@ class CompileResults:
 
     pass_specific_output_kwargs: Dict[str, Any] = {}
 
+    _golden_outputs: Optional[List[torch.Tensor]] = None
+
+    @property
+    def golden_outputs(self) -> List[torch.Tensor]:
+        # Evaluated on first read, so a shapes-only trace only pays for reference values when they are used
+        if self._golden_outputs is None and getattr(self, "outputs", None):
+            TensorFromTrace.evaluate_deferred(self.outputs)
+            self._golden_outputs = [out.value() if out.has_value() else None for out in self.outputs]
+        return self._golden_outputs
+
+    @golden_outputs.setter
+    def golden_outputs(self, golden_outputs: List[torch.Tensor]):
+        self._golden_outputs = golden_outputs
+
 def calculate_grads(
         outputs: Tuple[Tensor, ...],
         device: "TTDevice",
@@ -398,6 +412,9 @@ def pybuda_compile(
 
     dump_graph(graph, graph_name, "post_autograd_passes")
 
+    picker_cache_stats = get_picker_matrix_cache_stats()
+    logger.info("Picker matrix cache: {} hits, {} misses, {} entries", picker_cache_stats["hits"], picker_cache_stats["misses"], picker_cache_stats["entries"])
+
     if verify_cfg.verify_all or verify_cfg.verify_post_autograd_passes or (verify_cfg.verify_last and should_early_stop_compilation):
         do_verify("post_autograd_passes", compiler_cfg.enable_training, graph, inputs, parameter_dict, input_grads, outputs, dev, intermediate_tensors, verify_cfg, False, losses, targets=targets)
     elif compiler_cfg.enable_training:
@@ -815,9 +832,6 @@ def generate_compile_results(
     ret.netlist_filename = netlist_filename
     ret.perf_model_results = perf_model_results
 
-    if outputs:
-        ret.golden_outputs = [out.value() if out.has_value() else None for out in outputs]
-
     if pass_specific_output_kwargs:
         ret.pass_specific_output_kwargs = pass_specific_output_kwargs
 
@@ -155,6 +155,7 @@ class CompilerConfig:
     enable_consteval: bool = True           # enable promotion of nodes to be constant evaluated where possible
     enable_auto_fusing: bool = True         # enable automatic fusing of ops
     compile_subgraphs: bool = False         # Compile each disjoint graph separately into its own program
+    trace_shapes_only: bool = False         # trace only shapes and data formats; reference values are evaluated lazily, when verification reads them
     graph_solver_self_cut_type: str = "FastCut" # which type of self-cut to use for graphsolver
     use_interactive_placer: bool = True     # use interactive placer if chosen policy supports it
     enable_enumerate_u_kt: bool = True      # Enable searching all possible matmul u_kts
@@ -317,6 +318,9 @@ class CompilerConfig:
         if "PYBUDA_OVERRIDE_DEVICE_YAML" in os.environ:
             self.backend_device_descriptor_path = os.environ["PYBUDA_OVERRIDE_DEVICE_YAML"]
 
+        if "PYBUDA_TRACE_SHAPES_ONLY" in os.environ:
+            self.trace_shapes_only = bool(int(os.environ["PYBUDA_TRACE_SHAPES_ONLY"]))
+
     def enable_amp_light(self, level: int = 1):
         if level == 0:
             return
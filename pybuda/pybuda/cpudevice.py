@@ -5,7 +5,6 @@ import collections
 from typing import Union, Tuple, List, Callable, Optional, Dict
 import queue
 
-import tensorflow as tf
 import torch
 import torch.multiprocessing as mp
 
@@ -21,8 +20,10 @@ from .compile import CompilerConfig
 from .pybudaglobal import lazy_trace_data
 from .device_connector import DeviceConnector, TransferType, DirectPusherDeviceConnector
 from .utils import detach_tensors
+from .timeline import traced
 
 from pybuda.tvm_utils import map_tf_dtype_to_pt, map_pt_dtype_to_tf
+from pybuda.lazy_imports import tf, is_loaded, is_tf_module
 
 from torch import nn
 
@@ -159,7 +160,7 @@ class CPUDevice(Device):
                 self.optimizer = CPUDevice.optimizer_f[self](module)
                 if (self.optimizer is None or 
                     (isinstance(module, torch.nn.Module) ^ isinstance(self.optimizer, torch.optim.Optimizer)) or
-                    (isinstance(module, (tf.keras.Model, tf.keras.layers.Layer)) ^ isinstance(self.optimizer, tf.keras.optimizers.legacy.SGD))
+                    (is_tf_module(module) ^ (is_loaded("tensorflow") and isinstance(self.optimizer, tf.keras.optimizers.legacy.SGD)))
                 ):
                     raise RuntimeError(f"Optimizer function for {self} didn't return a PyTorch optimizer")
             else:
@@ -181,6 +182,7 @@ class CPUDevice(Device):
                     if not isinstance(s, torch.optim.lr_scheduler._LRScheduler):
                         raise RuntimeError(f"Schedule function for {self} returned a non-scheduler")
 
+    @traced()
     def forward_pt(self, loop_count: int):
         """
         Run forward pass on each module on this device, in order
@@ -230,6 +232,7 @@ class CPUDevice(Device):
                 if self.loss_module is None:
                     # Push data on to the output or next device
                     outputs = tuple(o.to('cpu') for o in outputs)
+                    outputs = self.forward_input_dc.detach_from_ring(outputs)
                     logger.trace("Forward outputs on {}:", self)
                     #lazy_trace_data(outputs)
 
@@ -748,7 +751,7 @@ class CPUDevice(Device):
             state_dict[p] = parameters[p]
         module.module.load_state_dict(state_dict)
 
-    def update_device_parameters_tf(self, parameters: Dict[str, tf.Tensor]):
+    def update_device_parameters_tf(self, parameters: Dict[str, "tf.Tensor"]):
         self.sync() # wait until queued up commands have completed
         module: TFModule = self._get_sequential()
         # module.module.trainable_variables = parameters
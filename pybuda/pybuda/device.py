@@ -21,6 +21,8 @@ from .module import Module
 from .pybudaglobal import register_device, lazy_trace_data, set_state_changed, create_queue
 from .tensor import Tensor, buda_dataformat_to_pytorch_dtype, remove_microbatch, to_pt_tensors
 from .device_connector import DeviceConnector
+from .dispatch import DispatchStats, get_or_shutdown, register_queue
+from . import timeline
 from pybuda._C.backend_api import initialize_child_process, finish_child_process
 from pybuda._C.graph import RuntimeTensorTransform
 from .utils import detach_tensors
@@ -100,6 +102,7 @@ class Device:
         self.target_input_dc: DeviceConnector = None
         self.intermediates_dc: DeviceConnector = None # read intermediate outputs through here
         self.dc_transfer_threads : Dict[str, Tuple[threading.Thread, queue.Queue]] = {}
+        self.dispatch_stats = DispatchStats()
 
         # cpueval forward/backward intermediates
         self._saved_fw_outputs = None
@@ -142,6 +145,10 @@ class Device:
         self.final_barrier = final_barrier
         self.shutdown_event = shutdown_event
 
+        # Wake up whoever is waiting on these, on shutdown
+        for q in [self.command_queue, self._command_queue_resp, self.target_input_queue, self.recompute_input_queue]:
+            register_queue(shutdown_event, q)
+
     def place_module(self, module: Union[Module, Tuple[Module], List[Module]]):
         """
         Places a module, or list of modules, on this device for execution. Modules will be run as a sequential pipeline
@@ -202,6 +209,7 @@ class Device:
         self.modules.remove(self.loss_module)
         self.loss_module = None
 
+    @timeline.traced()
     def push_to_inputs(self, *tensors: Union[Tuple[Union[torch.Tensor, Tensor], ...], Dict[str, Union[torch.Tensor, Tensor]]]):
         """
         Push tensor(s) to module inputs, either in order, or by keyword argumet if a dictionary is used. The data will be queued 
@@ -233,7 +241,10 @@ class Device:
         if ((self._first_inputs[0].shape)[0] != (tensors[0].shape)[0]):
             raise RuntimeError("Batch size mismatch between first input and current input")
         
-        self._input_buffer.put(to_pt_tensors(tensors))
+        tensors = to_pt_tensors(tensors)
+        if self.forward_input_dc is not None:
+            tensors = self.forward_input_dc.encode_for_queue(tensors)
+        self._input_buffer.put(tensors)
 
     def push_to_target_inputs(self, *tensors):
         """
@@ -302,17 +313,12 @@ class Device:
         Optional[Dict]
             Command-specific dictionary with response data, or None in case of failures
         """
-        while True:
-            try:
-                resp = self._command_queue_resp.get(timeout=0.1)
-                break
-            except queue.Empty as _:
-                if self.shutdown_event is not None and self.shutdown_event.is_set():
-                    logger.debug("Ending process on {} due to shutdown event", self)
-                    if self.final_barrier is not None:
-                        self.final_barrier.abort()
-                    return # got a signal to shutdown and end the process
-                continue
+        resp = get_or_shutdown(self._command_queue_resp, self.shutdown_event)
+        if resp is None:
+            logger.debug("Ending process on {} due to shutdown event", self)
+            if self.final_barrier is not None:
+                self.final_barrier.abort()
+            return # got a signal to shutdown and end the process
         return resp
 
 
@@ -350,28 +356,25 @@ class Device:
             Next command from the queue, or None if shutdown_even was set
         """
 
-        while True:
-            try:
-                cmd = command_queue.get(timeout=1)
-                logger.trace("{}: Got command from queue: {}", self, cmd)
-                break
-            except queue.Empty as _:
-                if self.shutdown_event is not None and self.shutdown_event.is_set():
-                    logger.debug("Ending process on {} due to shutdown event", self)
-                    if self.final_barrier is not None:
-                        self.final_barrier.abort()
-                    self._drain_queue(command_queue)
-                    return None # got a signal to shutdown and end the process
-                continue
-            except KeyboardInterrupt as _:
-                logger.info("Keyboard interrupt detected on {}", self)
-                if self.shutdown_event is not None:
-                    self.shutdown_event.set()
-                if self.final_barrier is not None:
-                    self.final_barrier.abort()  # prevent deadlock on other processes
-                self._drain_queue(command_queue)
-                return None
+        try:
+            cmd = get_or_shutdown(command_queue, self.shutdown_event)
+        except KeyboardInterrupt as _:
+            logger.info("Keyboard interrupt detected on {}", self)
+            if self.shutdown_event is not None:
+                self.shutdown_event.set()
+            if self.final_barrier is not None:
+                self.final_barrier.abort()  # prevent deadlock on other processes
+            self._drain_queue(command_queue)
+            return None
 
+        if cmd is None:
+            logger.debug("Ending process on {} due to shutdown event", self)
+            if self.final_barrier is not None:
+                self.final_barrier.abort()
+            self._drain_queue(command_queue)
+            return None # got a signal to shutdown and end the process
+
+        logger.trace("{}: Got command from queue: {}", self, cmd)
         return cmd
 
     def push_command_response(self, resp: Dict[str, Any]):
@@ -415,6 +418,8 @@ class Device:
         """
         from .run.commands import CommandType
 
+        self.dispatch_stats.record(cmd.command_type.name, cmd.created)
+
         if cmd.command_type == CommandType.QUIT:
             logger.debug("Received SHUTDOWN command on {}", self)
             self._shutdown_threads()
@@ -513,8 +518,9 @@ class Device:
                 if direction not in self.dc_transfer_threads:
                     # Start a new thread
                     dir_q = queue.Queue()
+                    register_queue(self.shutdown_event, dir_q, local=True)
                     self.dc_transfer_threads[direction] = (
-                            threading.Thread(target=self.dc_transfer_thread, args=(direction, dir_q)),
+                            threading.Thread(target=self.dc_transfer_thread, args=(direction, dir_q), name=f"pybuda_dc_transfer_{direction}"),
                             dir_q)
                     self.dc_transfer_threads[direction][0].start()
 
@@ -557,6 +563,10 @@ class Device:
             self.sync()
             self.push_command_response({"sync": True})
 
+        elif cmd.command_type == CommandType.GET_DISPATCH_STATS:
+            logger.trace("GET_DISPATCH_STATS on {}", self)
+            self.push_command_response({"dispatch_stats": self.dispatch_stats.stats()})
+
         else:
             raise RuntimeError("Unknown command received by ", self)
 
@@ -567,20 +577,17 @@ class Device:
         Keep transfering data in a thread. One per direction.
         """
         while True:
-            try:
-                cmd = direction_queue.get(timeout=0.1)
-                logger.trace("DC transfer thread {} got cmd={}", direction, cmd)
-                if cmd == "quit":
-                    return
+            cmd = get_or_shutdown(direction_queue, self.shutdown_event)
+            if cmd is None:
+                logger.debug("Ending dc transfer thread {} on {} due to shutdown event", direction, self)
+                return
 
-                assert cmd == direction
-                self.dc_transfer(direction)
-                
-            except queue.Empty as _:
-                if self.shutdown_event is not None and self.shutdown_event.is_set():
-                    logger.debug("Ending dc transfer thread {} on {} due to shutdown event", direction, self)
-                    return 
-                continue
+            logger.trace("DC transfer thread {} got cmd={}", direction, cmd)
+            if cmd == "quit":
+                return
+
+            assert cmd == direction
+            self.dc_transfer(direction)
 
     def dc_transfer(self, direction: str):
         """
@@ -692,7 +699,8 @@ class Device:
                 cmd = self.get_next_command(self.command_queue)
                 if cmd is None:
                     break
-                done = self.run_next_command(cmd)
+                with timeline.span(cmd.command_type.name, device=self.name):
+                    done = self.run_next_command(cmd)
                 if done:
                     break
 
@@ -783,16 +791,9 @@ class Device:
             Data from the queue, or None if aborted
         """
 
-        while True:
-            try:
-                out = q.get(timeout=0.1)
-                break
-            except queue.Empty as _:
-                if self.shutdown_event is not None and self.shutdown_event.is_set():
-                    logger.trace("_read_from_mp_queue aborting on {}", self)
-                    return None # got a signal to shutdown and end the process
-                continue
-        
+        out = get_or_shutdown(q, self.shutdown_event)
+        if out is None:
+            logger.trace("_read_from_mp_queue aborting on {}", self)
         return out
 
     def _shutdown_threads(self):
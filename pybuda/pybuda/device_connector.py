@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
 
 # SPDX-License-Identifier: Apache-2.0
+import collections
+import os
 import threading
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Union, Tuple
+from typing import Callable, List, Optional, Union, Tuple
 import queue
 
 from multiprocessing.synchronize import Event as EventClass
@@ -13,18 +16,166 @@ import torch.multiprocessing as mp
 from loguru import logger
 
 from .backend import BackendAPI
-from .tensor import Tensor, pytorch_tensor_to_tensor_desc, is_equivalent_data_format, pad_pytorch_tensor_to_buda
+from .tensor import Tensor, TensorFromPytorch, pytorch_tensor_to_tensor_desc, is_equivalent_data_format, pad_pytorch_tensor_to_buda, stage_pytorch_tensor_to_buda, buda_dataformat_to_pytorch_dtype, compile_narrow_plan
 from .utils import detach_tensors, align_up
 from pybuda._C.backend_api import DramIODesc, PytorchTensorDesc
 from pybuda._C.graph import RuntimeTensorTransform, RuntimeTensorTransformType, Shape
 from pybuda._C import DataFormat
 from .pybudaglobal import TILE_DIM, create_queue
+from .dispatch import get_or_shutdown, register_queue
+from . import timeline
 
 class TransferType(Enum):
     MP_QUEUE = 1 # read from / write to a queue in shared memory (on host)
     DIRECT = 2   # read/write directly (tilize/untilize)
     NONE = 3     # no explicit transfer (i.e. device will do it on its own), so wrapper does nothing
 
+@dataclass
+class SharedRingSlot:
+    """
+    Descriptor of one ring slot, sent through the queue in place of the tensors it holds. The first descriptor of
+    each ring generation also carries the ring's shared tensors.
+    """
+    generation: int
+    index: int
+    formats: List[Optional[Tuple[DataFormat, bool]]] # (data format, constant) for pybuda tensors, None for pytorch
+    slots: Optional[List[List[torch.Tensor]]] = None
+
+class SharedRingTensors(list):
+    """
+    Tensors read from a ring slot, in place. They are only valid until the slot is released.
+    """
+    def __init__(self, tensors: List[Union[Tensor, torch.Tensor]], ring_slot: Tuple[int, int], slot: List[torch.Tensor]):
+        super().__init__(tensors)
+        self.ring_slot = ring_slot
+        self.slot_data_ptrs = set(v.untyped_storage().data_ptr() for v in slot)
+
+    def shares_memory(self, t: torch.Tensor) -> bool:
+        return t.untyped_storage().data_ptr() in self.slot_data_ptrs
+
+class SharedTensorRing:
+    """
+    Fixed-size ring of preallocated shared-memory tensor slots, for moving tensors between processes without
+    pickling them. The producer copies tensors into a free slot and only sends a `SharedRingSlot` through the queue.
+    The consumer uses the tensors in place, and hands the slot back through `free_queue` once it's done with them.
+
+    The ring is allocated on first push, to match the shapes and types of the pushed tensors, and a change of shapes
+    allocates a new one. Tensors that can't go into a slot, or are pushed while no slot is free, are sent through the
+    queue as-is, so a push never waits on the consumer. Producer and consumer each get their own pickled copy.
+    """
+    def __init__(self, num_slots: int, free_queue: Queue):
+        assert num_slots > 0, "Shared tensor ring needs at least one slot"
+        self.num_slots = num_slots
+        self.free_queue = free_queue # (generation, index) of slots released by the consumer
+        self._reset()
+
+    def _reset(self):
+        # Producer side
+        self.generation = 0
+        self.signature = None
+        self.slots: Optional[List[List[torch.Tensor]]] = None
+        self.free = collections.deque()
+        self.slots_sent = False
+
+        # Consumer side
+        self.consumer_generation = None
+        self.consumer_slots: Optional[List[List[torch.Tensor]]] = None
+
+    def __getstate__(self):
+        return {"num_slots": self.num_slots, "free_queue": self.free_queue}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def _allocate(self, values: List[torch.Tensor], signature):
+        self.generation += 1
+        self.signature = signature
+        self.slots = [[torch.empty(v.shape, dtype=v.dtype).share_memory_() for v in values] for _ in range(self.num_slots)]
+        self.free = collections.deque(range(self.num_slots))
+        self.slots_sent = False
+        logger.debug("Allocated shared tensor ring generation {} with {} slots of {} bytes", self.generation, self.num_slots, sum(v.numel() * v.element_size() for v in values))
+
+    def _acquire(self) -> Optional[int]:
+        while True:
+            try:
+                generation, index = self.free_queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation: # slots of replaced rings are dropped
+                self.free.append(index)
+        return self.free.popleft() if len(self.free) > 0 else None
+
+    def encode(self, tensors: List[Union[Tensor, torch.Tensor]]) -> Union[SharedRingSlot, List[Union[Tensor, torch.Tensor]]]:
+        """
+        Copy tensors into a free slot and return its descriptor, or return the tensors unchanged if they have to be
+        sent as they are
+        """
+        if len(tensors) == 0:
+            return tensors
+
+        values = []
+        formats = []
+        for t in tensors:
+            if isinstance(t, TensorFromPytorch):
+                formats.append((t.data_format, t.is_constant()))
+                t = t.value()
+            elif isinstance(t, torch.Tensor):
+                formats.append(None)
+            else:
+                return tensors
+            if t.device.type != "cpu" or t.layout != torch.strided or t.requires_grad:
+                return tensors
+            values.append(t)
+
+        signature = tuple((tuple(v.shape), v.dtype) for v in values)
+        if signature != self.signature:
+            self._allocate(values, signature)
+
+        index = self._acquire()
+        if index is None:
+            return tensors
+
+        for dst, src in zip(self.slots[index], values):
+            dst.copy_(src)
+
+        ring_slot = SharedRingSlot(self.generation, index, formats, None if self.slots_sent else self.slots)
+        self.slots_sent = True
+        return ring_slot
+
+    def decode(self, item) -> Union[SharedRingTensors, List[Union[Tensor, torch.Tensor]]]:
+        """
+        Return the tensors a queue item refers to. Items that aren't slot descriptors are returned unchanged.
+        """
+        if not isinstance(item, SharedRingSlot):
+            return item
+
+        if item.slots is not None:
+            self.consumer_generation = item.generation
+            self.consumer_slots = item.slots
+        assert item.generation == self.consumer_generation, "Slot descriptor received for a ring that was never sent"
+
+        slot = self.consumer_slots[item.index]
+        tensors = [v if f is None else Tensor.create_from_torch(v, dev_data_format=f[0], constant=f[1]) for v, f in zip(slot, item.formats)]
+        return SharedRingTensors(tensors, (item.generation, item.index), slot)
+
+    def release(self, ring_slot: Tuple[int, int]):
+        """
+        Hand a slot back to the producer
+        """
+        self.free_queue.put(ring_slot)
+
+def _compile_narrow_plans(original_shapes: List[Tuple[int, ...]], runtime_tensor_transforms: Optional[List[RuntimeTensorTransform]]) -> List[Callable]:
+    """
+    Narrowing of each popped output to its original shape, worked out once when pop queues are set
+    """
+    if runtime_tensor_transforms is None:
+        runtime_tensor_transforms = [None] * len(original_shapes)
+    return [
+        compile_narrow_plan(tuple(shape), transform.reinterpreted_shape.as_list() if transform is not None else None, has_microbatch_dim=True)
+        for shape, transform in zip(original_shapes, runtime_tensor_transforms)
+    ]
+
 class DeviceConnector:
     """
     DeviceConnector is a light-weight gasket between two devices, providing mechanism to push/pop data. It
@@ -50,7 +201,35 @@ class DeviceConnector:
             mp_context = mp.get_context('spawn')
             self.queue = create_queue(mp_context)
 
+        if self.pop_type == TransferType.MP_QUEUE:
+            register_queue(shutdown_event, self.queue) # read from here
+
         self.side_queue = side_queue
+        self.ring: Optional[SharedTensorRing] = None
+        self.read_ring_tensors: Optional[SharedRingTensors] = None # last read from the ring, until popped
+
+    def enable_shared_tensor_ring(self, num_slots: int):
+        """
+        Send tensors pushed into this connector's queue through a ring of shared-memory slots, instead of pickling them
+        """
+        mp_context = mp.get_context('spawn')
+        self.ring = SharedTensorRing(num_slots, create_queue(mp_context))
+
+    def encode_for_queue(self, tensors: List[Tensor]):
+        """
+        Return what to put into the queue for the given tensors
+        """
+        if self.ring is None:
+            return tensors
+        return self.ring.encode(tensors)
+
+    def detach_from_ring(self, tensors: Tuple[torch.Tensor, ...]) -> Tuple[torch.Tensor, ...]:
+        """
+        Clone tensors that share memory with the last read ring slot, so they outlive its release on pop
+        """
+        if self.read_ring_tensors is None:
+            return tensors
+        return tuple(t.clone() if isinstance(t, torch.Tensor) and self.read_ring_tensors.shares_memory(t) else t for t in tensors)
 
     def shutdown(self):
         pass # children will override
@@ -81,9 +260,10 @@ class DeviceConnector:
 
         self.push_to_side_queue(tensors)
         if self.push_type == TransferType.MP_QUEUE:
+            item = self.encode_for_queue(tensors)
             while True:
                 try:
-                    self.queue.put(tensors) # TODO: timeout and break on shutdown_event
+                    self.queue.put(item) # TODO: timeout and break on shutdown_event
                     return
                 except queue.Full as _:
                     if self.shutdown_event is not None and self.shutdown_event.is_set():
@@ -97,21 +277,23 @@ class DeviceConnector:
     def read(self) -> List[Tensor]:
 
         if self.queue is not None:
-            while True:
-                try:
-                    data = self.queue.get(timeout=0.1)
-                    return data
-                except queue.Empty as _:
-                    if self.shutdown_event is not None and self.shutdown_event.is_set():
-                        logger.debug("Aborting queue get due to shutdown event")
-                        return [] # got a signal to shutdown and end the process
-                    continue
+            data = get_or_shutdown(self.queue, self.shutdown_event)
+            if data is None:
+                logger.debug("Aborting queue get due to shutdown event")
+                return [] # got a signal to shutdown and end the process
+            if self.ring is not None:
+                data = self.ring.decode(data)
+                self.read_ring_tensors = data if isinstance(data, SharedRingTensors) else None
+            return data
 
         raise RuntimeError("No queue to read from")
 
     def pop(self):
         if self.queue is not None:
-            return # no-op
+            if self.read_ring_tensors is not None:
+                self.ring.release(self.read_ring_tensors.ring_slot)
+                self.read_ring_tensors = None
+            return
 
         raise RuntimeError("Can't handle pop")
 
@@ -142,19 +324,18 @@ class DirectPusherDeviceConnector(DeviceConnector):
         self.constant_tensors = None
         self.microbatch = microbatch
         self.pusher_thread = None
+        self.enable_staging = "PYBUDA_DISABLE_HOST_STAGING" not in os.environ
+        self.staging_buffers = None # per queue ring of reusable tile-aligned host buffers, set with push queues
+        self.staging_index = 0
+        self.push_plans = None # per queue conversion of inputs, compiled when push queues are set
 
     def pusher_thread_main(self, cmdqueue: queue.Queue):
         logger.info("Pusher thread on {} starting", self)
         while True:
-            while True:
-                try:
-                    cmd = cmdqueue.get(timeout=0.1)
-                    break
-                except queue.Empty as _:
-                    if self.shutdown_event is not None and self.shutdown_event.is_set():
-                        logger.debug("Ending pusher thread on {} due to shutdown event", self)
-                        return # got a signal to shutdown and end the process
-                    continue
+            cmd = get_or_shutdown(cmdqueue, self.shutdown_event)
+            if cmd is None:
+                logger.debug("Ending pusher thread on {} due to shutdown event", self)
+                return # got a signal to shutdown and end the process
 
             if cmd == "quit":
                 return
@@ -170,63 +351,198 @@ class DirectPusherDeviceConnector(DeviceConnector):
         # Create threads
         if not self.sequential and not self.pusher_thread:
             self.pusher_thread_queue = queue.Queue(maxsize=3) # don't allow pushes to go too far ahead, or we'll run out of memory
-            self.pusher_thread = threading.Thread(target=self.pusher_thread_main, args=(self.pusher_thread_queue,))
+            register_queue(self.shutdown_event, self.pusher_thread_queue, local=True)
+            self.pusher_thread = threading.Thread(target=self.pusher_thread_main, args=(self.pusher_thread_queue,), name="pybuda_pusher")
             self.pusher_thread.start()
 
-    def _convert_tensor_for_tilize(self, tensor: Tensor, q: DramIODesc) -> Tensor:
+    def _tilize_data_format(self, tensor: Tensor, q: DramIODesc) -> Optional[DataFormat]:
         """
-        Convert formats to closest supported format, depending on the destination queue
+        Return the closest supported format the tensor has to be converted to before tilizing into the
+        destination queue, or None if it can be tilized as-is
         """
         if is_equivalent_data_format(tensor.pt_data_format, q.data_format):
-            return tensor
+            return None
 
         pt_format = tensor.value().dtype
         if not tensor.value().is_floating_point():
-            return tensor.to_format(q.data_format)
+            return q.data_format
 
         if q.data_format in [DataFormat.Float16, DataFormat.Bfp8, DataFormat.Bfp4, DataFormat.Bfp2]:
             # tensor has to be float16
             if pt_format != torch.float16:
-                return tensor.to_format(DataFormat.Float16)
-            return tensor
+                return DataFormat.Float16
+            return None
 
         if q.data_format in [DataFormat.Float16_b, DataFormat.Bfp8_b, DataFormat.Bfp4_b, DataFormat.Bfp2_b]:
             # tensor can be bfloat or fp32
             if not pt_format in [torch.float32, torch.bfloat16]:
-                return tensor.to_format(DataFormat.Float16_b)
-            return tensor
+                return DataFormat.Float16_b
+            return None
 
         # Don't know what format it is... leave as-is and let back-end convert
-        return tensor
+        return None
 
-    def _embedding_index(self, tensor: torch.Tensor, original_shape: Tuple[int, ...], q: DramIODesc) -> Tensor:
+    def _compile_embedding_index(self, original_shape: Tuple[int, ...], q: DramIODesc) -> Callable[[torch.Tensor], torch.Tensor]:
+        """
+        Return a function that lays out 1d token indices the way the embedding index queue expects them. The queue
+        is checked once here, and padding is worked out once per input length.
+        """
         assert q.data_format in [DataFormat.RawUInt8, DataFormat.RawUInt16, DataFormat.RawUInt32]
-        assert len(tensor.shape) <= 2, "Must be a 1d tensor"
         assert len(original_shape) <= 1 or original_shape[-2] == 1, "Must be a 1d tensor"
         assert len(original_shape) <= 2 or original_shape[-3] == 1, "Must be a 1d tensor"
 
         q_rt = q.bufq_grid_dim_r * q.mblock_m * q.ublock_rt
-        w = tensor.shape[0] if len(tensor.shape) > 1 else 1
-        pad = align_up(tensor.shape[-1], TILE_DIM) - tensor.shape[-1]
-        tensor = torch.nn.functional.pad(tensor, (0, pad))
-        tensor = tensor.reshape(w, 1, 1, tensor.shape[-1])
-        tensor[:, :, :, original_shape[-1]:] = ~torch.tensor(0, dtype=tensor.dtype)
-        tensor = tensor.view(w, q_rt, -1, TILE_DIM)
-        pad = align_up(tensor.shape[-2], TILE_DIM) - tensor.shape[-2]
-        tensor = torch.nn.functional.pad(tensor, (0, 0, 0, pad))
-        tensor = tensor.view(w, q_rt, -1, TILE_DIM, TILE_DIM)
-        tensor = tensor.transpose(2, 3).view(w, 1, q_rt * TILE_DIM, -1)
-
-        assert len(tensor.shape) == 4, "_embedding_index: rank changed"
-        assert tensor.shape[0] == w, "_embedding_index: w changed"
-        assert tensor.shape[1] == q.t, "_embedding_index: t changed"
-        assert tensor.shape[2] == (q.bufq_grid_dim_r * q.mblock_m * q.ublock_rt * TILE_DIM), "_embedding_index: tensor dims mismatch q dims"
-        assert tensor.shape[3] == (q.bufq_grid_dim_c * q.mblock_n * q.ublock_ct * TILE_DIM), "_embedding_index: tensor dims mismatch q dims"
-        return tensor
+        length = original_shape[-1]
+        expected_shape = (q.t, q_rt * TILE_DIM, q.bufq_grid_dim_c * q.mblock_n * q.ublock_ct * TILE_DIM)
+        pads = {} # input length -> (column padding, row padding)
+        fills = {} # dtype -> index written past the original length
+
+        def embedding_index(tensor: torch.Tensor) -> torch.Tensor:
+            assert len(tensor.shape) <= 2, "Must be a 1d tensor"
+            w = tensor.shape[0] if len(tensor.shape) > 1 else 1
+            pad = pads.get(tensor.shape[-1])
+            if pad is None:
+                padded_length = align_up(tensor.shape[-1], TILE_DIM)
+                rows = padded_length // (q_rt * TILE_DIM)
+                pad = pads[tensor.shape[-1]] = (padded_length - tensor.shape[-1], align_up(rows, TILE_DIM) - rows)
+            fill = fills.get(tensor.dtype)
+            if fill is None:
+                fill = fills[tensor.dtype] = ~torch.tensor(0, dtype=tensor.dtype)
+
+            # Always padded, even by 0, so that the user's tensor is never written to
+            tensor = torch.nn.functional.pad(tensor, (0, pad[0])).reshape(w, 1, 1, -1)
+            tensor[:, :, :, length:] = fill
+            tensor = tensor.view(w, q_rt, -1, TILE_DIM)
+            if pad[1] > 0:
+                tensor = torch.nn.functional.pad(tensor, (0, 0, 0, pad[1]))
+            tensor = tensor.view(w, q_rt, -1, TILE_DIM, TILE_DIM)
+            tensor = tensor.transpose(2, 3).view(w, 1, q_rt * TILE_DIM, -1)
+
+            assert tensor.shape[0] == w, "_embedding_index: w changed"
+            assert tensor.shape[1:] == expected_shape, f"_embedding_index: tensor dims {tuple(tensor.shape)} mismatch q dims {expected_shape}"
+            return tensor
+
+        return embedding_index
+
+    def _embedding_index(self, tensor: torch.Tensor, original_shape: Tuple[int, ...], q: DramIODesc) -> torch.Tensor:
+        return self._compile_embedding_index(original_shape, q)(tensor)
+
+    def _compile_push_plan(self, index: int) -> Callable[[Union[Tensor, torch.Tensor]], Tuple[Union[Tensor, torch.Tensor], Optional[DataFormat]]]:
+        """
+        Work out once which steps inputs of the push queue at given index go through: staging, format conversion,
+        reinterpreting and padding, or the embedding index layout. Returns a function that only runs those steps,
+        and returns the tensor to push along with the data format its descriptor has to use, if any.
+        """
+        q = self.direct_push_queues[index]
+        transform = self.runtime_tensor_transforms[index]
+        transform_type = transform.type
+        tile_broadcast_dims = self.tile_broadcast_dims[index]
+        microbatch = self.microbatch
+        tile_r = self.tile_dims[index][0] if self.tile_dims is not None else TILE_DIM
+        tile_c = self.tile_dims[index][1] if self.tile_dims is not None else TILE_DIM
+
+        tilize_formats = {} # (tensor dtype, value dtype) -> format to convert to before tilizing, filled in as inputs are seen
+        def tilize_format(t: Tensor) -> Optional[DataFormat]:
+            key = (t.pt_data_format, t.value().dtype)
+            if key not in tilize_formats:
+                tilize_formats[key] = self._tilize_data_format(t, q)
+            return tilize_formats[key]
+
+        @timeline.traced("convert_tensor_for_tilize")
+        def convert(t: Tensor) -> Tensor:
+            data_format = tilize_format(t)
+            return t if data_format is None else t.to_format(data_format)
+
+        if transform_type == RuntimeTensorTransformType.ConstantInput:
+            constant = self.constant_tensors[index]
+            assert constant is not None
+            if isinstance(constant, torch.Tensor):
+                constant = pad_pytorch_tensor_to_buda(
+                    constant, tile_broadcast_dims, squeeze=True, microbatch=microbatch, tile_r=tile_r, tile_c=tile_c)
+            return lambda t: (constant, None)
+
+        if transform_type == RuntimeTensorTransformType.EmbeddingIndex:
+            embedding_index = self._compile_embedding_index(transform.original_shape, q)
+            def push_embedding_index(t):
+                if isinstance(t, Tensor):
+                    t = convert(t).value()
+                assert t is not None
+                return embedding_index(t), DataFormat.RawUInt32
+            return push_embedding_index
+
+        if transform_type == RuntimeTensorTransformType.Prestride:
+            def push_prestride(t):
+                if isinstance(t, Tensor):
+                    t = convert(t)
+                return t, None
+            return push_prestride
+
+        reinterpreted_shape = None
+        buda_reinterpreted_shape = None
+        if transform_type == RuntimeTensorTransformType.ReinterpretShape:
+            reinterpreted_shape = transform.reinterpreted_shape.as_list()
+            # Wrapped tensors are reinterpreted with the microbatch filled in, as Tensor.to_buda_shape does
+            buda_reinterpreted_shape = list(reinterpreted_shape)
+            if buda_reinterpreted_shape[0] == 1:
+                buda_reinterpreted_shape[0] = microbatch
+        elif transform_type != RuntimeTensorTransformType.NoTransform:
+            # Other transforms don't apply to inputs, which are only converted or padded
+            def push_other(t):
+                if isinstance(t, Tensor):
+                    return convert(t), None
+                return pad_pytorch_tensor_to_buda(t, tile_broadcast_dims, squeeze=True, microbatch=microbatch, tile_r=tile_r, tile_c=tile_c), None
+            return push_other
+
+        def stage(t) -> Optional[torch.Tensor]:
+            """
+            Pad and convert the input straight into this queue's next staging buffer, replacing format conversion,
+            padding and contiguous copies with a single write. Returns None if the input has to take the regular path.
+            """
+            if isinstance(t, TensorFromPytorch):
+                data_format = tilize_format(t)
+                value = t.value()
+                dtype = buda_dataformat_to_pytorch_dtype(data_format) if data_format is not None else value.dtype
+                if buda_reinterpreted_shape is not None:
+                    value = value.view(buda_reinterpreted_shape)
+            elif isinstance(t, torch.Tensor):
+                value = t
+                dtype = value.dtype
+                if reinterpreted_shape is not None:
+                    value = value.reshape(reinterpreted_shape)
+            else:
+                return None
+
+            if dtype == torch.int64:
+                return None # narrowed to int32 when the descriptor is made
+
+            # Double-buffered, so that the buffer written here is never the one from the previous push, which the
+            # backend may still be reading from
+            ring = self.staging_buffers[index]
+            staged = stage_pytorch_tensor_to_buda(
+                value, tile_broadcast_dims, ring[self.staging_index], dtype, squeeze=True, microbatch=microbatch, tile_r=tile_r, tile_c=tile_c)
+            if staged is not None:
+                ring[self.staging_index] = staged
+            return staged
+
+        def push(t):
+            if self.enable_staging:
+                staged = stage(t)
+                if staged is not None:
+                    return staged, None
+
+            if isinstance(t, Tensor):
+                t = convert(t)
+                return t.to_buda_shape(tile_broadcast_dims, reinterpret_shape=buda_reinterpreted_shape, clone=False, squeeze=True, microbatch=microbatch), None
+
+            if reinterpreted_shape is not None:
+                # TODO: RuntimeTensorTransform could do this transform (for all the RuntimeTensorTransformTypes)
+                t = t.contiguous().view(reinterpreted_shape)
+            return pad_pytorch_tensor_to_buda(t, tile_broadcast_dims, squeeze=True, microbatch=microbatch, tile_r=tile_r, tile_c=tile_c), None
+
+        return push
 
     def _internal_push(self, tensors: List[Tensor]):
 
-        tensor_dtypes = [None] * len(tensors)
         if not self.direct_push_queues:
             print(f"Direct push queues have not been set for {self}")
         assert self.direct_push_queues, "Direct push queues have not been set"
@@ -238,57 +554,28 @@ class DirectPusherDeviceConnector(DeviceConnector):
 
         self.push_to_side_queue(tensors)
 
-        # Convert to supported tilize conversion format, if needed
-        if isinstance(tensors, tuple):
-            tensors = list(tensors)
-
-        for i, t in enumerate(tensors):
-            if isinstance(t, Tensor):
-                tensors[i] = self._convert_tensor_for_tilize(t, self.direct_push_queues[i])
-            else:
-                tensors[i] = t
+        tensors, descs = self._prepare_push_tensors(tensors)
+        BackendAPI.push_to_queues(self.direct_push_queues, descs, single_input=False)
+        self.save_tensors = tensors
 
-        # Handles RuntimeTensorTransform::ReinterpretShape
-        for i, t in enumerate(tensors):
-            if self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.EmbeddingIndex:
-                if isinstance(tensors[i], Tensor):
-                    t = t.value()
-                assert t is not None
-                t = self._embedding_index(t, self.runtime_tensor_transforms[i].original_shape, self.direct_push_queues[i])
-                tensors[i] = t
-                tensor_dtypes[i] = DataFormat.RawUInt32
-            elif self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.ConstantInput:
-                assert self.constant_tensors[i] is not None
-                tensors[i] = self.constant_tensors[i]
-                t = tensors[i]
-
-            if isinstance(tensors[i], torch.Tensor):
-                if self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.ReinterpretShape:
-                    # TODO: RuntimeTensorTransform could do this transform (for all the RuntimeTensorTransformTypes)
-                    t = t.contiguous().view(self.runtime_tensor_transforms[i].reinterpreted_shape.as_list())
-                elif self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.Prestride:
-                    continue
-                tile_r = self.tile_dims[i][0] if self.tile_dims is not None else TILE_DIM
-                tile_c = self.tile_dims[i][1] if self.tile_dims is not None else TILE_DIM
-                tensors[i] = pad_pytorch_tensor_to_buda(
-                    t, self.tile_broadcast_dims[i], squeeze=True, microbatch=self.microbatch, tile_r=tile_r, tile_c=tile_c)
-            else:
-                reinterpreted_shape = None
-                if self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.ReinterpretShape:
-                    reinterpreted_shape = self.runtime_tensor_transforms[i].reinterpreted_shape.as_list()
-                    tensors[i] = t.to_buda_shape(self.tile_broadcast_dims[i], reinterpret_shape=reinterpreted_shape, clone=False, squeeze=True, microbatch=self.microbatch)
-                elif self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.Prestride:
-                    pass
-                elif self.runtime_tensor_transforms[i].type == RuntimeTensorTransformType.NoTransform:
-                    tensors[i] = t.to_buda_shape(self.tile_broadcast_dims[i], reinterpret_shape=None, clone=False, squeeze=True, microbatch=self.microbatch)
+    @timeline.traced()
+    def _prepare_push_tensors(self, tensors: List[Union[Tensor, torch.Tensor]]) -> Tuple[List[Union[Tensor, torch.Tensor]], List[PytorchTensorDesc]]:
+        """
+        Convert, pad and transform input tensors into what the push queues expect. Returns the final tensors,
+        which have to be kept alive while the backend reads them, and their descriptors.
+        """
+        tensors = list(tensors)
+        tensor_dtypes = [None] * len(tensors)
+        for i, plan in enumerate(self.push_plans):
+            tensors[i], tensor_dtypes[i] = plan(tensors[i])
+        self.staging_index = (self.staging_index + 1) % 2
 
         def to_tensor_desc(t: Union[Tensor, torch.Tensor], type: Union[DataFormat, None]) -> PytorchTensorDesc:
             if isinstance(t, Tensor):
                 return t.to_tensor_desc()
             return pytorch_tensor_to_tensor_desc(t, df=type)
 
-        BackendAPI.push_to_queues(self.direct_push_queues, [to_tensor_desc(t, type) for t, type in zip(tensors, tensor_dtypes)], single_input=False)
-        self.save_tensors = tensors
+        return tensors, [to_tensor_desc(t, type) for t, type in zip(tensors, tensor_dtypes)]
 
     def push(self, tensors: List[Tensor]):
 
@@ -309,6 +596,40 @@ class DirectPusherDeviceConnector(DeviceConnector):
         self.runtime_tensor_transforms = runtime_tensor_transforms if runtime_tensor_transforms is not None else [RuntimeTensorTransform() for _ in range(len(direct_push_queues))]
         self.constant_tensors = constant_tensors if constant_tensors is not None else [None for _ in range(len(direct_push_queues))]
         self.tile_dims = tile_dims
+        self.staging_buffers = [[None, None] for _ in range(len(direct_push_queues))]
+        self.staging_index = 0
+        self.push_plans = [self._compile_push_plan(i) for i in range(len(direct_push_queues))]
+
+class _OutputBufferShutdown(Exception):
+    """ Shutdown was requested while waiting for a free output buffer """
+
+class OutputBufferRing:
+    """
+    Ring of user-provided destination tensors for one output queue. Each read fills the next free slot, and the
+    slot only becomes free again once the user releases it, so the user controls how far reads can run ahead.
+    """
+    def __init__(self, buffers: List[torch.Tensor]):
+        assert len(buffers) > 0, "Output buffer ring needs at least one buffer"
+        for b in buffers:
+            assert b.is_contiguous(), "Output buffers must be contiguous"
+        self.buffers = {b.data_ptr(): b for b in buffers}
+        assert len(self.buffers) == len(buffers), "Output buffers must not share storage"
+        self.free = queue.Queue()
+        for b in buffers:
+            self.free.put(b)
+
+    def owns(self, t: torch.Tensor) -> bool:
+        return t.data_ptr() in self.buffers
+
+    def acquire(self, shutdown_event: Optional[EventClass]) -> Optional[torch.Tensor]:
+        """
+        Wait for a free slot. Returns None if shutdown was requested while waiting.
+        """
+        return get_or_shutdown(self.free, shutdown_event)
+
+    def release(self, t: torch.Tensor):
+        assert self.owns(t), "Releasing a tensor that doesn't belong to this ring"
+        self.free.put(self.buffers[t.data_ptr()])
 
 class DirectPopperDeviceConnector(DeviceConnector):
     """
@@ -319,13 +640,80 @@ class DirectPopperDeviceConnector(DeviceConnector):
         self.direct_pop_queues = None # Will be set after compile
         self.original_shapes = None
         self.runtime_tensor_transforms = None
+        self.narrow_plans = None # per output narrowing to original shape, compiled when pop queues are set
+        self.output_buffer_rings = {} # output index -> OutputBufferRing
+
+    def register_output_buffers(self, index: int, buffers: List[torch.Tensor]):
+        """
+        Register a ring of destination tensors for the output at given index. Reads narrow the output straight
+        into the next free buffer instead of allocating a new tensor, and block while all buffers are in use.
+        Each buffer has to be given back with `release_output_buffer` once the user is done with it.
+        """
+        self.output_buffer_rings[index] = OutputBufferRing(buffers)
+        register_queue(self.shutdown_event, self.output_buffer_rings[index].free, local=True)
+
+    def release_output_buffer(self, t: Union[Tensor, torch.Tensor]):
+        """
+        Return an output buffer, previously filled by a read, to its ring
+        """
+        if isinstance(t, Tensor):
+            t = t.value()
+        for ring in self.output_buffer_rings.values():
+            if ring.owns(t):
+                ring.release(t)
+                return
+        raise RuntimeError("Released tensor is not a registered output buffer")
+
+    def is_output_buffer(self, t: Union[Tensor, torch.Tensor]) -> bool:
+        if isinstance(t, Tensor):
+            t = t.value()
+        return any(ring.owns(t) for ring in self.output_buffer_rings.values())
+
+    def _release_output_buffers(self, out_tensors: Optional[List[Optional[torch.Tensor]]]):
+        for i, t in enumerate(out_tensors or []):
+            if t is not None:
+                self.output_buffer_rings[i].release(t)
+
+    def _acquire_output_buffers(self) -> Optional[List[Optional[torch.Tensor]]]:
+        """
+        Take one free buffer from each ring, waiting for them as needed. Raises if shutdown was requested while
+        waiting; buffers taken so far are given back in that case.
+        """
+        if len(self.output_buffer_rings) == 0:
+            return None
+        assert all(index < len(self.original_shapes) for index in self.output_buffer_rings), "Output buffers registered for an output that doesn't exist"
+        out_tensors = []
+        try:
+            for i in range(len(self.original_shapes)):
+                if i not in self.output_buffer_rings:
+                    out_tensors.append(None)
+                    continue
+                t = self.output_buffer_rings[i].acquire(self.shutdown_event)
+                if t is None:
+                    raise _OutputBufferShutdown()
+                out_tensors.append(t)
+        except BaseException:
+            self._release_output_buffers(out_tensors)
+            raise
+        return out_tensors
 
     def read(self) -> List[Tensor]:
         assert self.direct_pop_queues is not None, "Direct pop queues have not been set"
         if len(self.direct_pop_queues) == 0:
             return []
         assert self.original_shapes is not None
-        ret = BackendAPI.read_queues(self.direct_pop_queues, self.original_shapes, self.runtime_tensor_transforms, requires_grad=self.requires_grad, single_output=False, shutdown_event=self.shutdown_event, clone=False)
+        try:
+            out_tensors = self._acquire_output_buffers()
+        except _OutputBufferShutdown:
+            logger.debug("Aborting output buffer acquire due to shutdown event")
+            return [] # got a signal to shutdown and end the process
+
+        try:
+            ret = BackendAPI.read_queues(self.direct_pop_queues, self.original_shapes, self.runtime_tensor_transforms, requires_grad=self.requires_grad, single_output=False, shutdown_event=self.shutdown_event, clone=False, out_tensors=out_tensors, narrow_plans=self.narrow_plans)
+        except BaseException:
+            # Buffers only go to the user with a successful read, so nobody else would give them back
+            self._release_output_buffers(out_tensors)
+            raise
         self.push_to_side_queue(ret)
         return ret
 
@@ -340,6 +728,7 @@ class DirectPopperDeviceConnector(DeviceConnector):
         self.original_shapes = original_shapes
         self.requires_grad = requires_grad
         self.runtime_tensor_transforms = runtime_tensor_transforms
+        self.narrow_plans = _compile_narrow_plans(original_shapes, runtime_tensor_transforms)
 
 class DirectPusherPopperDeviceConnector(DirectPusherDeviceConnector):
     """
@@ -350,13 +739,14 @@ class DirectPusherPopperDeviceConnector(DirectPusherDeviceConnector):
         self.direct_pop_queues = None # Will be set after compile
         self.original_shapes = None
         self.runtime_tensor_transforms = None
+        self.narrow_plans = None # per output narrowing to original shape, compiled when pop queues are set
 
     def read(self) -> List[Tensor]:
         assert self.direct_pop_queues is not None, "Direct pop queues have not been set"
         if len(self.direct_pop_queues) == 0:
             return []
         assert self.original_shapes is not None
-        ret = BackendAPI.read_queues(self.direct_pop_queues, self.original_shapes, self.runtime_tensor_transforms, requires_grad=self.requires_grad, single_output=False, shutdown_event=self.shutdown_event, clone=True)
+        ret = BackendAPI.read_queues(self.direct_pop_queues, self.original_shapes, self.runtime_tensor_transforms, requires_grad=self.requires_grad, single_output=False, shutdown_event=self.shutdown_event, clone=True, narrow_plans=self.narrow_plans)
         self.push_to_side_queue(ret)
         return ret
         
@@ -371,6 +761,7 @@ class DirectPusherPopperDeviceConnector(DirectPusherDeviceConnector):
         self.original_shapes = original_shapes
         self.requires_grad = requires_grad
         self.runtime_tensor_transforms = runtime_tensor_transforms
+        self.narrow_plans = _compile_narrow_plans(original_shapes, runtime_tensor_transforms)
 
     def transfer(self, blocking: bool):
         """
@@ -390,6 +781,8 @@ class InputQueueDirectPusherDeviceConnector(DirectPusherDeviceConnector):
     def __init__(self, q: Queue, shutdown_event: Optional[EventClass], sequential: bool):
         super().__init__(shutdown_event, sequential)
         self.queue = q
+        register_queue(shutdown_event, self.queue) # read from here
+        self.pushed_ring_slot = None # ring slot of the last push, held until the next push is done
 
     def transfer(self, blocking: bool):
         """
@@ -399,8 +792,18 @@ class InputQueueDirectPusherDeviceConnector(DirectPusherDeviceConnector):
             return 
 
         data = self.read()
+        self.read_ring_tensors = None # released after the push, which can happen on the pusher thread
         self.push(data)
 
+    def _internal_push(self, tensors: List[Tensor]):
+        ring_slot = tensors.ring_slot if isinstance(tensors, SharedRingTensors) else None
+        super()._internal_push(tensors)
+
+        # Backend is done with the previous push's tensors once this one is done, same as with save_tensors
+        if self.pushed_ring_slot is not None:
+            self.ring.release(self.pushed_ring_slot)
+        self.pushed_ring_slot = ring_slot
+
 class OutputQueueDirectPoppperDeviceConnector(DirectPopperDeviceConnector):
     """
     Connector that has an external queue that pushes go to. No reading through this connector is allowed.
@@ -419,5 +822,6 @@ class OutputQueueDirectPoppperDeviceConnector(DirectPopperDeviceConnector):
             raise NotImplementedError("Non-blocking transfer on output not implemented yet")
 
         data = self.read()
-        self.queue.put([t.clone().detach() for t in data])  # Need to clone, otherwise popping will erase the tensor
+        # Need to clone, otherwise popping will erase the tensor. Outputs read into user buffers are already copies.
+        self.queue.put([t if self.is_output_buffer(t) else t.clone().detach() for t in data])
         self.pop()
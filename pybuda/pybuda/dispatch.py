@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Blocking waits for device processes and their helper threads, which a shutdown interrupts immediately.
+
+Waiters block on their queue instead of polling a shutdown event. `ShutdownEvent.set` puts a wake-up sentinel
+into every queue registered with the event. Queues shared between processes are registered before the processes
+start, so a shutdown raised in any process reaches waiters in all of them. Thread-local queues are registered in
+the process that owns them, and are woken by the first waiter in that process that sees the shutdown. A waiter
+that wakes up on shutdown puts the sentinel back, so later waits on the same queue return right away too.
+"""
+import collections
+import queue
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+import torch.multiprocessing as mp
+
+WAKEUP = "pybuda_shutdown_wakeup"
+
+# Waiters still re-check the event this often, in case it was set without waking them (i.e. a process was killed)
+SHUTDOWN_CHECK_INTERVAL = 5.0
+
+# Poll interval used with a plain event, which can't wake waiters
+LEGACY_POLL_INTERVAL = 0.1
+
+class ShutdownEvent:
+    """
+    Shutdown event that wakes up blocked waiters on registered queues when set
+    """
+    def __init__(self, mp_context = None):
+        if mp_context is None:
+            mp_context = mp.get_context('spawn')
+        self._event = mp_context.Event()
+        self._queues: List[queue.Queue] = [] # shared with other processes
+        self._init_local()
+
+    def _init_local(self):
+        self._local_queues: List[queue.Queue] = [] # owned by this process
+        self._local_lock = threading.Lock()
+        self._local_woken = False
+
+    def __getstate__(self):
+        return {"_event": self._event, "_queues": self._queues}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_local()
+
+    def register(self, q: queue.Queue):
+        """
+        Register a queue that's shared between processes. Has to be done before the processes are started.
+        """
+        if not any(q is r for r in self._queues):
+            self._queues.append(q)
+
+    def register_local(self, q: queue.Queue):
+        """
+        Register a queue that's only waited on in this process
+        """
+        with self._local_lock:
+            self._local_queues.append(q)
+            woken = self._local_woken
+        if woken:
+            _put_wakeup(q)
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def set(self):
+        if self._event.is_set():
+            self.wake_local()
+            return
+        self._event.set()
+        for q in self._queues:
+            _put_wakeup(q)
+        self.wake_local()
+
+    def wake_local(self):
+        with self._local_lock:
+            if self._local_woken:
+                return
+            self._local_woken = True
+            local_queues = list(self._local_queues)
+        for q in local_queues:
+            _put_wakeup(q)
+
+def _put_wakeup(q: queue.Queue):
+    try:
+        q.put_nowait(WAKEUP)
+    except queue.Full:
+        pass # waiter has items to go through first, and will see the event on its next check
+
+def register_queue(shutdown_event, q: Optional[queue.Queue], local: bool = False):
+    """
+    Register the queue with the event, if the event supports waking up waiters
+    """
+    if q is None or not isinstance(shutdown_event, ShutdownEvent):
+        return
+    if local:
+        shutdown_event.register_local(q)
+    else:
+        shutdown_event.register(q)
+
+def is_wakeup(item: Any) -> bool:
+    return isinstance(item, str) and item == WAKEUP
+
+def get_or_shutdown(q: queue.Queue, shutdown_event) -> Optional[Any]:
+    """
+    Blocking get from the queue. Returns None once the shutdown event is set and nothing is left to get.
+
+    Wake-up sentinels left over from an earlier shutdown, whose event isn't the current one, are skipped.
+    """
+    if shutdown_event is None:
+        while True:
+            item = q.get()
+            if not is_wakeup(item):
+                return item
+
+    interval = SHUTDOWN_CHECK_INTERVAL if isinstance(shutdown_event, ShutdownEvent) else LEGACY_POLL_INTERVAL
+    while True:
+        try:
+            item = q.get(timeout=interval)
+            if not is_wakeup(item):
+                return item
+        except queue.Empty:
+            pass
+
+        if shutdown_event.is_set():
+            if isinstance(shutdown_event, ShutdownEvent):
+                _put_wakeup(q)
+                shutdown_event.wake_local()
+            return None
+
+class DispatchStats:
+    """
+    Time from a command being created to the device starting to run it, over the most recent commands
+    """
+    def __init__(self, window: int = 10000):
+        self.window = window
+        self.latencies: Dict[str, Deque[float]] = collections.defaultdict(lambda: collections.deque(maxlen=window))
+
+    def __getstate__(self):
+        return {"window": self.window} # each process records its own
+
+    def __setstate__(self, state):
+        self.__init__(state["window"])
+
+    def record(self, command_type: str, created: float):
+        self.latencies[command_type].append(time.monotonic() - created)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Count, mean, p50 and p99 dispatch latency, in milliseconds, per command type
+        """
+        ret = {}
+        for command_type, latencies in self.latencies.items():
+            values = sorted(latencies)
+            ret[command_type] = {
+                "count": len(values),
+                "mean_ms": sum(values) / len(values) * 1000,
+                "p50_ms": values[(len(values) - 1) // 2] * 1000,
+                "p99_ms": values[min(len(values) - 1, int(len(values) * 0.99))] * 1000,
+            }
+        return ret
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Lazy loading of optional ML frameworks.
+
+TensorFlow, MXNet, JAX and ONNX are only needed when the user actually hands pybuda a model or tensor
+from one of those frameworks. Importing them eagerly costs seconds of startup time and hundreds of MB
+of RSS, so they are exposed here as proxies that import the real module on first attribute access.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that imports the wrapped module the first time one of its attributes is accessed
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+tf = LazyModule("tensorflow")
+mxnet = LazyModule("mxnet")
+jaxlib = LazyModule("jaxlib")
+jnp = LazyModule("jax.numpy")
+onnx = LazyModule("onnx")
+
+
+def is_loaded(name: str) -> bool:
+    """
+    Return true if the framework module has already been imported by someone in this process
+    """
+    return name in sys.modules
+
+
+#
+# Type checks that never trigger an import: an object can only be an instance of a framework type
+# if that framework has already been imported.
+#
+def is_tf_tensor(t, include_variables: bool = True) -> bool:
+    if not is_loaded("tensorflow"):
+        return False
+    return isinstance(t, (tf.Tensor, tf.Variable) if include_variables else tf.Tensor)
+
+def is_tf_variable(t) -> bool:
+    return is_loaded("tensorflow") and isinstance(t, tf.Variable)
+
+def is_tf_module(module) -> bool:
+    return is_loaded("tensorflow") and isinstance(module, (tf.keras.Model, tf.keras.layers.Layer))
+
+def is_mxnet_ndarray(t) -> bool:
+    return is_loaded("mxnet") and isinstance(t, mxnet.ndarray.ndarray.NDArray)
+
+def is_jax_array(t) -> bool:
+    return is_loaded("jax") and isinstance(t, jaxlib.xla_extension.DeviceArray)
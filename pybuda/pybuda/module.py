@@ -7,20 +7,16 @@ from collections import deque, OrderedDict
 import itertools
 
 import torch
-import tensorflow as tf
 from loguru import logger
 
 import pybuda
 from .pybudaglobal import register_module, lazy_trace_data
 from .tensor import SomeTensor, Tensor, to_pt_tensors, to_tf_tensors, to_tf_variables, pytorch_dtype_to_buda_dataformat, buda_dataformat_to_pytorch_dtype
 from .parameter import Parameter
-import onnx
-import onnxruntime
-import mxnet as mx
-import jax.numpy as jnp
 import numpy as np
 
 from pybuda.tvm_utils import map_pt_dtype_to_tf, flatten_structured_output
+from pybuda.lazy_imports import tf, onnx, jnp, mxnet as mx
 
 class Module:
     """
@@ -239,7 +235,7 @@ class TFModule(Module):
     A wrapper around a TF module. Currently, TF modules can only run on a CPU device.
     """
     def __init__(self, name: str, 
-            module: tf.keras.Model):
+            module: "tf.keras.Model"):
         """
         Create TF module wrapper.
 
@@ -256,7 +252,7 @@ class TFModule(Module):
 
         self.module = module
 
-    def forward(self, *args, **kwargs) -> Tuple[tf.Tensor]:
+    def forward(self, *args, **kwargs) -> Tuple["tf.Tensor"]:
         """
         Run TF module forward, converting pytorch tensors as necessary
 
@@ -279,7 +275,7 @@ class TFModule(Module):
         outputs = to_pt_tensors(outputs)
         return outputs
 
-    def cpu_eval_forward(self, *args, **kwargs) -> Tuple[tf.Tensor]:
+    def cpu_eval_forward(self, *args, **kwargs) -> Tuple["tf.Tensor"]:
 
         args = to_tf_tensors(args, force_float32=True)
         outputs = self.call(*args, **kwargs)
@@ -288,7 +284,7 @@ class TFModule(Module):
         return outputs
 
 
-    def call(self, *args, **kwargs) -> Tuple[tf.Tensor]:
+    def call(self, *args, **kwargs) -> Tuple["tf.Tensor"]:
         """
         Run TF module forward, with pre-loaded inputs in input queues
 
@@ -308,7 +304,7 @@ class TFModule(Module):
         outputs = self.module(*args, **kwargs)
         return outputs
 
-    def backward(self, *args) -> Tuple[tf.Tensor]:
+    def backward(self, *args) -> Tuple["tf.Tensor"]:
         """
         Run TF module backward, with pre-loaded inputs in input queues
 
@@ -342,7 +338,7 @@ class OnnxModule(Module):
     A wrapper around a Onnx module.
     """
     def __init__(self, name: str, 
-            module: onnx.onnx_ml_pb2.ModelProto,
+            module: "onnx.onnx_ml_pb2.ModelProto",
             onnx_path: str):
         """
         Create Onnx module wrapper.
@@ -477,7 +473,7 @@ class MXNetModule(Module):
     """
     A wrapper around a MXNet module.
     """
-    def __init__(self, name: str, module: mx.gluon.HybridBlock,):
+    def __init__(self, name: str, module: "mx.gluon.HybridBlock",):
         """
         Create MXNet module wrapper.
 
@@ -591,7 +587,7 @@ class JaxModule(Module):
     def set_parameters(self, **kwargs):
         raise NotImplementedError
 
-    def cpu_eval_forward(self, *args, **kwargs) -> Tuple[tf.Tensor]:
+    def cpu_eval_forward(self, *args, **kwargs) -> Tuple["tf.Tensor"]:
         args = [jnp.asarray(x.detach().numpy(),) for x in args]
         outputs = self.module(*args)
 
@@ -10,7 +10,7 @@ from pybuda.op.eval.pybuda import get_f_pybuda_eval, get_f_pybuda_shape
 from pybuda._C import DataFormat
 from pybuda._C.graph import OpType
 import pybuda
-from pybuda.pybudaglobal import get_unique_node_id, tracing
+from pybuda.pybudaglobal import get_unique_node_id, tracing, shapes_only_trace
 
 depracated_name_dict = {}
 deprecated_op_id = 0
@@ -82,8 +82,11 @@ class PyBudaOp:
 
         # Calculate reference if there's one
         if all([o.has_value() if isinstance(o, (Tensor, Parameter)) else True for o in self.operands]):
-            values = [o.value() if isinstance(o, (Tensor, Parameter)) else o for o in self.operands]
-            result.set_value(get_f_pybuda_eval(self.cpp_op_type)(values))
+            if shapes_only_trace():
+                result.defer_value()
+            else:
+                values = [o.value() if isinstance(o, (Tensor, Parameter)) else o for o in self.operands]
+                result.set_value(get_f_pybuda_eval(self.cpp_op_type)(values))
 
 
         return result
@@ -9,13 +9,13 @@ from typing import List, Tuple, Union
 from math import prod
 
 import torch
-import tensorflow as tf
 import numpy as np
 
 from collections import defaultdict
 from loguru import logger
 
 from pybuda._C.backend_api import OpModelDesc
+from pybuda.lazy_imports import is_tf_tensor
 from pybuda._C.balancer import FusedSubOpModel, OpModel
 
 from ...pybudaglobal import TILE_DIM
@@ -193,9 +193,9 @@ def calculate_pcc(a, b):
 
     return pcc
 
-def compare_tensor_to_golden(name: str, golden: Union[torch.Tensor, tf.Tensor, tf.Variable], calculated: torch.Tensor, is_buda=False, rtol=None, atol=None, pcc=None, warning_only=False, relative_atol = None, verify_cfg = None):
+def compare_tensor_to_golden(name: str, golden: Union[torch.Tensor, "tf.Tensor", "tf.Variable"], calculated: torch.Tensor, is_buda=False, rtol=None, atol=None, pcc=None, warning_only=False, relative_atol = None, verify_cfg = None):
     # Convert golden to pytorch tensor for comparisons
-    if isinstance(golden, (tf.Tensor, tf.Variable)):
+    if is_tf_tensor(golden):
         golden = torch.from_numpy(golden.numpy())
 
     if golden.dtype == torch.bool and calculated.dtype != torch.bool:
@@ -126,6 +126,45 @@ op_to_module_map = {
 }
 
 
+# Ops whose eval bakes in the traced single-sample shape (or otherwise mixes samples), so they can't be evaluated
+# over a whole microbatch in one go
+batch_unsafe_ops = {
+    "reshape", "broadcast", "repeat", "repeat_dim", "adv_index", "gather", "index_copy", "interleave",
+    "hslice", "hstack", "vslice", "vstack", "pixel_shuffle", "pad_tile", "buda_pad", "buda_unpad",
+    "conv2d_prestride_act", "conv2d_prestride_weights", "sparse_matmul", "depthwise", "dram_queue", "tilizer",
+    "quantize", "buda_quantize", "dequantize", "requantize", "buda_requantize",
+}
+
+# Ops that take the dimension they work on as the first attribute. They are batch-safe as long as that
+# dimension isn't the microbatch one.
+dim_attr_ops = {
+    "select", "index", "narrow", "concatenate", "stack", "squeeze", "unsqueeze", "cumsum", "argmax",
+    "softmax", "log_softmax", "softmax_bw", "layernorm", "layernorm_bw", "mask",
+    "reduce_avg", "reduce_sum", "reduce_max", "grouped_reduce_avg",
+}
+
+def is_batch_safe(op_name, attrs, named_attrs, operand_shapes):
+    """
+    Return true if the op evaluates each sample of a microbatch independently, i.e. its eval gives the same
+    result when run over a leading batch dimension as it does when run once per sample
+    """
+    if op_name in batch_unsafe_ops:
+        return False
+
+    if op_name == "transpose":
+        dims = [named_attrs["dim0"], named_attrs["dim1"]]
+    elif op_name in dim_attr_ops:
+        if len(attrs) == 0:
+            return False # reduces over all dims
+        dims = [attrs[0]]
+    else:
+        return True
+
+    rank = len(operand_shapes[0])
+    if op_name == "unsqueeze":
+        rank += 1
+    return all(d != 0 and d != -rank for d in dims)
+
 def has_newstyle_interface(op_name):
     return type(op_to_module_map[op_name]) is not str
 
@@ -1,10 +1,13 @@
 # SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
 
 # SPDX-License-Identifier: Apache-2.0
+import functools
 import math
 import numpy as np
 import os
+import threading
 import torch
+from collections import OrderedDict
 from loguru import logger
 import pybuda
 from pybuda.utils import align_up_tile, align_up, round_up_div, clamp
@@ -14,6 +17,96 @@ from pybuda._C import DataFormat, compress_sparse_tensor_and_strip_info, SparseC
 from math import gcd
 
 
+class PickerMatrixCache:
+    """
+    Process-wide LRU cache of sparse picker matrices, keyed on the builder and its arguments.
+
+    Decomposes of repeated blocks (e.g. every 3x3 stride-1 conv in a ResNet stage) ask for identical pickers, so
+    those are built once. Callers get their own clone of the cached tensor, so modifying a picker in place
+    doesn't change what later callers see.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+_picker_matrix_cache = PickerMatrixCache(int(os.environ.get("PYBUDA_PICKER_MATRIX_CACHE_SIZE", "512")))
+
+
+def get_picker_matrix_cache_stats():
+    return _picker_matrix_cache.stats()
+
+
+def clear_picker_matrix_cache():
+    _picker_matrix_cache.clear()
+
+
+def _freeze_cache_key(arg):
+    if isinstance(arg, (list, tuple)):
+        return tuple(_freeze_cache_key(a) for a in arg)
+    if isinstance(arg, torch.Tensor):
+        raise TypeError("Tensor arguments can't be used as picker cache keys")
+    hash(arg)
+    return arg
+
+
+def cached_picker_matrix(f):
+    """
+    Memoize a picker matrix builder in the process-wide picker cache. Only sparse results are cached, and calls
+    with arguments that can't be hashed fall through to the builder.
+    """
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        if _picker_matrix_cache.max_entries <= 0:
+            return f(*args, **kwargs)
+
+        try:
+            key = (f.__name__, _freeze_cache_key(args), _freeze_cache_key(sorted(kwargs.items())))
+        except TypeError:
+            return f(*args, **kwargs)
+
+        picker = _picker_matrix_cache.get(key)
+        if picker is None:
+            picker = f(*args, **kwargs)
+            if isinstance(picker, torch.Tensor) and picker.is_sparse:
+                _picker_matrix_cache.put(key, picker)
+                picker = picker.clone()
+            return picker
+        return picker.clone()
+
+    return wrapper
+
+
 def conv2d_padding_to_canonical(padding, kernel_size):
     # current implementation is without dilation
 
@@ -319,6 +412,7 @@ def create_conv2d_picker_matrix(y, x, y_shift, x_shift, stride, tile_align=False
     return dident
 
 
+@cached_picker_matrix
 def create_conv2d_sparse_picker_matrix(
     y, x, y_shift, x_shift, k_y, k_x, stride, padding, dilation, tile_align=False, pad_x_only=False, sparse_r_pad=0, sparse_c_pad=0
 ):
@@ -342,10 +436,8 @@ def create_conv2d_sparse_picker_matrix(
     )
 
     cols = cols.reshape(-1)
-    rows = torch.arange(cols.shape[0])
-    rows = rows.index_select(0, cols.nonzero().flatten())
-    cols = cols.index_select(0, cols.nonzero().flatten())
-    cols -= 1
+    rows = cols.nonzero().flatten()
+    cols = cols.index_select(0, rows) - 1
 
     if pad_x_only:
         # Channel last conv
@@ -363,13 +455,14 @@ def create_conv2d_sparse_picker_matrix(
         sparse_r = out_y * out_x
         sparse_c = y * x
     return torch.sparse_coo_tensor(
-        [rows.tolist(), cols.tolist()],
+        torch.stack((rows, cols)),
         torch.ones(cols.shape[0]),
         (sparse_r, sparse_c),
         dtype=torch.float32,
     ).coalesce()
 
 
+@cached_picker_matrix
 def create_dilate2d_sparse_picker_matrix(y, x, dilation, tile_align=False):
     rows = torch.arange(y * x).view(y, x)
     rows *= dilation
@@ -390,6 +483,7 @@ def create_dilate2d_sparse_picker_matrix(y, x, dilation, tile_align=False):
     )
 
 
+@cached_picker_matrix
 def create_avg_pool2d_count_include_pad_False_picker_matrix(y, x, k_y, k_x, stride, padding, tile_align=False):
     """
     When avg_pool2d has its parameter `count_include_pad` set to False, we will treat it as True and then try to fix it
@@ -432,6 +526,7 @@ def create_avg_pool2d_count_include_pad_False_picker_matrix(y, x, k_y, k_x, stri
     ).coalesce()
 
 
+@cached_picker_matrix
 def create_index_sparse_picker_matrix(r, start, stop, stride, tile_align=False):
     length = stop - start
     rows = torch.arange(r).narrow(0, start, length) - start
@@ -451,6 +546,7 @@ def create_index_sparse_picker_matrix(r, start, stop, stride, tile_align=False):
     )
 
 
+@cached_picker_matrix
 def create_reshape_flatten_sparse_picker_matrix(orig_r, new_r, tile_dim=TILE_DIM):
     cols = torch.arange(new_r//tile_dim)
     rows = cols * tile_dim
@@ -462,6 +558,7 @@ def create_reshape_flatten_sparse_picker_matrix(orig_r, new_r, tile_dim=TILE_DIM
     )
 
 
+@cached_picker_matrix
 def create_reshape_flatten_sparse_picker_matrix_narrower(orig_r, new_r, org_length, tile_dim=TILE_DIM):
     cols = torch.arange(orig_r)
     rows = torch.tensor([])
@@ -474,6 +571,7 @@ def create_reshape_flatten_sparse_picker_matrix_narrower(orig_r, new_r, org_leng
         dtype=torch.float32,
     )
 
+@cached_picker_matrix
 def create_flattened_padding_removal_sparse_picker_matrix(r, start, stop, length, align_up_rows=False, align_up_cols=False):
     num_pads = r // length
     cols = []
@@ -488,6 +586,7 @@ def create_flattened_padding_removal_sparse_picker_matrix(r, start, stop, length
         dtype=torch.float32,
     )
 
+@cached_picker_matrix
 def create_padding_shift_sparse_picker_matrix(length, slices, padded_length):
     rows = torch.arange(0, length).tolist()
     cols = []
@@ -505,6 +604,7 @@ def create_padding_shift_sparse_picker_matrix(length, slices, padded_length):
     )
 
 
+@cached_picker_matrix
 def create_real_row_sparse_picker_matrix(orig_x, padded_y):
     cols = torch.arange(orig_x)
     rows = cols * TILE_DIM
@@ -517,6 +617,7 @@ def create_real_row_sparse_picker_matrix(orig_x, padded_y):
     )
     return spm
 
+@cached_picker_matrix
 def create_repeat_sparse_picker_matrix(orig_x, repeat):
     cols = torch.arange(orig_x).tolist() * repeat
     rows = torch.arange(orig_x * repeat).tolist()
@@ -530,6 +631,7 @@ def create_repeat_sparse_picker_matrix(orig_x, repeat):
     return spm
 
 
+@cached_picker_matrix
 def create_sparse_interleave_picker_matrix(length, orig_x, orig_z):
     
     def create_rows(orig_x, orig_z):
@@ -569,20 +671,14 @@ def transpose_sparse_picker_matrix(sparse):
     if has_w:
         assert sparse.shape[0] == 1
         sparse = sparse.select(0, 0)
-    transposed = []
-    for z in range(sparse.shape[0]):
-        s = sparse.select(0, z)
-        s = s.coalesce()
-        rows, cols = s.indices()
-        transposed.append(
-            torch.sparse_coo_tensor(
-                [cols.tolist(), rows.tolist()],
-                s.values(),
-                (sparse_c, sparse_r),
-                dtype=s.dtype,
-            )
-        )
-    transposed = torch.stack(transposed)
+    sparse = sparse.coalesce()
+    zs, rows, cols = sparse.indices()
+    transposed = torch.sparse_coo_tensor(
+        torch.stack((zs, cols, rows)),
+        sparse.values(),
+        (sparse.shape[0], sparse_c, sparse_r),
+        dtype=sparse.dtype,
+    )
     if not has_z:
         assert transposed.shape[0] == 1
         transposed = transposed.select(0, 0)
@@ -606,27 +702,17 @@ def bcast_sparse_picker_matrix(sparse, dim, size):
 def get_sparse_picker_matrix_max_span(sparse: torch.Tensor):
     while len(sparse.shape) < 4:
         sparse = sparse.unsqueeze(0)
-    _, zdim, y, x = sparse.shape
-
-    max_span = -1
-    sparse = sparse.select(dim=0, index=0)  # removes batch dim
-    for z in range(zdim):
-        z_slice = sparse.select(dim=0, index=z)  # Now 2d
-        rows, cols = z_slice.coalesce().indices().tolist()
 
-        non_zero_tiles = {
-            (rows[i] // TILE_DIM, cols[i] // TILE_DIM) for i in range(len(rows))
-        }
+    sparse = sparse.select(dim=0, index=0).coalesce()  # removes batch dim
+    zs, rows, cols = sparse.indices()
+    if zs.numel() == 0:
+        return -1
 
-        d = dict()
-        for k, v in non_zero_tiles:
-            if k not in d:
-                d[k] = 0
-            d[k] += 1
+    # Unique non-zero tiles per z, then count how many tiles each (z, tile row) spans
+    non_zero_tiles = torch.unique(torch.stack((zs, rows // TILE_DIM, cols // TILE_DIM)), dim=1)
+    _, span = torch.unique(non_zero_tiles[:2], dim=1, return_counts=True)
 
-        max_span = max(max_span, max(d.values()))
-
-    return max_span
+    return span.max().item()
 
 
 def up_idx_to_orig_idx_no_align_corners(up_idx, scale_factor):
@@ -646,6 +732,7 @@ def up_idx_to_orig_idx_align_corners(up_idx, original_size, upsample_size):
     return torch.tensor(x_ori_list)
 
 
+@cached_picker_matrix
 def create_nearest_neighbor_upsample_picker_matrix(
     scale_factor, shape, tile_align=False, for_din=False, channel_last=False,
 ):
@@ -708,6 +795,7 @@ def create_nearest_neighbor_upsample_picker_matrix(
             [rows.tolist(), cols.tolist()], torch.ones(cols.shape[0]), (sparse_r, sparse_c)
         )
 
+@cached_picker_matrix
 def create_nearest_neighbor_downsample_picker_matrix(
     scale_factor, shape, tile_align=False, channel_last=False,
 ):
@@ -747,6 +835,7 @@ def create_nearest_neighbor_downsample_picker_matrix(
         )
 
 
+@cached_picker_matrix
 def create_bilinear_upsample_picker_matrix(
     scale_factor, shape, align_corners=False, tile_align=False, channel_last=False, split_idx=0, split_factor=1,
 ):
@@ -830,6 +919,7 @@ def create_bilinear_upsample_picker_matrix(
         indices = indices[(split_idx*chunk):((split_idx+1)*chunk)]
     return indices.to_sparse()
 
+@cached_picker_matrix
 def create_conv2d_transpose_weight_dident(kH, kW, tile_align=False):
     rows = torch.arange(kH * kW)
     cols = torch.flip(rows, dims=[0])
@@ -846,6 +936,7 @@ def create_conv2d_transpose_weight_dident(kH, kW, tile_align=False):
     )
 
 
+@cached_picker_matrix
 def create_conv2d_transpose_input_act_dident(y, x, stride, tile_align=False):
     cols = torch.arange(start=1, end=y * x + 1).view(y, x)
 
@@ -856,10 +947,8 @@ def create_conv2d_transpose_input_act_dident(y, x, stride, tile_align=False):
         cols = gap_cols
 
     cols = cols.reshape(-1)
-    rows = torch.arange(cols.shape[0])
-    rows = rows.index_select(0, cols.nonzero().flatten())
-    cols = cols.index_select(0, cols.nonzero().flatten())
-    cols -= 1
+    rows = cols.nonzero().flatten()
+    cols = cols.index_select(0, rows) - 1
 
     sparse_r = (y * stride) * (x * stride)
     sparse_c = y * x
@@ -874,6 +963,7 @@ def create_conv2d_transpose_input_act_dident(y, x, stride, tile_align=False):
     )
 
 
+@cached_picker_matrix
 def create_eye_sparse_picker_matrix(r, tile_align=False):
     eye = torch.arange(r)
     sparse_r = eye.shape[0]
@@ -886,6 +976,7 @@ def create_eye_sparse_picker_matrix(r, tile_align=False):
     )
 
 
+@cached_picker_matrix
 def create_all_around_padding_picker_matrix(shape, padding, channel_last=False, tile_align=False):
 
     assert len(padding) == 4
@@ -1066,6 +1157,24 @@ def interleave_tiles(pickers: "list[torch.Tensor]"):
     ).coalesce()
 
 
+def sparse_coo_zslices(sparse) -> "list[SparseCOO]":
+    """
+    Split a (1, z, r, c) sparse tensor into one SparseCOO per z slice.
+
+    Coalesced indices are sorted by (w, z, r, c), so each z slice is a contiguous run of nonzeros and can be cut
+    out of the index/value arrays directly instead of indexing the sparse tensor once per slice.
+    """
+    _, zdim, y, x = sparse.shape
+    sparse = sparse.coalesce()
+    _, zs, rows, cols = sparse.indices()
+    vals = sparse.values()
+    counts = torch.bincount(zs, minlength=zdim).tolist()
+    return [
+        SparseCOO(r.tolist(), c.tolist(), v.tolist(), [y, x])
+        for r, c, v in zip(rows.split(counts), cols.split(counts), vals.split(counts))
+    ]
+
+
 def create_sparse_buda(sparse, bcast_factor=1, fracture_factor=1, tile_align=True) -> SparseBUDA:
     while len(sparse.shape) < 4:
         sparse = sparse.unsqueeze(0)
@@ -1086,15 +1195,7 @@ def create_sparse_buda(sparse, bcast_factor=1, fracture_factor=1, tile_align=Tru
                 dtype=sparse.dtype,
             )
 
-    sparse_zs = []
-    for z in range(zdim):
-        zslice = sparse[0][z].coalesce()
-        rows, cols = zslice.indices()
-        vals = zslice.values()
-        assert len(zslice.shape) == 2
-        sparse_zs.append(
-            SparseCOO(rows.tolist(), cols.tolist(), vals.tolist(), list(zslice.shape))
-        )
+    sparse_zs = sparse_coo_zslices(sparse)
 
     return compress_sparse_tensor_and_strip_info(sparse_zs, bcast_factor, fracture_factor)
 
@@ -1125,15 +1226,7 @@ def compress_buda_picker(sparse, strip_info=True, tile_align=True):
     w, zdim, y, x = sparse.shape
     assert w == 1
 
-    sparse_zs = []
-    for z in range(zdim):
-        zslice = sparse[0][z].coalesce()
-        rows, cols = zslice.indices()
-        vals = zslice.values()
-        assert len(zslice.shape) == 2
-        sparse_zs.append(
-            SparseCOO(rows.tolist(), cols.tolist(), vals.tolist(), list(zslice.shape))
-        )
+    sparse_zs = sparse_coo_zslices(sparse)
 
     assert strip_info == True, "removed compress_sparse_tensor, oops, ping svuckovic"  # TODO: Check with Nick if we can remove this code
     sparse_buda = (
@@ -1163,10 +1256,9 @@ def compress_buda_picker(sparse, strip_info=True, tile_align=True):
 def num_sparse_tiles_in_strip(sparse, verbose=False):
     rt = align_up_tile(sparse.shape[-2]) // TILE_DIM
     ct = align_up_tile(sparse.shape[-1]) // TILE_DIM
-    rows, cols = sparse.coalesce().indices().tolist()
+    rows, cols = sparse.coalesce().indices()
     out = torch.zeros((rt, ct), dtype=torch.int32)
-    for r, c in zip(rows, cols):
-        out[r // TILE_DIM, c // TILE_DIM] = 1
+    out[rows // TILE_DIM, cols // TILE_DIM] = 1
 
     if verbose:
         for r in range(rt):
@@ -1423,6 +1515,7 @@ def pad_sparse_coo_tensor(sparse_tensor, new_shape):
     return result
 
 
+@cached_picker_matrix
 def create_pad_replicate_sparse_picker(r, c, left, right, top, bottom):
     new_shape = (r+top+bottom) * (c+left+right)
     orig_shape = r*c
@@ -1448,6 +1541,7 @@ def create_pad_replicate_sparse_picker(r, c, left, right, top, bottom):
     spm = torch.sparse_coo_tensor((rows, cols), torch.ones(new_shape), (new_shape, orig_shape))
     return spm
 
+@cached_picker_matrix
 def create_pad_reflect_sparse_picker(r, c, left, right, top, bottom):
     new_shape = (r+top+bottom) * (c+left+right)
     orig_shape = r*c
@@ -30,6 +30,9 @@ g_state_changed = True
 # Are we actively tracing a graph, allows forwarding through pybuda modules without creating ops with unique names
 g_tracing = False
 
+# Is the active trace propagating shapes and data formats only, deferring reference values until someone asks for them
+g_shapes_only_trace = False
+
 # ID used to uniquefy nodes when no names are provided
 g_unique_node_id = -1
 
@@ -124,19 +127,28 @@ def tracing() -> bool:
     """
     return g_tracing
 
-def start_tracing():
+def shapes_only_trace() -> bool:
+    """
+    Is the active trace skipping evaluation of reference values
+    """
+    return g_tracing and g_shapes_only_trace
+
+def start_tracing(shapes_only: bool = False):
     """
-    Indicate that a graph trace has started, and unique op names should be generated
+    Indicate that a graph trace has started, and unique op names should be generated.
+    If shapes_only is set, op reference values are computed lazily, the first time they are read.
     """
-    global g_tracing
+    global g_tracing, g_shapes_only_trace
     g_tracing = True
+    g_shapes_only_trace = shapes_only
 
 def stop_tracing():
     """
     Indicate that a graph trace has ended, pybuda graph can be forwarded without generating unique names
     """
-    global g_tracing
+    global g_tracing, g_shapes_only_trace
     g_tracing = False
+    g_shapes_only_trace = False
 
 def get_unique_node_id():
     """
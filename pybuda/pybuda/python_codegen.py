@@ -5,9 +5,15 @@ import os
 
 import torch
 import numpy as np
-import tensorflow as tf
 from loguru import logger
 
+from pybuda.lazy_imports import tf
+
+def get_incompatible_np_float_types():
+    # TensorFlow float types that can't be converted with .numpy(). Resolved on use so that
+    # importing the code generators doesn't import TensorFlow.
+    return [tf.bfloat16, ]
+
 def pybuda_df_str_from_str(df: str, name: str): 
         df = df.lower()
         
@@ -105,8 +111,6 @@ class PythonWriter():
         return self.module_directory + f".{self.module_name}"
 
 class PyBudaWriter(PythonWriter):
-    incompatible_np_float_types = [tf.bfloat16, ]
-
     def __init__(self, module_name, framework, contains_incompatible_np_floats=False):
         super().__init__(module_name)
 
@@ -256,7 +260,7 @@ class PyBudaWriter(PythonWriter):
             self.indent += 1
             self.wl(f"named_parameters = dict(model.state_dict().items())")
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"named_parameters.update(serialized_params)")
             self.wl("named_buffers = dict(model.named_buffers())")
             self.wl("named_parameters.update(named_buffers)")
@@ -269,19 +273,12 @@ class PyBudaWriter(PythonWriter):
                 self.indent -= 1
                 self.wl("}")
 
+            # Replace infinities with relevant numbers
+            self.wl("named_parameters = pybuda.tensor.replace_inf_values(named_parameters)")
+
             # Loop over all named params
             self.wl("for name, torch_param in named_parameters.items():")
             self.indent += 1
-            
-            # Handle -inf and inf values
-            self.wl("# Replace infinities with relevant numbers")
-            self.wl("if torch.any(torch.isinf(torch_param)):")
-            self.indent += 1
-            self.wl("torch_param = torch.where(torch.isposinf(torch_param), torch.tensor(1e4, dtype=torch_param.dtype), torch_param)")
-            self.wl("torch_param = torch.where(torch.isneginf(torch_param), torch.tensor(-1e4, dtype=torch_param.dtype), torch_param)")
-            self.wl("logger.warning(f\"Replacing -inf and inf values in tensor param: {name}\")")
-            self.indent -= 1
-            
             self.wl("tensor = torch_param.data")
 
             if len(param_names):
@@ -359,7 +356,7 @@ class PyBudaWriter(PythonWriter):
             self.wl("}")
 
             if self.contains_incompatible_np_floats:
-                self.wl(f"incompatible_np_float_types = {PyBudaWriter.incompatible_np_float_types}")
+                self.wl(f"incompatible_np_float_types = {get_incompatible_np_float_types()}")
 
             self.wl("for weight in weights:")
             self.indent += 1
@@ -432,7 +429,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
 
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"for name, torch_param in serialized_params.items():")
                 self.indent += 1
                 self.wl("tensor = torch_param.data")
@@ -495,7 +492,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
             self.wl("}")
 
-            self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+            self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
             self.wl(f"for name, torch_param in serialized_params.items():")
             self.indent += 1
             self.wl("tensor = torch_param.data")
@@ -624,7 +621,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
             self.indent -= 1
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"for name, torch_param in serialized_params.items():")
                 self.indent += 1
                 self.wl("tensor = torch_param.data")
@@ -752,7 +749,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
             self.indent -= 1
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"for name, torch_param in serialized_params.items():")
                 self.indent += 1
                 self.wl("tensor = torch_param.data")
@@ -839,7 +836,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
             self.indent -= 1
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"for key, val in serialized_params.items():")
                 self.indent += 1
                 self.wl(f"model_params[key] = jnp.array(val.data.numpy())")
@@ -880,7 +877,7 @@ class PyBudaWriter(PythonWriter):
             self.indent -= 1
             self.wl("}")
 
-            self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+            self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
             self.wl(f"for name, torch_param in serialized_params.items():")
             self.indent += 1
             self.wl("tensor = torch_param.data")
@@ -938,8 +935,6 @@ class PyBudaWriter(PythonWriter):
 
 
 class PyTorchWriter(PythonWriter):
-    incompatible_np_float_types = [tf.bfloat16, ]
-
     def __init__(self, module_name, source_framework):
         super().__init__(module_name)
 
@@ -951,6 +946,7 @@ class PyTorchWriter(PythonWriter):
         self.submodules = []
 
     def write_header(self):
+        self.wl("import pybuda")
         self.wl("import torch")
         self.wl("from torch import nn")
         self.wl("\n")
@@ -1204,7 +1200,7 @@ class PyTorchWriter(PythonWriter):
             self.indent -= 1
             self.wl("named_buffers = dict(model.named_buffers())")
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl("named_buffers.update(serialized_params)")
 
             self.wl("self.load_state_dict(named_buffers, strict=False)")
@@ -1239,7 +1235,7 @@ class PyTorchWriter(PythonWriter):
 
             if param_file_name is not None:
                 self.wl("named_parameters.update(named_buffers)")
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl("named_parameters.update(serialized_params)")
 
             self.wl("self.load_state_dict(named_parameters, strict=False)")
@@ -1256,7 +1252,7 @@ class PyTorchWriter(PythonWriter):
             self.wl("named_parameters[name] = value\n")
             self.indent -= 1
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl("serialized_params_cleaned = {}")
                 self.wl(f"for key, value in serialized_params.items():")
                 self.indent += 1
@@ -1304,7 +1300,7 @@ class PyTorchWriter(PythonWriter):
             self.indent -= 1
             self.wl("named_parameters = {}")
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl(f"for key, val in serialized_params.items():")
                 self.indent += 1
                 self.wl(f"named_parameters[key] = val")
@@ -1326,7 +1322,7 @@ class PyTorchWriter(PythonWriter):
             self.indent += 1
             self.wl("named_parameters = {}")
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl("serialized_params_cleaned = {}")
                 self.wl(f"for key, value in serialized_params.items():")
                 self.indent += 1
@@ -1341,7 +1337,7 @@ class PyTorchWriter(PythonWriter):
             self.indent += 1
             self.wl("named_parameters = {}")
             if param_file_name is not None:
-                self.wl(f"serialized_params = torch.load(\"{param_file_name}\")")
+                self.wl(f"serialized_params = pybuda.tensor.load_serialized_params(\"{param_file_name}\")")
                 self.wl("serialized_params_cleaned = {}")
                 self.wl(f"for key, value in serialized_params.items():")
                 self.indent += 1
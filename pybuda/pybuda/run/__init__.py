@@ -18,7 +18,10 @@ from .api import (
     get_loss_queue,
     get_intermediates_queue,
     sync,
+    get_dispatch_stats,
     run_generate,
     run_generative_inference,
     detect_available_devices,
 )
+from .async_api import AsyncInferencePipeline
+from .batching import DynamicBatcher
@@ -35,6 +35,7 @@ from .impl import (
     _get_loss_queue,
     _get_intermediates_queue,
     _sync,
+    _get_dispatch_stats,
     _detect_available_devices,
 )
 
@@ -468,6 +469,13 @@ def sync():
     """
     _sync()
 
+def get_dispatch_stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Return, for each device, statistics of the time from a command being issued to the device starting to run it,
+    per command type: number of commands, and mean, p50 and p99 latency in milliseconds.
+    """
+    return _get_dispatch_stats()
+
 def shutdown():
     """ 
     Shutdown running processes and clean up pybuda
@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+asyncio front-end for inference pipelines.
+
+The pipeline is strictly in-order: outputs come out of the output queue in the order in which inputs were pushed.
+Each request takes a slot in a FIFO of pending futures when its inputs are pushed, and a reader thread resolves the
+oldest pending future whenever an output arrives. Pushes are done on a single submission thread, so the FIFO order
+always matches the order of inputs on the device.
+"""
+import asyncio
+import collections
+import concurrent.futures
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+import torch
+from loguru import logger
+
+from ..pybudaglobal import get_devices
+from ..tensor import Tensor
+from .api import initialize_pipeline, run_forward, error_raised
+
+
+class AsyncInferencePipeline:
+    """
+    Submit inference requests to an initialized pipeline from asyncio code, and await their outputs.
+
+        pipeline = AsyncInferencePipeline(sample_inputs=(torch.rand(1, 32, 32),))
+        outputs = await pipeline.infer((torch.rand(1, 32, 32),))
+
+    At most `max_in_flight` requests are pushed to the devices at a time. Further `infer` calls wait for a slot
+    without blocking the event loop. A cancelled request is never pushed if it hasn't been yet; if it has, its
+    output is read and discarded when it arrives, since the device can't drop work it has already been given.
+    """
+
+    def __init__(
+            self,
+            sample_inputs: Union[Tuple[Union[torch.Tensor, Tensor], ...], Dict[str, Union[torch.Tensor, Tensor]]] = tuple(),
+            output_queue: Optional[queue.Queue] = None,
+            max_in_flight: int = 16,
+            poll_interval: float = 0.1,
+            _sequential: bool = False):
+        """
+        Parameters
+        ----------
+        sample_inputs: Tuple[Union[torch.Tensor, Tensor], ...], optional
+            Passed to `initialize_pipeline`, if the pipeline hasn't been initialized yet.
+
+        output_queue: queue.Queue, optional
+            Output queue of an already initialized pipeline. If not provided, the pipeline is initialized here.
+
+        max_in_flight: int, default=16
+            Maximum number of requests pushed to the devices and not yet returned.
+
+        poll_interval: float, default=0.1
+            How often, in seconds, the reader thread checks for errors and shutdown while waiting for outputs.
+
+        _sequential: Internal
+            Don't use
+        """
+        if output_queue is None:
+            output_queue = initialize_pipeline(training=False, sample_inputs=sample_inputs, _sequential=_sequential)
+
+        self.output_queue = output_queue
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self._sequential = _sequential
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = collections.deque()
+        self._pending_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._error: Optional[Exception] = None
+
+        # One thread keeps pushes ordered; another waits on the output queue
+        self._submitter = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pybuda_async_submit")
+        self._reader = threading.Thread(target=self._read_outputs, name="pybuda_async_reader", daemon=True)
+        self._reader.start()
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        elif self._loop is not loop:
+            raise RuntimeError("AsyncInferencePipeline can only be used from a single event loop")
+
+    def _release_slot(self):
+        self._loop.call_soon_threadsafe(self._slots.release)
+
+    def _push(self, inputs, future: asyncio.Future):
+        # The error is checked under the same lock _fail_pending sets it under, so a request either fails here
+        # or is in the pending list when everything pending is failed
+        with self._pending_lock:
+            error = self._error
+            accepted = not future.cancelled() and error is None
+            if accepted:
+                self._pending.append(future)
+
+        if not accepted:
+            if error is not None:
+                self._loop.call_soon_threadsafe(self._resolve, future, None, error)
+            self._release_slot()
+            return
+
+        try:
+            get_devices()[0].push_to_inputs(inputs)
+        except BaseException:
+            # Nothing reached the device, so no output will come for this request
+            with self._pending_lock:
+                self._pending.remove(future)
+            self._release_slot()
+            raise
+
+        try:
+            run_forward(input_count=1, _sequential=self._sequential)
+        except BaseException as e:
+            # The input is on the device without a forward pass, so outputs can't be matched to requests any more
+            self._fail_pending(e if isinstance(e, Exception) else RuntimeError(f"Forward pass failed: {e!r}"))
+            raise
+
+    def _resolve(self, future: asyncio.Future, outputs=None, error: Optional[Exception] = None):
+        # Runs on the event loop; the request may have been cancelled in the meantime
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(outputs)
+
+    def _fail_pending(self, error: Exception):
+        with self._pending_lock:
+            self._error = error
+            pending = list(self._pending)
+            self._pending.clear()
+        for future in pending:
+            self._loop.call_soon_threadsafe(self._resolve, future, None, error)
+            self._release_slot()
+
+    def _read_outputs(self):
+        while not self._closed.is_set():
+            try:
+                outputs = self.output_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                if error_raised():
+                    self._fail_pending(RuntimeError("Error raised in pybuda"))
+                    return
+                continue
+
+            with self._pending_lock:
+                future = self._pending.popleft() if len(self._pending) > 0 else None
+
+            if future is None:
+                logger.warning("AsyncInferencePipeline received an output with no pending request, dropping it")
+                continue
+
+            self._loop.call_soon_threadsafe(self._resolve, future, outputs)
+            self._release_slot()
+
+    async def infer(self, inputs: Union[Tuple[Union[torch.Tensor, Tensor], ...], Dict[str, Union[torch.Tensor, Tensor]]]) -> List[Tensor]:
+        """
+        Run one input through the pipeline and return its outputs.
+
+        Parameters
+        ----------
+        inputs: Tuple[Union[torch.Tensor, Tensor], ...]
+            Inputs for one forward pass, in the same format as `push_to_inputs`.
+
+        Returns
+        -------
+        List[Tensor]
+            Outputs of this input, as they were placed in the output queue.
+        """
+        if self._closed.is_set():
+            raise RuntimeError("AsyncInferencePipeline is closed")
+        if self._error is not None:
+            raise self._error
+
+        self._bind_loop()
+        await self._slots.acquire()
+
+        future = self._loop.create_future()
+        try:
+            # Shielded, so that a queued push always runs and frees its slot, even if this request is cancelled
+            await asyncio.shield(asyncio.wrap_future(self._submitter.submit(self._push, inputs, future)))
+        except BaseException:
+            future.cancel()
+            raise
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def in_flight(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+
+    def close(self):
+        """
+        Stop the reader and submission threads. Requests that haven't completed are cancelled. The pipeline itself
+        is left running; use `pybuda.shutdown` to stop the devices.
+        """
+        self._closed.set()
+        self._submitter.shutdown(wait=True)
+        self._reader.join()
+        with self._pending_lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        for future in pending:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(future.cancel)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
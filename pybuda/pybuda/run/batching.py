@@ -0,0 +1,274 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Dynamic batching of individual requests into the microbatch a pipeline was compiled for.
+"""
+import asyncio
+import collections
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+import torch
+from loguru import logger
+
+from ..tensor import Tensor, to_pt_tensors
+from .async_api import AsyncInferencePipeline
+
+
+@dataclass
+class _Request:
+    inputs: Tuple[torch.Tensor, ...]
+    rows: int
+    future: asyncio.Future
+    enqueue_time: float = field(default_factory=time.perf_counter)
+    dispatch_time: float = 0.0
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if len(sorted_values) == 0:
+        return 0.0
+    # Nearest-rank percentile
+    rank = math.ceil(p / 100.0 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+class DynamicBatcher:
+    """
+    Coalesce requests of one or more rows into full microbatches for an `AsyncInferencePipeline`.
+
+        pipeline = AsyncInferencePipeline(sample_inputs=(torch.rand(8, 128),))
+        batcher = DynamicBatcher(pipeline, microbatch_size=8, max_wait_ms=5)
+        outputs = await batcher.infer((torch.rand(1, 128),))
+
+    A batch is dispatched as soon as it is full, or `max_wait_ms` after its first request arrived, whichever comes
+    first. Partial batches are padded with zeros up to the microbatch size. Outputs are split back along the batch
+    dimension, so each request gets exactly its own rows. While `max_batches_in_flight` batches are already on
+    the device, new requests keep accumulating, so batches fill up more under load.
+    """
+
+    def __init__(
+            self,
+            pipeline: AsyncInferencePipeline,
+            microbatch_size: int,
+            max_wait_ms: float = 5.0,
+            max_batches_in_flight: Optional[int] = None,
+            stats_window: int = 10000):
+        """
+        Parameters
+        ----------
+        pipeline: AsyncInferencePipeline
+            Pipeline the batches are sent to.
+
+        microbatch_size: int
+            Microbatch size the pipeline was compiled for.
+
+        max_wait_ms: float, default=5.0
+            Latency budget, in milliseconds, that the first request of a batch waits for more requests to arrive.
+
+        max_batches_in_flight: int, optional
+            Maximum number of batches dispatched and not yet returned. Defaults to the pipeline's max_in_flight.
+
+        stats_window: int, default=10000
+            Number of most recent requests and batches the statistics are computed over.
+        """
+        self.pipeline = pipeline
+        self.microbatch_size = microbatch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batches_in_flight = max_batches_in_flight or pipeline.max_in_flight
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._batch_tasks = set()
+        self._carry: Optional[_Request] = None
+
+        self._queue_times: Deque[float] = collections.deque(maxlen=stats_window)
+        self._latencies: Deque[float] = collections.deque(maxlen=stats_window)
+        self._fill_ratios: Deque[float] = collections.deque(maxlen=stats_window)
+        self.requests = 0
+        self.batches = 0
+
+    def _start(self):
+        if self._batcher_task is None:
+            self._queue = asyncio.Queue()
+            self._batch_slots = asyncio.Semaphore(self.max_batches_in_flight)
+            self._batcher_task = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def infer(self, inputs: Union[Tuple[Union[torch.Tensor, Tensor], ...], List[Union[torch.Tensor, Tensor]]]) -> List[torch.Tensor]:
+        """
+        Run one request through the pipeline.
+
+        Parameters
+        ----------
+        inputs: Tuple[Union[torch.Tensor, Tensor], ...]
+            Inputs of the request. All inputs share a leading batch dimension of at most `microbatch_size` rows.
+
+        Returns
+        -------
+        List[torch.Tensor]
+            Outputs of the request, with the same number of rows as its inputs.
+        """
+        inputs = tuple(to_pt_tensors(tuple(inputs)))
+        rows = inputs[0].shape[0]
+        if rows > self.microbatch_size:
+            raise RuntimeError(f"Request with {rows} rows doesn't fit into microbatch of {self.microbatch_size}")
+        if any(t.shape[0] != rows for t in inputs):
+            raise RuntimeError("All inputs of a request must have the same batch dimension")
+
+        self._start()
+        request = _Request(inputs, rows, asyncio.get_running_loop().create_future())
+        await self._queue.put(request)
+        return await request.future
+
+    async def _next_request(self, timeout: Optional[float]) -> Optional[_Request]:
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        try:
+            if timeout is None:
+                return await self._queue.get()
+            if timeout <= 0:
+                # Past the deadline, only take what is already queued
+                return self._queue.get_nowait()
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            return None
+
+    async def _batch_loop(self):
+        while True:
+            await self._batch_slots.acquire()
+
+            batch: List[_Request] = []
+            dispatched = False
+            try:
+                rows = 0
+                deadline = None
+                while rows < self.microbatch_size:
+                    # An expired deadline (the first request waited for a batch slot, or was carried over) still
+                    # lets the batch fill up from requests that are already queued
+                    timeout = None if deadline is None else deadline - time.perf_counter()
+                    request = await self._next_request(timeout)
+                    if request is None:
+                        break
+                    if request.future.done():
+                        continue  # cancelled while queued
+                    if rows + request.rows > self.microbatch_size:
+                        self._carry = request
+                        break
+                    if deadline is None:
+                        deadline = request.enqueue_time + self.max_wait
+                    batch.append(request)
+                    rows += request.rows
+
+                if len(batch) == 0:
+                    continue
+
+                task = asyncio.get_running_loop().create_task(self._run_batch(batch, rows))
+                dispatched = True
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+            finally:
+                if not dispatched:
+                    self._batch_slots.release()
+                    # Closed while collecting; requests already taken off the queue won't run
+                    for request in batch:
+                        if not request.future.done():
+                            request.future.cancel()
+
+    def _make_batch(self, batch: List[_Request], rows: int) -> Tuple[torch.Tensor, ...]:
+        batched = []
+        for i in range(len(batch[0].inputs)):
+            tensors = [request.inputs[i] for request in batch]
+            if rows < self.microbatch_size:
+                sample = tensors[0]
+                tensors.append(torch.zeros((self.microbatch_size - rows, *sample.shape[1:]), dtype=sample.dtype))
+            batched.append(torch.cat(tensors, dim=0))
+        return tuple(batched)
+
+    async def _run_batch(self, batch: List[_Request], rows: int):
+        now = time.perf_counter()
+        for request in batch:
+            request.dispatch_time = now
+        self._fill_ratios.append(rows / self.microbatch_size)
+        self.batches += 1
+
+        try:
+            outputs = to_pt_tensors(await self.pipeline.infer(self._make_batch(batch, rows)))
+        except asyncio.CancelledError:
+            for request in batch:
+                if not request.future.done():
+                    request.future.cancel()
+            raise
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._batch_slots.release()
+
+        done = time.perf_counter()
+        offset = 0
+        for request in batch:
+            # Outputs without the microbatch dimension aren't split, and go to every request as-is
+            request_outputs = [
+                o.narrow(0, offset, request.rows) if o.dim() > 0 and o.shape[0] == self.microbatch_size else o
+                for o in outputs
+            ]
+            offset += request.rows
+            self.requests += 1
+            self._queue_times.append(request.dispatch_time - request.enqueue_time)
+            self._latencies.append(done - request.enqueue_time)
+            if not request.future.done():
+                request.future.set_result(request_outputs)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Request and batch statistics over the most recent `stats_window` requests. Times are in milliseconds.
+        """
+        latencies = sorted(self._latencies)
+        queue_times = sorted(self._queue_times)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "fill_ratio": sum(self._fill_ratios) / len(self._fill_ratios) if len(self._fill_ratios) > 0 else 0.0,
+            "queue_ms_p50": _percentile(queue_times, 50) * 1000,
+            "queue_ms_p99": _percentile(queue_times, 99) * 1000,
+            "latency_ms_p50": _percentile(latencies, 50) * 1000,
+            "latency_ms_p99": _percentile(latencies, 99) * 1000,
+        }
+
+    async def close(self):
+        """
+        Stop batching, after waiting for batches that have already been dispatched. Requests still waiting to be
+        batched are cancelled.
+        """
+        if self._batcher_task is None:
+            return
+        self._batcher_task.cancel()
+        try:
+            await self._batcher_task
+        except asyncio.CancelledError:
+            pass
+        self._batcher_task = None
+
+        if len(self._batch_tasks) > 0:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for request in pending:
+            request.future.cancel()
+
+        logger.info("DynamicBatcher stats: {}", self.stats())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -4,6 +4,7 @@
 
 from typing import Dict, Tuple, Union, List, Any, Optional
 from enum import Enum
+import time
 from pybuda.tensor import Tensor
 import torch
 
@@ -25,6 +26,7 @@ class CommandType(Enum):
     CPUEVAL_LOSS = 16
     SYNC = 17
     RUN_GENERATE = 18
+    GET_DISPATCH_STATS = 19
 
 class Command:
     """
@@ -33,6 +35,7 @@ class Command:
     def __init__(self, command_type: CommandType, params: Dict[str, Any] = {}):
         self.command_type = command_type
         self.params: Dict[str, Any] = params
+        self.created = time.monotonic() # system-wide clock, comparable between processes
 
     def __repr__(self):
         return f"{self.command_type}: {self.params}"
@@ -142,3 +145,7 @@ class Command:
     @classmethod
     def sync(cls) -> "Command":
         return Command(CommandType.SYNC, {})
+
+    @classmethod
+    def get_dispatch_stats(cls) -> "Command":
+        return Command(CommandType.GET_DISPATCH_STATS, {})
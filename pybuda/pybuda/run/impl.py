@@ -24,6 +24,8 @@ from ..config import CompilerConfig
 from ..verify import VerifyConfig, TestKind
 from ..config import _get_global_compiler_config
 from ..utils import detach_tensors
+from ..dispatch import ShutdownEvent, is_wakeup
+from .. import timeline
 
 from pybuda.tvm_to_python import generate_pybuda_module, cleanup_temporary_files
 from pybuda.tvm_utils import flatten_inputs
@@ -168,8 +170,11 @@ def _translate_framework_modules_on_devices(
                                     # if the first device is a fallback device, we want any subsequent inputs pushed to the 
                                     # original device to go to cpu_device
                                     while not tt_device._input_buffer.empty():
+                                        inputs_to_copy = tt_device._input_buffer.get()
+                                        if is_wakeup(inputs_to_copy):
+                                            continue # left over from an earlier shutdown
                                         logger.debug("Copied input buffer from tt to cpu device")
-                                        cpu_device.push_to_inputs(tt_device._input_buffer.get())
+                                        cpu_device.push_to_inputs(inputs_to_copy)
                                     tt_device.cpu_fallback_device_pre = cpu_device
                                 else:
                                     tt_device.cpu_fallback_device_post = cpu_device
@@ -178,8 +183,11 @@ def _translate_framework_modules_on_devices(
                                         cpu_device.place_loss_module(tt_device.loss_module)
                                         tt_device.remove_loss_module()
                                         while not tt_device.target_input_queue.empty():
+                                            targets_to_copy = tt_device.target_input_queue.get()
+                                            if is_wakeup(targets_to_copy):
+                                                continue # left over from an earlier shutdown
                                             logger.debug("Copied target buffer from tt to cpu device")
-                                            cpu_device.push_to_target_inputs(tt_device.target_input_queue.get())
+                                            cpu_device.push_to_target_inputs(targets_to_copy)
 
                                 updated_devices.insert(device_index, cpu_device)
                                 device_index += 1
@@ -284,14 +292,15 @@ def _run_inference(
 
 def _run_command(device: Union[CPUDevice, TTDevice], sequential: bool, command: Command, response: bool = False
         ) -> Optional[Dict]:
-    if sequential:
-        logger.trace("{}: Got command from queue: {}", device, command)
-        device.run_next_command(command)
-    else:
-        device.push_to_command_queue(command)
+    with timeline.span(f"_run_command {command.command_type.name}", device=device.name):
+        if sequential:
+            logger.trace("{}: Got command from queue: {}", device, command)
+            device.run_next_command(command)
+        else:
+            device.push_to_command_queue(command)
 
-    if response:
-        return device.get_command_queue_response()
+        if response:
+            return device.get_command_queue_response()
 
     return None
 
@@ -1009,11 +1018,11 @@ def _initialize_devices(devices: List[Union[CPUDevice, TTDevice]], sequential: b
     """
     if not sequential:
         mp_context = mp.get_context('spawn')
-        shutdown_event = mp_context.Event()
+        shutdown_event = ShutdownEvent(mp_context)
         final_barrier = mp_context.Barrier(len(devices) + 1) # plus 1 for this process
     else:
         final_barrier = None
-        shutdown_event = mp.Event()
+        shutdown_event = ShutdownEvent()
 
     scale_loss = 1.0
     if verify_cfg is not None and training:
@@ -1075,6 +1084,26 @@ def _connect_devices(
     else:
         devices[-1]._create_forward_output_queue_device_connector(output_queue)
 
+    ring_slots = _get_shared_tensor_ring_slots(sequential, training)
+    if ring_slots > 0:
+        # Inputs pushed by the user, and activations passed between CPU devices, cross process boundaries
+        devices[0].forward_input_dc.enable_shared_tensor_ring(ring_slots)
+        for d, target_device in zip(devices[:-1], devices[1:]):
+            if isinstance(d, CPUDevice) and isinstance(target_device, CPUDevice):
+                d.forward_dc.enable_shared_tensor_ring(ring_slots)
+
+def _get_shared_tensor_ring_slots(sequential: bool, training: bool) -> int:
+    """
+    Number of slots in each shared-memory ring between device processes, or 0 if tensors should be pickled through
+    queues instead. Training keeps forward inputs around for backward, past the release of their slot, so rings are
+    only used for inference.
+    """
+    if sequential or training or "PYBUDA_FORCE_SEQUENTIAL" in os.environ or os.environ.get("PYBUDA_FORCE_THREADS", "0") != "0":
+        return 0
+    if "PYBUDA_DISABLE_SHARED_TENSOR_RING" in os.environ:
+        return 0
+    return int(os.environ.get("PYBUDA_SHARED_TENSOR_RING_SLOTS", "4"))
+
 def _pass_dram_io_descriptors(devices: List[Union[CPUDevice, TTDevice]], sequential: bool, training: bool, save_intermediates: bool):
     """
     Pass dram io descriptors from TT devices to CPU devices
@@ -1170,9 +1199,9 @@ def _start_device_processes(devices: List[Union[CPUDevice, TTDevice]], output_di
 
             # Create python thread instead of another process
             if os.environ.get("PYBUDA_FORCE_THREADS", "0") != "0":
-                processes.append(threading.Thread(target=d.run, args=(output_dir,)))
+                processes.append(threading.Thread(target=d.run, args=(output_dir,), name=d.name))
             else:
-                processes.append(mp_context.Process(target=d.run, args=(output_dir,)))
+                processes.append(mp_context.Process(target=d.run, args=(output_dir,), name=d.name))
 
         for p in processes:
             p.start()
@@ -1303,6 +1332,8 @@ def _shutdown(clear_context: bool = True):
 
         finish_child_process() # clean up backend
 
+    timeline.export()
+
     if clear_context:
         clear_current_context()
 
@@ -1352,4 +1383,21 @@ def _sync():
     devices = get_devices()
     for d in devices:
         _run_command(d, sequential, Command.sync(), response=True)
+
+def _get_dispatch_stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Collect command dispatch latency statistics from each device
+    """
+    ctx = get_current_context()
+    if ctx is None:
+        return {}
+
+    sequential = len(ctx.processes) == 0
+    stats = {}
+    for d in get_devices():
+        ret = _run_command(d, sequential, Command.get_dispatch_stats(), response=True)
+        if ret is None:
+            raise RuntimeError(f"Failed to get dispatch stats from {d}")
+        stats[d.name] = ret["dispatch_stats"]
+    return stats
     
@@ -2,19 +2,20 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Union, Tuple, List, Optional, Dict
+from typing import Callable, Union, Tuple, List, Optional, Dict
 from pybuda.tvm_utils import map_tf_dtype_to_pt
 
 import torch
-import tensorflow as tf
-import mxnet
 import numpy as np
 import math
 from loguru import logger
 import copy
-import jaxlib
-import jax.numpy as jnp
 import json
+import os
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .pybudaglobal import TILE_DIM, align_up_tile, round_up_div
 from pybuda._C import DataFormat
@@ -25,8 +26,10 @@ from pybuda.utils import detach_tensors
 from functools import reduce
 from operator import mul
 from .utils import align_up
+from .timeline import traced
 
 from pybuda.tvm_utils import map_tf_dtype_to_pt, map_pt_dtype_to_tf
+from pybuda.lazy_imports import tf, jnp, is_tf_tensor, is_tf_variable, is_mxnet_ndarray, is_jax_array
 
 import pybuda
 SomeTensor = Union[torch.Tensor, "Tensor", np.ndarray]
@@ -165,10 +168,10 @@ class Tensor(TensorBase):
     def to_pytorch(self) -> torch.Tensor:
         return to_pt_tensors(self.value())[0]
 
-    def to_tensorflow(self) -> tf.Tensor:
+    def to_tensorflow(self) -> "tf.Tensor":
         return to_tf_tensors(self.value())[0]
     
-    def to_jax(self) -> jnp.ndarray:
+    def to_jax(self) -> "jnp.ndarray":
         return to_jax_tensors(self.value())[0]
 
     def to_framework(self, framework: str) -> "Tensor":
@@ -374,15 +377,71 @@ class TensorFromTrace(Tensor):
         self.src_op = src_op
         self.requires_grad = False
         self._value = None
+        self._value_deferred = False
         self._data_format = data_format
 
     def has_value(self) -> bool:
-        return self._value is not None
+        return self._value is not None or self._value_deferred
 
     def set_value(self, value: torch.Tensor):
         assert self.tensor_shape.get_pytorch_shape() == value.shape, f"Setting a tensor value of incorrect shape: {self.tensor_shape.get_pytorch_shape()} vs {value.shape}"
 
         self._value = value
+        self._value_deferred = False
+
+    def defer_value(self):
+        """
+        Mark that the value can be calculated from src_op operands, but don't calculate it until it's read
+        """
+        self._value_deferred = True
+
+    @staticmethod
+    def evaluate_deferred(tensors: List["TensorFromTrace"]):
+        """
+        Evaluate the deferred part of the trace feeding the given tensors, in one pass so that operands they share
+        are evaluated once. Only the given tensors keep their values; intermediates are dropped as soon as their
+        last consumer has been evaluated.
+        """
+        from .op.eval.pybuda import get_f_pybuda_eval # avoid circular import
+
+        def deferred_operands(t):
+            return [o for o in t.src_op.operands if isinstance(o, TensorFromTrace) and o._value is None and o._value_deferred]
+
+        targets = [t for t in tensors if isinstance(t, TensorFromTrace) and t._value is None and t._value_deferred]
+        if len(targets) == 0:
+            return
+
+        # Topologically order the deferred tensors, and count how many times each one is read
+        order = []
+        users = {}
+        expanded = set()
+        stack = [(t, False) for t in reversed(targets)]
+        while len(stack) > 0:
+            t, operands_done = stack.pop()
+            if operands_done:
+                order.append(t)
+                continue
+            if t in expanded:
+                continue
+            expanded.add(t)
+            stack.append((t, True))
+            for o in deferred_operands(t):
+                users[o] = users.get(o, 0) + 1
+                if o not in expanded:
+                    stack.append((o, False))
+
+        keep = set(targets)
+        values = {}
+        for t in order:
+            operand_values = [values[o] if o in values else (o.value() if isinstance(o, TensorBase) else o) for o in t.src_op.operands]
+            values[t] = get_f_pybuda_eval(t.src_op.cpp_op_type)(operand_values)
+            for o in deferred_operands(t):
+                users[o] -= 1
+                if users[o] == 0 and o not in keep:
+                    del values[o]
+
+        for t in targets:
+            t.set_value(values[t])
 
     @property
     def shape(self):
@@ -390,6 +449,9 @@ class TensorFromTrace(Tensor):
 
     def value(self) -> torch.Tensor:
 
+        if self._value is None and self._value_deferred:
+            TensorFromTrace.evaluate_deferred([self])
+
         if self._value is not None:
             return self._value
 
@@ -400,6 +462,8 @@ class TensorFromTrace(Tensor):
         t.requires_grad = self.requires_grad
         if self._value:
             t.set_value(self._value.clone())
+        elif self._value_deferred:
+            t.defer_value()
         return t
 
 
@@ -407,8 +471,7 @@ class TensorFromTrace(Tensor):
     def pt_data_format(self) -> torch.dtype:
         if self._value is not None:
             return self._value.dtype
-
-        raise RuntimeError("Trying to get Tensor value where there isn't one")
+        return buda_dataformat_to_pytorch_dtype(self.data_format)
 
     @property
     def data_format(self) -> DataFormat:
@@ -436,8 +499,8 @@ class TensorFromTrace(Tensor):
             If batch != 0, set batch dimension to given value
         """
 
-        if self._value:
-            return pytorch_tensor_to_tensor_desc(self._value)
+        if self.has_value():
+            return pytorch_tensor_to_tensor_desc(self.value())
 
         assert False
 
@@ -491,15 +554,23 @@ class TensorFromDescriptor(Tensor):
         return self.descriptor
 
     # TODO: Can reinterpret shape be moved outside of this method?
-    def narrow_to_original_shape(self, original_shape: Tuple[int, ...], reinterpret_shape: Optional[Tuple[int, ...]] = None, has_microbatch_dim: bool = False, unpadded_shape: Optional[Tuple[int, ...]] = None) -> "Tensor":
+    @traced()
+    def narrow_to_original_shape(self, original_shape: Tuple[int, ...], reinterpret_shape: Optional[Tuple[int, ...]] = None, has_microbatch_dim: bool = False, unpadded_shape: Optional[Tuple[int, ...]] = None, out: Optional[torch.Tensor] = None) -> "Tensor":
         """
-        Narrow the tensor to a smaller one, if original shape is smaller
+        Narrow the tensor to a smaller one, if original shape is smaller.
+        If out is given, the narrowed tensor is copied into it (converting type, if needed), and the result wraps out.
         """
         assert type(original_shape) == tuple, "original_shape must be a tuple"
+        if out is not None:
+            assert tuple(out.shape) == original_shape, f"Output buffer shape {tuple(out.shape)} doesn't match output shape {original_shape}"
+            assert out.is_contiguous(), "Output buffer must be contiguous"
 
         tensor = self.value()
 
         if self.shape.get_pytorch_shape() == original_shape and (reinterpret_shape is None or len(reinterpret_shape) == 0):
+            if out is not None:
+                out.copy_(tensor)
+                return Tensor.create_from_torch(out)
             return Tensor.create_from_torch(tensor)
 
         shape_transform = original_shape if (reinterpret_shape is None or len(reinterpret_shape) == 0) else reinterpret_shape
@@ -515,6 +586,11 @@ class TensorFromDescriptor(Tensor):
             new_shape = (new_shape[-1],)
             new_tensor = narrow_buda_tensor_to_pytorch(tensor, new_shape, has_microbatch_dim=has_microbatch_dim)
 
+        if out is not None:
+            # Copy the narrowed view as-is, reshaping the destination instead, so no intermediate copy is made
+            out.view(new_tensor.shape).copy_(new_tensor)
+            return Tensor.create_from_torch(out)
+
         new_tensor = new_tensor.reshape(original_shape)
         
         # Reshape the rest
@@ -788,6 +864,7 @@ def is_buda_shape(tensor: torch.Tensor, min_dim = -1) -> bool:
         return False
     return (tensor.shape[-1] % TILE_DIM == 0 and tensor.shape[-2] % TILE_DIM == 0)
 
+@traced()
 def pad_pytorch_tensor_to_buda(
         tensor: torch.Tensor, tile_broadcast_dims: List[int], squeeze: bool = False, microbatch = 1, tile_r = TILE_DIM, tile_c = TILE_DIM) -> torch.Tensor:
     """
@@ -862,6 +939,51 @@ def pad_pytorch_tensor_to_buda(
     ret.requires_grad = tensor.requires_grad
     return ret
 
+@traced()
+def stage_pytorch_tensor_to_buda(
+        tensor: torch.Tensor, tile_broadcast_dims: List[int], staging: Optional[torch.Tensor], dtype: torch.dtype,
+        squeeze: bool = False, microbatch = 1, tile_r = TILE_DIM, tile_c = TILE_DIM) -> Optional[torch.Tensor]:
+    """
+    Equivalent of pad_pytorch_tensor_to_buda followed by a conversion to dtype, but done in a single copy into a
+    tile-aligned staging buffer. The staging buffer is reused if it has the right shape and type, otherwise a new
+    zero-filled one is allocated. Only the un-padded region is ever written, so padding stays zero.
+
+    Returns the staging buffer holding the result, or None if the tensor isn't a candidate for staging (either
+    pad_pytorch_tensor_to_buda wouldn't copy it at all, or padding needs to replicate) and the regular path should be used.
+    """
+    if tensor.is_sparse:
+        return None
+
+    if any(d in tile_broadcast_dims for d in [-1, -2, 2, 3]):
+        return None # replicate-padding, leave it to torch.nn.functional.pad
+
+    min_dim = 2 if squeeze and tensor.shape[0] != microbatch and len(tensor.shape) > 2 else 4
+    if is_buda_shape(tensor, min_dim) and tensor.dtype == dtype and tensor.is_contiguous():
+        return None # pushed as-is, nothing to save
+
+    new_tensor = tensor
+    while len(new_tensor.shape) < min_dim:
+        if new_tensor.shape[0] == microbatch:
+            new_tensor = new_tensor.unsqueeze(1)
+        else:
+            new_tensor = new_tensor.unsqueeze(0)
+
+    while len(new_tensor.shape) > 5:
+        assert new_tensor.shape[0] == 1, "Invalid dimension size above dim 5"
+        new_tensor = new_tensor.squeeze(0)
+
+    if new_tensor.shape[0] < microbatch:
+        new_tensor = new_tensor.broadcast_to([microbatch, *new_tensor.shape[1:]])
+
+    dim_r, dim_c = new_tensor.shape[-2], new_tensor.shape[-1]
+    padded_shape = (*new_tensor.shape[:-2], align_up(dim_r, tile_r), align_up(dim_c, tile_c))
+    if staging is None or tuple(staging.shape) != padded_shape or staging.dtype != dtype:
+        staging = torch.zeros(padded_shape, dtype=dtype)
+
+    with torch.no_grad():
+        staging[..., :dim_r, :dim_c].copy_(new_tensor)
+    return staging
+
 def narrow_buda_tensor_to_pytorch(tensor: torch.Tensor, shape: List[int], has_microbatch_dim: bool = False) -> torch.Tensor:
     """
     Narrow 4D / tile-snapped tensor to original pytorch shape
@@ -939,6 +1061,69 @@ def narrow_buda_tensor_to_pytorch(tensor: torch.Tensor, shape: List[int], has_mi
 
     return new_tensor
 
+def compile_narrow_plan(
+        original_shape: Tuple[int, ...], reinterpret_shape: Optional[List[int]] = None,
+        has_microbatch_dim: bool = False) -> Callable[["Tensor", Optional[torch.Tensor]], "Tensor"]:
+    """
+    Work out once how outputs of one queue are narrowed to their original shape. Returns a function that does the
+    same as Tensor.narrow_to_original_shape, for a tensor and an optional output buffer. Rows and columns to keep
+    are worked out the first time each padded shape is seen.
+    """
+    original_shape = tuple(original_shape)
+    reinterpret = reinterpret_shape is not None and len(reinterpret_shape) > 0
+    shape_transform = tuple(reinterpret_shape) if reinterpret else original_shape
+    steps = {} # padded shape -> (rows, columns) to keep, or one of the markers below
+    AS_IS = "as_is"
+    RESHAPE = "reshape"
+    FALLBACK = "fallback"
+
+    def plan_step(padded_shape: torch.Size):
+        if tuple(padded_shape) == original_shape and not reinterpret:
+            return AS_IS
+
+        # Scalars, vectors and transposed T dims are rare, and left to the general path
+        if len(shape_transform) < 2 or len(padded_shape) == 0:
+            return FALLBACK
+        if len(padded_shape) == 4 and len(shape_transform) == 4 and padded_shape[-3] != shape_transform[-3]:
+            return FALLBACK
+        if reduce(mul, padded_shape) == reduce(mul, shape_transform):
+            return RESHAPE
+
+        shape_ = shape_transform[1:] if has_microbatch_dim else shape_transform
+        return (1 if len(shape_) == 1 else shape_[-2], shape_[-1])
+
+    @traced("narrow_to_original_shape")
+    def narrow(t: "Tensor", out: Optional[torch.Tensor] = None) -> "Tensor":
+        tensor = t.value()
+        step = steps.get(tensor.shape)
+        if step is None:
+            step = steps[tensor.shape] = plan_step(tensor.shape)
+
+        if step is FALLBACK or tensor.is_sparse:
+            return t.narrow_to_original_shape(
+                original_shape, list(reinterpret_shape) if reinterpret else None, has_microbatch_dim=has_microbatch_dim, out=out)
+
+        if out is not None:
+            assert tuple(out.shape) == original_shape, f"Output buffer shape {tuple(out.shape)} doesn't match output shape {original_shape}"
+            assert out.is_contiguous(), "Output buffer must be contiguous"
+
+        if step is AS_IS:
+            if out is not None:
+                out.copy_(tensor)
+                return Tensor.create_from_torch(out)
+            return Tensor.create_from_torch(tensor)
+
+        if step is not RESHAPE:
+            tensor = tensor.narrow(-2, 0, step[0]).narrow(-1, 0, step[1])
+
+        if out is not None:
+            # Copy the narrowed view as-is, viewing the destination in its shape, so no intermediate copy is made
+            out.view(tensor.shape).copy_(tensor)
+            return Tensor.create_from_torch(out)
+        return Tensor.create_from_torch(tensor.reshape(original_shape))
+
+    return narrow
+
 def change_rank(tensor: torch.Tensor, rank: int):
     while len(tensor.shape) > rank:
         assert tensor.shape[0] == 1
@@ -947,7 +1132,7 @@ def change_rank(tensor: torch.Tensor, rank: int):
         tensor = tensor.unsqueeze(0)
     return tensor
 
-def to_tf_variables(tensors: Tuple[Union[torch.Tensor, Tensor], ...], convert_format: bool = False) -> Tuple[tf.Variable, ...]:
+def to_tf_variables(tensors: Tuple[Union[torch.Tensor, Tensor], ...], convert_format: bool = False) -> Tuple["tf.Variable", ...]:
     """
     Take a tuple of either pytorch, TF or buda tensors, and return TF Variables.
     """
@@ -973,9 +1158,9 @@ def to_tf_variables(tensors: Tuple[Union[torch.Tensor, Tensor], ...], convert_fo
                 dtype=map_pt_dtype_to_tf(pt_value.dtype),
                 ),
                 trainable=t.value().requires_grad))
-        elif isinstance(t, tf.Tensor):
+        elif is_tf_tensor(t, include_variables=False):
             tf_variables.append(tf.Variable(t))
-        elif isinstance(t, tf.Variable):
+        elif is_tf_variable(t):
             tf_variables.append(t)
         elif t is None:
             tf_variables.append(None)
@@ -985,7 +1170,7 @@ def to_tf_variables(tensors: Tuple[Union[torch.Tensor, Tensor], ...], convert_fo
     return tuple(tf_variables)
 
 
-def to_tf_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], ...], Dict[str, Union[torch.Tensor, Tensor, tf.Tensor]]], convert_format: bool = False, force_float32: bool = False) -> Tuple[torch.Tensor, ...]:
+def to_tf_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, "tf.Tensor"], ...], Dict[str, Union[torch.Tensor, Tensor, "tf.Tensor"]]], convert_format: bool = False, force_float32: bool = False) -> Tuple[torch.Tensor, ...]:
     """
     Take a tuple of either tensorflow or buda tensors, and return pytorch tensors. Generate zero-tensors
     if no value exists.
@@ -994,7 +1179,7 @@ def to_tf_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], .
     if not isinstance(tensors, (list, tuple)):
         tensors = (tensors, )
     for t in tensors:
-        if isinstance(t, (tf.Tensor, tf.Variable)):
+        if is_tf_tensor(t):
             assert not convert_format, "Can't convert format of raw pytorch tensor - don't know what the target format is"
             tf_tensors.append(t)
         elif isinstance(t, torch.Tensor):
@@ -1028,7 +1213,7 @@ def to_tf_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], .
     return ret
 
 
-def to_pt_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], ...], Dict[str, Union[torch.Tensor, Tensor, tf.Tensor]]], convert_format: bool = False) -> Tuple[torch.Tensor, ...]:
+def to_pt_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, "tf.Tensor"], ...], Dict[str, Union[torch.Tensor, Tensor, "tf.Tensor"]]], convert_format: bool = False) -> Tuple[torch.Tensor, ...]:
     """
     Take a tuple of either pytorch or buda tensors, and return pytorch tensors. Generate zero-tensors
     if no value exists.
@@ -1041,7 +1226,7 @@ def to_pt_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], .
         if isinstance(t, torch.Tensor):
             assert not convert_format, "Can't convert format of raw pytorch tensor - don't know what the target format is"
             pytorch_tensors.append(t)
-        elif isinstance(t, (tf.Tensor, tf.Variable)):
+        elif is_tf_tensor(t):
             pt = torch.Tensor(t.numpy() if t.dtype != tf.bfloat16 else tf.cast(t, tf.float32).numpy()).type(map_tf_dtype_to_pt(t.dtype))
             pt.requires_grad = t.trainable if isinstance(t, tf.Variable) else torch.is_complex(pt) or torch.is_floating_point(pt)
             pytorch_tensors.append(pt)
@@ -1063,9 +1248,9 @@ def to_pt_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], .
 
         elif isinstance(t, np.ndarray):
             pytorch_tensors.append(torch.Tensor(t))
-        elif isinstance(t, mxnet.ndarray.ndarray.NDArray):
+        elif is_mxnet_ndarray(t):
             pytorch_tensors.append(torch.Tensor(t.asnumpy()))
-        elif isinstance(t, jaxlib.xla_extension.DeviceArray):
+        elif is_jax_array(t):
             pytorch_tensors.append(torch.Tensor(np.array(t)))
         else:
             raise RuntimeError(f"Unknown type of tensor: {type(t)}")
@@ -1073,7 +1258,7 @@ def to_pt_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], .
     ret = tuple(pytorch_tensors) if isinstance(tensors, (tuple, list)) else (pytorch_tensors,)
     return ret
 
-def to_jax_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor], ...], Dict[str, Union[torch.Tensor, Tensor, tf.Tensor]]], convert_format: bool = False) -> Tuple[torch.Tensor, ...]:
+def to_jax_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, "tf.Tensor"], ...], Dict[str, Union[torch.Tensor, Tensor, "tf.Tensor"]]], convert_format: bool = False) -> Tuple[torch.Tensor, ...]:
     """
     Take a tuple of either pytorch or buda tensors, and return pytorch tensors. Generate zero-tensors
     if no value exists.
@@ -1086,7 +1271,7 @@ def to_jax_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor],
         if isinstance(t, torch.Tensor):
             assert not convert_format, "Can't convert format of raw pytorch tensor - don't know what the target format is"
             jax_tensors.append(jnp.asarray(t.detach().numpy()))
-        elif isinstance(t, (tf.Tensor, tf.Variable)):
+        elif is_tf_tensor(t):
             jax_tensor = jnp.asarray(t.numpy())
             jax_tensors.append(jax_tensor)
         elif isinstance(t, Tensor):
@@ -1107,9 +1292,9 @@ def to_jax_tensors(tensors: Union[Tuple[Union[torch.Tensor, Tensor, tf.Tensor],
 
         elif isinstance(t, np.ndarray):
             jax_tensors.append(jnp.asarray(t))
-        elif isinstance(t, mxnet.ndarray.ndarray.NDArray):
+        elif is_mxnet_ndarray(t):
             jax_tensors.append(jnp.asarray(t.asnumpy()))
-        elif isinstance(t, jaxlib.xla_extension.DeviceArray):
+        elif is_jax_array(t):
             jax_tensors.append(t)
         else:
             raise RuntimeError(f"Unknown type of tensor: {type(t)}")
@@ -1127,7 +1312,7 @@ def to_buda_tensors(tensors: Tuple[Union[torch.Tensor, Tensor], ...]) -> Tuple[T
             buda_tensors.append(Tensor.create_from_torch(t))
         elif isinstance(t, Tensor):
             buda_tensors.append(t)
-        elif isinstance(t, (tf.Tensor, tf.Variable)):
+        elif is_tf_tensor(t):
             pt = torch.Tensor(t.numpy()).type(map_tf_dtype_to_pt(t.dtype))
             pt.requires_grad = t.trainable if isinstance(t, tf.Variable) else torch.is_complex(pt) or torch.is_floating_point(pt)
             buda_tensors.append(Tensor.create_from_torch(pt))
@@ -1149,7 +1334,7 @@ def remove_microbatch(tensors: Tuple[Union[torch.Tensor, Tensor], ...]) -> Tuple
     for input in tensors:
         if isinstance(input, torch.Tensor):
             out.append(Tensor.create_from_torch(torch.narrow(input.clone(), 0, 0, 1)))
-        elif isinstance(input, (tf.Variable, tf.Tensor)):
+        elif is_tf_tensor(input):
             torch_tensor = torch.Tensor(input.numpy()).type(map_tf_dtype_to_pt(input.dtype))
             out.append(Tensor.create_from_torch(torch.narrow(torch_tensor, 0, 0, 1)))
         elif isinstance(input, (list, tuple)):
@@ -1226,7 +1411,20 @@ def consteval_tensor(
         loss_name = get_loss_node()
         inputs[loss_name] = inputs[name]
 
-    for node_name in filter(is_node_in_epoch, consteval_graph["topological_sorted_nodes"]):
+    # Count consumers of each node, so intermediate tensors can be released as soon as they're no longer needed
+    epoch_nodes = list(filter(is_node_in_epoch, consteval_graph["topological_sorted_nodes"]))
+    remaining_uses: Dict[str, int] = {}
+    for node_name in epoch_nodes:
+        for operand in consteval_graph["nodes"][node_name].get("input_nodes", []):
+            remaining_uses[operand] = remaining_uses.get(operand, 0) + 1
+
+    def release_operands(node):
+        for operand in node["input_nodes"]:
+            remaining_uses[operand] -= 1
+            if remaining_uses[operand] == 0:
+                del node_to_tensor[operand]
+
+    for node_name in epoch_nodes:
         node = consteval_graph["nodes"][node_name]
         if node["opcode"] == "Input":
             input_value = inputs[node_name]
@@ -1246,9 +1444,11 @@ def consteval_tensor(
 
             output = eval_op(node["op_type"], inputs_after_tms)
             node_to_tensor[node_name] = output
+            release_operands(node)
 
         elif node["opcode"] == "Output":
             output = node_to_tensor[node["input_nodes"][0]]
+            release_operands(node)
 
     assert output is not None, "Expect a valid tensor output out of consteval"
     if is_buda:
@@ -1329,17 +1529,172 @@ def get_device_constant_and_parameters(device, *, constant_to_tensor=None, updat
     return inputs
 
 
-def get_post_const_eval_tensors(graph, device_constant_and_parameters, consteval_trace, input_to_tile_dims, ordered_input_names, is_buda=True) -> Dict[str, torch.Tensor]:
-    post_const_eval_constants: Dict[str, torch.Tensor] = {}
+class ConstEvalDiskCache:
+    """
+    Content-addressed on-disk cache of post-consteval tensors.
+
+    Entries are keyed on the serialized consteval graph of an input together with the contents of the tensors
+    feeding it, so recompiling the same checkpoint (e.g. with different balancer overrides) reuses earlier results.
+    Cached tensors are memory-mapped on load. Total size is capped, and least recently used entries are evicted
+    first, using file modification time as the access stamp.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, consteval_graph, inputs: Dict[str, torch.Tensor], tile_dims: Tuple[int, int], is_buda: bool) -> Optional[str]:
+        h = hashlib.sha256()
+        h.update(json.dumps([self.VERSION, consteval_graph, list(tile_dims), is_buda], sort_keys=True, default=str).encode("utf-8"))
+        for name in sorted(inputs.keys()):
+            t = inputs[name]
+            if not isinstance(t, torch.Tensor) or t.layout != torch.strided:
+                return None
+            t = t.detach().cpu().contiguous()
+            h.update(f"{name}:{t.dtype}:{list(t.shape)}".encode("utf-8"))
+            h.update(t.reshape(-1).view(torch.uint8).numpy().data)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pt")
+
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        path = self._path(key)
+        try:
+            tensor = torch.load(path, mmap=True)
+            os.utime(path)
+        except (FileNotFoundError, RuntimeError, EOFError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Ignoring corrupt consteval cache entry {}: {}", path, e)
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return tensor
+
+    def put(self, key: str, tensor: torch.Tensor):
+        # Clone views, so that only the tensor's own data is written out rather than its whole storage
+        if tensor.untyped_storage().nbytes() != tensor.numel() * tensor.element_size():
+            tensor = tensor.clone()
+
+        # Write to a temporary file and rename, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                torch.save(tensor, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def evict(self):
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".pt"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_bytes -= size
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_consteval_disk_cache: Optional[ConstEvalDiskCache] = None
+
+def get_consteval_disk_cache() -> Optional[ConstEvalDiskCache]:
+    """
+    Consteval disk cache, enabled by setting PYBUDA_CONSTEVAL_CACHE_DIR. Size is capped to
+    PYBUDA_CONSTEVAL_CACHE_SIZE_MB (default 4096).
+    """
+    global _consteval_disk_cache
+    cache_dir = os.environ.get("PYBUDA_CONSTEVAL_CACHE_DIR", None)
+    if not cache_dir:
+        return None
+
+    max_bytes = int(os.environ.get("PYBUDA_CONSTEVAL_CACHE_SIZE_MB", "4096")) * 1024 * 1024
+    if _consteval_disk_cache is None or _consteval_disk_cache.cache_dir != cache_dir:
+        _consteval_disk_cache = ConstEvalDiskCache(cache_dir, max_bytes)
+    _consteval_disk_cache.max_bytes = max_bytes
+    return _consteval_disk_cache
+
+def get_consteval_num_threads() -> int:
+    """
+    Number of threads used to const-eval independent inputs in parallel. Torch ops release the GIL, so
+    threads give real parallelism here.
+    """
+    return int(os.environ.get("PYBUDA_CONSTEVAL_THREADS", min(8, os.cpu_count() or 1)))
+
+def load_serialized_params(param_file_name: str) -> Dict[str, torch.Tensor]:
+    """
+    Load a params file written by generated PyBuda modules. Tensor data is memory-mapped rather than read
+    into memory, so pages are only loaded once they're used.
+    """
+    try:
+        return torch.load(param_file_name, mmap=True)
+    except RuntimeError:
+        # Files saved with the legacy (non-zip) serialization can't be mapped
+        return torch.load(param_file_name)
+
+def get_param_load_num_threads() -> int:
+    return int(os.environ.get("PYBUDA_PARAM_LOAD_THREADS", min(8, os.cpu_count() or 1)))
+
+def _has_inf(tensor: torch.Tensor) -> bool:
+    if not torch.is_floating_point(tensor) or tensor.numel() == 0:
+        return False
+
+    # Reductions don't materialize a full-size mask like isinf() does
+    max_value, min_value = tensor.max(), tensor.min()
+    if torch.isnan(max_value) or torch.isnan(min_value):
+        return bool(torch.any(torch.isinf(tensor)))
+    return bool(max_value == math.inf or min_value == -math.inf)
+
+def replace_inf_values(named_tensors: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """
+    Replace +/-inf with +/-1e4 in framework parameters. Tensors are scanned in parallel, and only the ones that
+    contain infinities are copied; everything else is passed through as-is.
+    """
+    names = [name for name, tensor in named_tensors.items() if isinstance(tensor, torch.Tensor)]
+    with ThreadPoolExecutor(max_workers=get_param_load_num_threads()) as executor:
+        has_inf = list(executor.map(lambda name: _has_inf(named_tensors[name].data), names))
+
+    result = dict(named_tensors)
+    for name, inf in zip(names, has_inf):
+        if inf:
+            tensor = named_tensors[name]
+            tensor = torch.where(torch.isposinf(tensor), torch.tensor(1e4, dtype=tensor.dtype), tensor)
+            tensor = torch.where(torch.isneginf(tensor), torch.tensor(-1e4, dtype=tensor.dtype), tensor)
+            logger.warning(f"Replacing -inf and inf values in tensor param: {name}")
+            result[name] = tensor
+    return result
 
+def get_post_const_eval_tensors(graph, device_constant_and_parameters, consteval_trace, input_to_tile_dims, ordered_input_names, is_buda=True) -> Dict[str, torch.Tensor]:
     constant_nodes = {
         node.name: node
         for node in graph.get_constant_nodes(recurse=True)
     }
 
-    for input_name in ordered_input_names:
-        # Load input constant tensors for consteval
-        inputs = get_constant_inputs(
+    # Load input constant tensors for consteval. Done up-front, since it reads from the graph.
+    all_inputs = {
+        input_name: get_constant_inputs(
             constant_nodes,
             device_constant_and_parameters,
             consteval_trace,
@@ -1347,8 +1702,25 @@ def get_post_const_eval_tensors(graph, device_constant_and_parameters, consteval
             is_buda,
             "Forward"
         )
+        for input_name in ordered_input_names
+    }
+
+    cache = get_consteval_disk_cache()
 
-        post_const_eval_constants[input_name] = detach_tensors(
+    def evaluate(input_name: str) -> torch.Tensor:
+        inputs = all_inputs.pop(input_name)
+
+        # Inputs without recorded operations are only padded, which isn't worth caching
+        key = None
+        if cache is not None and consteval_trace.get(input_name, None):
+            tile_dims = input_to_tile_dims.get(input_name, (TILE_DIM, TILE_DIM))
+            key = cache.key(consteval_trace[input_name], inputs, tile_dims, is_buda)
+            if key is not None:
+                value = cache.get(key)
+                if value is not None:
+                    return value
+
+        value = detach_tensors(
             [
                 const_eval_tensor(
                     inputs,
@@ -1361,7 +1733,25 @@ def get_post_const_eval_tensors(graph, device_constant_and_parameters, consteval
             fix_non_contiguos=True,
         )[0]
 
-    return post_const_eval_constants
+        if key is not None:
+            cache.put(key, value)
+        return value
+
+    # Each input has its own consteval graph, so they can all be evaluated independently
+    num_threads = min(get_consteval_num_threads(), len(ordered_input_names))
+    if num_threads <= 1:
+        post_const_eval_tensors = {input_name: evaluate(input_name) for input_name in ordered_input_names}
+    else:
+        logger.debug("Const-evaluating {} inputs on {} threads", len(ordered_input_names), num_threads)
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = {input_name: executor.submit(evaluate, input_name) for input_name in ordered_input_names}
+            post_const_eval_tensors = {input_name: future.result() for input_name, future in futures.items()}
+
+    if cache is not None:
+        cache.evict()
+        cache_stats = cache.stats()
+        logger.debug("Consteval cache: {} hits, {} misses", cache_stats["hits"], cache_stats["misses"])
+    return post_const_eval_tensors
 
 def _embedding_index(tensor: torch.Tensor, original_shape: Tuple[int, ...], queue: DramIODesc):
     assert queue.data_format in [DataFormat.RawUInt8, DataFormat.RawUInt16, DataFormat.RawUInt32]
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Opt-in timeline of host-side pipeline work, written out as Chrome trace JSON (chrome://tracing, ui.perfetto.dev).
+
+Set PYBUDA_TIMELINE_TRACE to the output file to enable it. Each process records spans in memory, with one track per
+process and thread, and writes them to a parts directory next to the output file when it's done. The main process
+merges all parts into the output file on shutdown. Timestamps come from the monotonic clock, which all processes on
+the host share, so spans from device processes line up with the main process.
+
+When tracing is disabled, `traced` returns functions unchanged and `span` returns a shared no-op context manager.
+"""
+import atexit
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+TRACE_FILE = os.environ.get("PYBUDA_TIMELINE_TRACE", "")
+enabled = len(TRACE_FILE) > 0
+
+# (name, start_us, duration_us, tid, args) of spans not yet written out by this process
+_events: List[Tuple[str, float, float, int, Optional[Dict[str, Any]]]] = []
+_thread_names: Dict[int, str] = {}
+_flush_count = 0
+
+# Events from all processes, merged by the main process so far
+_merged: List[Dict[str, Any]] = []
+
+# True in the process that started tracing, and merges the parts
+_main_process = False
+
+def _now_us() -> float:
+    return time.monotonic_ns() / 1000
+
+def _record(name: str, start: float, duration: float, args: Optional[Dict[str, Any]]):
+    tid = threading.get_native_id()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    _events.append((name, start, duration, tid, args))
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _record(self.name, self.start, _now_us() - self.start, self.args)
+        return False
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name: str, **args):
+    """
+    Context manager that records the time spent inside it as a span. Keyword arguments are shown with the span.
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, args if len(args) > 0 else None)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that records each call of the function as a span, named after the function unless name is given.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if not enabled:
+            return fn
+
+        span_name = name or fn.__qualname__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = _now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(span_name, start, _now_us() - start, None)
+        return wrapper
+    return decorator
+
+def _parts_dir() -> str:
+    return os.environ["PYBUDA_TIMELINE_TRACE_PARTS"]
+
+def flush():
+    """
+    Write spans recorded by this process so far to the parts directory
+    """
+    global _flush_count
+    if not enabled:
+        return
+
+    # Copy, then drop only what was copied, so spans recorded by other threads in the meantime are kept
+    events = _events[:]
+    del _events[:len(events)]
+    if len(events) == 0:
+        return
+
+    pid = os.getpid()
+    trace_events = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": multiprocessing.current_process().name}}]
+    for tid, thread_name in list(_thread_names.items()):
+        trace_events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+    for name, start, duration, tid, args in events:
+        event = {"ph": "X", "cat": "pybuda", "name": name, "pid": pid, "tid": tid, "ts": start, "dur": duration}
+        if args is not None:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        trace_events.append(event)
+
+    os.makedirs(_parts_dir(), exist_ok=True)
+    with open(os.path.join(_parts_dir(), f"{pid}-{_flush_count}.json"), "w") as f:
+        json.dump(trace_events, f)
+    _flush_count += 1
+
+def export():
+    """
+    Merge spans written by all processes into the trace file. Only done by the main process, after the device
+    processes have exited.
+    """
+    if not enabled or not _main_process:
+        return
+
+    flush()
+    for part in sorted(glob.glob(os.path.join(_parts_dir(), "*.json"))):
+        try:
+            with open(part) as f:
+                _merged.extend(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning("Timeline: skipping unreadable trace part {}: {}", part, e)
+        os.remove(part)
+    try:
+        os.rmdir(_parts_dir())
+    except OSError:
+        pass
+
+    with open(TRACE_FILE, "w") as f:
+        json.dump({"traceEvents": _merged, "displayTimeUnit": "ms"}, f)
+    logger.info("Timeline: wrote {} events to {}", len(_merged), TRACE_FILE)
+
+if enabled:
+    if "PYBUDA_TIMELINE_TRACE_PARTS" not in os.environ:
+        # Spawned device processes inherit this, and write their parts to the same place
+        os.environ["PYBUDA_TIMELINE_TRACE_PARTS"] = f"{TRACE_FILE}.{os.getpid()}.parts"
+        _main_process = True
+        atexit.register(export)
+    else:
+        atexit.register(flush)
@@ -13,6 +13,8 @@ import subprocess as sp
 import json
 import copy
 from loguru import logger
+from pybuda.tti.blob_store import TTIBlobStore, get_tti_blob_store, make_manifest
+from pybuda.tti.utils import compute_file_checksum
 
 # Track all temp directories used for intermediate steps
 # Delete them as part of cleanup
@@ -211,27 +213,118 @@ def get_queue_size(netlist, queue):
         tile_width = netlist["queues"][queue]["tile_dim"][1]
     return backend_api.get_io_size_in_bytes(format, is_untilized, ublock_ct, ublock_rt, mblock_m, mblock_n, t, entries, tile_height, tile_width)
     
-def reallocate_queues(merged_model, dynamic_queues, start_offset_to_queue_buf_per_model, soc_descriptor, switch_chans_if_capacity_hit, overlap_dynamic_queues):
-    dev_cfg = backend_api.DeviceConfig("wormhole_b0",
-                             soc_descriptor,
-                             "",
-                             "",
-                             "",
-                             False,
-                             [])
-    max_reserved_backend_space = dev_cfg.get_dram_backend_reserved_max()
-    backend_reserved_dram_memory = {0 : max_reserved_backend_space, 1 : max_reserved_backend_space, 2 : max_reserved_backend_space, 3 : max_reserved_backend_space, 
-                                   4 : max_reserved_backend_space, 5 : max_reserved_backend_space}
-    memory_consumed_per_host_channel = {}
-    for host_chan in range(dev_cfg.get_host_memory_num_channels()):
-        memory_consumed_per_host_channel[host_chan] = dev_cfg.get_host_memory_channel_start_address()
-    
+def get_dynamic_queue_lifetimes(merged_model):
+    """
+    Lifetime of each dynamic queue, as a (model, first allocate, last deallocate) interval of instruction indices
+    over its model's programs. Queues that are never deallocated live until the end of their model's programs.
+    """
+    model_name_pattern = r'model_\d+'
+    num_instructions_per_model = {}
+    allocated_at = {}
+    deallocated_at = {}
+    for program in merged_model["programs"]:
+        for prog_name, instrns in program.items():
+            model_name = re.search(model_name_pattern, prog_name).group()
+            for instrn in instrns:
+                idx = num_instructions_per_model.get(model_name, 0)
+                num_instructions_per_model[model_name] = idx + 1
+                if type(instrn) != dict:
+                    continue
+                instrn_type = list(instrn.keys())[0]
+                if instrn_type == "allocate_queue":
+                    for queue in list(instrn.values())[0]:
+                        allocated_at.setdefault(queue, idx)
+                elif instrn_type == "deallocate_queue":
+                    for queue in list(instrn.values())[0]:
+                        deallocated_at[queue] = idx
+
+    lifetimes = {}
+    for queue, start in allocated_at.items():
+        model_name = re.search(model_name_pattern, queue).group()
+        lifetimes[queue] = (model_name, start, deallocated_at.get(queue, num_instructions_per_model.get(model_name, start)))
+    return lifetimes
+
+def lifetimes_overlap(a, b):
+    # Static queues (no lifetime) are live throughout. Models run one at a time, so only
+    # dynamic queues of the same model can be live together.
+    if a is None or b is None:
+        return True
+    return a[0] == b[0] and a[1] <= b[2] and b[1] <= a[2]
+
+def find_buffer_address(placed, lifetime, size, base, limit, best_fit):
+    """
+    Lowest (first-fit) or tightest (best-fit) address in a channel where a buffer of `size` bytes doesn't overlap
+    any placed buffer with a conflicting lifetime. Returns None if it doesn't fit.
+    """
+    busy = sorted((start, end) for (start, end, other) in placed if lifetimes_overlap(lifetime, other))
+    candidates = []
+    addr = base
+    for start, end in busy:
+        if start - addr >= size:
+            candidates.append((start - addr, addr))
+        addr = max(addr, end)
+    if addr + size <= limit:
+        candidates.append((limit - addr, addr))
+    if not candidates:
+        return None
+    return min(candidates)[1] if best_fit else min(addr for _, addr in candidates)
+
+def pack_dram_buffers(buffers, channel_bases, channel_limit, align, policy, allow_channel_switch):
+    """
+    Pack DRAM buffers across channels, treating queue lifetimes as intervals so buffers that are never live at
+    the same time can share addresses.
+
+    Each buffer is a dict with "size", "channel" and "lifetime" (None for static queues); "channel" and "addr" are
+    updated in place. Policies:
+        best_fit: largest buffers first, each into the tightest gap that fits
+        coloring: greedy interval-graph coloring; most-constrained buffers first, each at the lowest free address
+    Among channels the buffer may go to, the one whose footprint grows least is picked, which keeps channels
+    balanced. Returns the footprint per channel.
+    """
+    assert policy in ("best_fit", "coloring"), "Unknown DRAM allocator policy: " + policy
+    if policy == "best_fit":
+        order = sorted(buffers, key=lambda b: (b["lifetime"] is not None, -b["size"]))
+    else:
+        conflict_bytes = [sum(other["size"] for other in buffers if other is not b and lifetimes_overlap(b["lifetime"], other["lifetime"])) for b in buffers]
+        order = [b for _, _, b in sorted(zip(conflict_bytes, range(len(buffers)), buffers), key=lambda x: (-x[0], -x[2]["size"], x[1]))]
+
+    placed = {chan: [] for chan in channel_bases}
+    footprint = copy.copy(channel_bases)
+    for buffer in order:
+        channels = list(channel_bases) if allow_channel_switch else [buffer["channel"]]
+        options = []
+        for chan in channels:
+            addr = find_buffer_address(placed[chan], buffer["lifetime"], buffer["size"], channel_bases[chan], channel_limit, policy == "best_fit")
+            if addr is None:
+                continue
+            end = align(addr + buffer["size"])
+            options.append((max(footprint[chan], end), chan != buffer["channel"], footprint[chan], chan, addr, end))
+        assert options, "DRAM space exceeded when trying to allocate memory for queue " + buffer["queue"]
+        _, _, _, chan, addr, end = min(options)
+        buffer["channel"], buffer["addr"] = chan, addr
+        placed[chan].append((addr, end, buffer["lifetime"]))
+        footprint[chan] = max(footprint[chan], end)
+    return footprint
+
+def allocate_dram_queues_packed(merged_model, dynamic_queues, backend_reserved_dram_memory, max_dram_space, switch_chans_if_capacity_hit, overlap_dynamic_queues, policy):
+    lifetimes = get_dynamic_queue_lifetimes(merged_model) if overlap_dynamic_queues else {}
+    buffers = []
+    for queue in merged_model["queues"]:
+        if merged_model["queues"][queue]["loc"].lower() != "dram":
+            continue
+        queue_size = get_queue_size(merged_model, queue)
+        for alloc in merged_model["queues"][queue]["dram"]:
+            buffers.append({"queue": queue, "alloc": alloc, "size": queue_size, "channel": alloc[0], "lifetime": lifetimes.get(queue, None)})
+
+    footprint = pack_dram_buffers(buffers, backend_reserved_dram_memory, max_dram_space, backend_api.get_next_aligned_address, policy, switch_chans_if_capacity_hit)
+    for buffer in buffers:
+        buffer["alloc"][0] = buffer["channel"]
+        buffer["alloc"][1] = buffer["addr"]
+    return footprint
+
+def allocate_dram_queues_first_fit(merged_model, dynamic_queues, start_offset_to_queue_buf_per_model, backend_reserved_dram_memory, max_dram_space, switch_chans_if_capacity_hit, overlap_dynamic_queues):
     static_queue_dram_space = copy.copy(backend_reserved_dram_memory)
-    MAX_DRAM_SPACE = 2**31
-    
-    if not switch_chans_if_capacity_hit:
-        logger.warning("Memory Optimization Allowing Buffer Channels to be Reallocated is disabled")
-        
+
     if overlap_dynamic_queues:
         # Memory optimization: Allow dynamic queues to overlap in merged netlist
         for model in start_offset_to_queue_buf_per_model:
@@ -249,28 +342,72 @@ def reallocate_queues(merged_model, dynamic_queues, start_offset_to_queue_buf_pe
 
             for chan in static_queue_dram_space:
                 static_queue_dram_space[chan] = max(dram_usage_across_groups[chan], static_queue_dram_space[chan])
-    else:
-        logger.warning("Memory Optimization Allowing Dynamic Queues to Overlap is Disabled")
-               
+
     for queue in merged_model["queues"]:
         if queue in dynamic_queues and overlap_dynamic_queues:
             # Dynamic queues was already allocated. Skip allocation here.
             continue
+        if(merged_model["queues"][queue]["loc"].lower() != "dram"):
+            continue
         queue_size = get_queue_size(merged_model, queue)
-        if(merged_model["queues"][queue]["loc"].lower() == "dram"):
-            for alloc in merged_model["queues"][queue]["dram"]:
-                if static_queue_dram_space[alloc[0]] + queue_size > MAX_DRAM_SPACE:
-                    if switch_chans_if_capacity_hit:
-                        logger.info("DRAM Channel {} capacity hit. Bytes Used: {}. Reallocating queue to a different channel", alloc[0], static_queue_dram_space[alloc[0]])
-                        for i in static_queue_dram_space:
-                            if static_queue_dram_space[i] + queue_size <= MAX_DRAM_SPACE:
-                                alloc[0] = i
-                            
-                alloc[1] = static_queue_dram_space[alloc[0]]
-                static_queue_dram_space[alloc[0]] += queue_size
-                assert static_queue_dram_space[alloc[0]] <= MAX_DRAM_SPACE, "DRAM space exceeded for DRAM channel " + str(alloc[0]) + " when trying to allocate memory for queue " + queue + " Bytes used: " + str(static_queue_dram_space[alloc[0]])
-                static_queue_dram_space[alloc[0]] = backend_api.get_next_aligned_address(static_queue_dram_space[alloc[0]])
-        else:
+        for alloc in merged_model["queues"][queue]["dram"]:
+            if static_queue_dram_space[alloc[0]] + queue_size > max_dram_space:
+                if switch_chans_if_capacity_hit:
+                    logger.info("DRAM Channel {} capacity hit. Bytes Used: {}. Reallocating queue to a different channel", alloc[0], static_queue_dram_space[alloc[0]])
+                    for i in static_queue_dram_space:
+                        if static_queue_dram_space[i] + queue_size <= max_dram_space:
+                            alloc[0] = i
+
+            alloc[1] = static_queue_dram_space[alloc[0]]
+            static_queue_dram_space[alloc[0]] += queue_size
+            assert static_queue_dram_space[alloc[0]] <= max_dram_space, "DRAM space exceeded for DRAM channel " + str(alloc[0]) + " when trying to allocate memory for queue " + queue + " Bytes used: " + str(static_queue_dram_space[alloc[0]])
+            static_queue_dram_space[alloc[0]] = backend_api.get_next_aligned_address(static_queue_dram_space[alloc[0]])
+    return static_queue_dram_space
+
+def reallocate_queues(merged_model, dynamic_queues, start_offset_to_queue_buf_per_model, soc_descriptor, switch_chans_if_capacity_hit, overlap_dynamic_queues, dram_allocator = "first_fit"):
+    dev_cfg = backend_api.DeviceConfig("wormhole_b0",
+                             soc_descriptor,
+                             "",
+                             "",
+                             "",
+                             False,
+                             [])
+    max_reserved_backend_space = dev_cfg.get_dram_backend_reserved_max()
+    backend_reserved_dram_memory = {0 : max_reserved_backend_space, 1 : max_reserved_backend_space, 2 : max_reserved_backend_space, 3 : max_reserved_backend_space, 
+                                   4 : max_reserved_backend_space, 5 : max_reserved_backend_space}
+    memory_consumed_per_host_channel = {}
+    for host_chan in range(dev_cfg.get_host_memory_num_channels()):
+        memory_consumed_per_host_channel[host_chan] = dev_cfg.get_host_memory_channel_start_address()
+    
+    MAX_DRAM_SPACE = 2**31
+    
+    if not switch_chans_if_capacity_hit:
+        logger.warning("Memory Optimization Allowing Buffer Channels to be Reallocated is disabled")
+        
+    if not overlap_dynamic_queues:
+        logger.warning("Memory Optimization Allowing Dynamic Queues to Overlap is Disabled")
+
+    if dram_allocator == "first_fit":
+        static_queue_dram_space = allocate_dram_queues_first_fit(merged_model, dynamic_queues, start_offset_to_queue_buf_per_model, backend_reserved_dram_memory, MAX_DRAM_SPACE, switch_chans_if_capacity_hit, overlap_dynamic_queues)
+    else:
+        # Run the first-fit allocator on a copy, to report what packing gained on the same inputs
+        try:
+            first_fit_dram_space = allocate_dram_queues_first_fit(copy.deepcopy(merged_model), dynamic_queues, start_offset_to_queue_buf_per_model, backend_reserved_dram_memory, MAX_DRAM_SPACE, switch_chans_if_capacity_hit, overlap_dynamic_queues)
+        except AssertionError as e:
+            logger.info("First-fit DRAM allocation would have failed: {}", e)
+            first_fit_dram_space = None
+        static_queue_dram_space = allocate_dram_queues_packed(merged_model, dynamic_queues, backend_reserved_dram_memory, MAX_DRAM_SPACE, switch_chans_if_capacity_hit, overlap_dynamic_queues, dram_allocator)
+
+        logger.info("DRAM footprint per channel (MB), first_fit vs {}:", dram_allocator)
+        for chan in static_queue_dram_space:
+            first_fit_usage = round(first_fit_dram_space[chan] / (2**20), 2) if first_fit_dram_space is not None else "failed"
+            logger.info("{} : {} -> {}", chan, first_fit_usage, round(static_queue_dram_space[chan] / (2**20), 2))
+        if first_fit_dram_space is not None:
+            logger.info("Peak channel usage (MB): {} -> {}", round(max(first_fit_dram_space.values()) / (2**20), 2), round(max(static_queue_dram_space.values()) / (2**20), 2))
+
+    for queue in merged_model["queues"]:
+        if(merged_model["queues"][queue]["loc"].lower() != "dram"):
+            queue_size = get_queue_size(merged_model, queue)
             for (alloc_idx, alloc) in enumerate(merged_model["queues"][queue]["host"]):
                 if(type(alloc) == list):
                     # Support for new host queue layout ... multi-channel
@@ -301,12 +438,47 @@ def reallocate_queues(merged_model, dynamic_queues, start_offset_to_queue_buf_pe
 
 def uniquify_tensor_bin_names(unzipped_tti_paths, merged_tti_path):
     logger.info("Uniquifying parameter names for merged model...")
+    # Identical tensors (i.e. weights shared between models) are stored once: in the blob store if one is set,
+    # otherwise as hard links to the first copy, which tar then archives as links
+    blob_store = get_tti_blob_store()
+    store_tensors_as_blobs = blob_store is not None
+    merged_blobs = {}
+    first_copy_by_checksum = {}
     for (i, tti_path) in enumerate(unzipped_tti_paths):
+        manifest_path = os.path.join(tti_path, "unzipped_tti", TTIBlobStore.MANIFEST_FILE_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as file:
+                manifest = json.load(file)
+            if blob_store is None:
+                blob_store = TTIBlobStore(manifest["store"])
+            assert blob_store.root == os.path.realpath(manifest["store"]), "Merging TTIs from different blob stores is not supported"
+            for name, digest in manifest["blobs"].items():
+                merged_blobs["tensors/" + "model_" + str(i) + "_" + os.path.basename(name)] = digest
+
         tensor_path = os.path.join(tti_path, "unzipped_tti", "tensors")
-        for tensor_bin in os.listdir(tensor_path):
-            if os.path.isfile(os.path.join(tensor_path, tensor_bin)):
-                shutil.copy(os.path.join(tensor_path, tensor_bin), 
-                            os.path.join(merged_tti_path, "unzipped_tti", "tensors", "model_" + str(i) + "_" + tensor_bin))
+        for tensor_bin in sorted(os.listdir(tensor_path)):
+            src = os.path.join(tensor_path, tensor_bin)
+            if not os.path.isfile(src):
+                continue
+            merged_tensor_bin = "model_" + str(i) + "_" + tensor_bin
+            if store_tensors_as_blobs:
+                merged_blobs["tensors/" + merged_tensor_bin] = blob_store.put_file(src)
+                continue
+
+            dst = os.path.join(merged_tti_path, "unzipped_tti", "tensors", merged_tensor_bin)
+            checksum = compute_file_checksum(src)
+            if checksum in first_copy_by_checksum:
+                try:
+                    os.link(first_copy_by_checksum[checksum], dst)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy(src, dst)
+            first_copy_by_checksum[checksum] = dst
+
+    if merged_blobs:
+        with open(os.path.join(merged_tti_path, "unzipped_tti", TTIBlobStore.MANIFEST_FILE_NAME), "wb") as file:
+            file.write(make_manifest(blob_store, merged_blobs))
 
 
 def merge_device_metadata(unzipped_tti_paths, merged_tti_path):
@@ -414,14 +586,14 @@ def unzip_ttis_and_generate_output_dir(tti_file_paths, output_tti_dir):
         sp.run(['tar', '-xf', tti, '-C', unzipped_tti_directory])
     return unzipped_tti_directories
 
-def merge_netlists(netlist_paths, merged_tti_path, unzipped_tti_paths, overlay_blob_size_per_model, switch_chans_if_capacity_hit, overlap_dynamic_queues):
+def merge_netlists(netlist_paths, merged_tti_path, unzipped_tti_paths, overlay_blob_size_per_model, switch_chans_if_capacity_hit, overlap_dynamic_queues, dram_allocator = "first_fit"):
     logger.info("Merging Netlists...")
     soc_descriptor = os.path.join(unzipped_tti_paths[0], "unzipped_tti/backend_build_binaries/device_desc_runtime/0.yaml")
     if not os.path.exists(soc_descriptor):
         soc_descriptor = os.path.join(unzipped_tti_paths[0], "unzipped_tti/backend_build_binaries/device_desc.yaml")
     uniquifed_netlist =  merge_unique_netlists(uniquify_global_structures(netlist_paths), overlay_blob_size_per_model)
     dynamic_queues, start_offset_to_queue_buf_per_model = get_dynamic_queue_info(uniquifed_netlist)
-    merged_model = reallocate_queues(uniquifed_netlist, dynamic_queues, start_offset_to_queue_buf_per_model, soc_descriptor, switch_chans_if_capacity_hit, overlap_dynamic_queues)
+    merged_model = reallocate_queues(uniquifed_netlist, dynamic_queues, start_offset_to_queue_buf_per_model, soc_descriptor, switch_chans_if_capacity_hit, overlap_dynamic_queues, dram_allocator)
     yaml_output = yaml.dump(merged_model, default_flow_style=False, sort_keys=False)
     netlist_path = os.path.join(merged_tti_path, "unzipped_tti/merged_netlist.yaml")
     with open(netlist_path, "w+") as file:
@@ -451,7 +623,7 @@ def cleanup():
     for dir in temp_directories:
         shutil.rmtree(dir)
             
-def merge_models(model_binaries, arch, merged_model_location = "", switch_chans_if_capacity_hit = True, overlap_dynamic_queues = True):
+def merge_models(model_binaries, arch, merged_model_location = "", switch_chans_if_capacity_hit = True, overlap_dynamic_queues = True, dram_allocator = "first_fit"):
     # Main API that gets exported to other files
     try:
         assert arch == "grayskull" or arch == "wormhole_b0", "Expected arch to be Grayskull or Wormhole_B0"
@@ -465,7 +637,7 @@ def merge_models(model_binaries, arch, merged_model_location = "", switch_chans_
         overlay_blob_size_per_model = verify_and_copy_config_json(unzipped_tti_paths, merged_binary_dir)
         netlist_names = merge_device_metadata(unzipped_tti_paths, merged_binary_dir)
         uniquify_tensor_bin_names(unzipped_tti_paths, merged_binary_dir)
-        merged_netlist_path = merge_netlists(netlist_names, merged_binary_dir, unzipped_tti_paths, overlay_blob_size_per_model, switch_chans_if_capacity_hit, overlap_dynamic_queues)
+        merged_netlist_path = merge_netlists(netlist_names, merged_binary_dir, unzipped_tti_paths, overlay_blob_size_per_model, switch_chans_if_capacity_hit, overlap_dynamic_queues, dram_allocator)
         compile_backend_binaries(merged_binary_dir, merged_netlist_path)
         create_merged_tti(output_loc, merged_binary_dir)
         logger.info("Binaries for the merged model are stored in: " + output_loc)
@@ -483,5 +655,6 @@ if __name__ == "__main__":
     parser.add_argument("--merged_model_location", type = str, help = "Filesystem location where the merged model binaries are stored.")
     parser.add_argument("--skip_channel_reallocation", type = bool, help = "Skip memory usage optimization that reallocates buffers on different DRAM channels, once channel capacity is hit.", default = False)
     parser.add_argument("--dynamic_queue_overlap_off", type = bool, help = "Turn off memory usage optimization that overlaps dynamic queues", default = False)
+    parser.add_argument("--dram_allocator", type = str, help = "DRAM queue allocator. first_fit keeps the original placement order; best_fit and coloring pack queue lifetimes across channels and report the gain over first_fit.", choices = ["first_fit", "best_fit", "coloring"], default = "first_fit")
     args = parser.parse_args()
-    merge_models(args.model_binaries, args.arch.lower(), args.merged_model_location, not args.skip_channel_reallocation, not args.dynamic_queue_overlap_off)
+    merge_models(args.model_binaries, args.arch.lower(), args.merged_model_location, not args.skip_channel_reallocation, not args.dynamic_queue_overlap_off, args.dram_allocator)
@@ -4,13 +4,18 @@
 import copy
 import hashlib
 import os
+import pickle
 import pybuda
+import shutil
 import sys
+import tempfile
+import threading
 import torch
 import types
 import io
 import json
 from contextlib import redirect_stdout
+from typing import Optional
 from pybuda._C.graph import get_constant_input_value, Graph
 from pybuda._C.backend_api import translate_addresses
 from pybuda._C.torch_device import get_default_device, push_tensor, is_created_on_device, original_shape, PyBudaTensorDesc, CompileRequest, Program 
@@ -20,7 +25,6 @@ from pybuda.tensor import const_eval_tensor, do_runtime_transform
 from pybuda.compiled_graph_state import CompiledGraphState
 _tt0 = None
 _compile_cache = None
-_compile_cache_dir = os.environ.get("PYBUDA_COMPILE_CACHE_DIR", "tt_build")
 _graph = None
 _subgraph_index = 0
 _module_index = 0
@@ -73,7 +77,7 @@ def torch_device(index=0):
     return get_available_devices()[index].torch_device()
 
 
-def _build_backend_compile_request(device, compiler_cfg, compiled_graph_state):
+def _build_backend_compile_request(device, compiler_cfg, compiled_graph_state, device_mode=pybuda._C.backend_api.DeviceMode.CompileAndRun):
     soc_desc_yaml = (
         compiler_cfg.backend_device_descriptor_path
         if compiler_cfg.backend_cluster_descriptor_path == ""
@@ -90,7 +94,7 @@ def _build_backend_compile_request(device, compiler_cfg, compiled_graph_state):
     bcfg = pybuda._C.backend_api.BackendConfig(
         device.type,
         device.arch,
-        pybuda._C.backend_api.DeviceMode.CompileAndRun,
+        device_mode,
         compiler_cfg.backend_opt_level,
         compiler_cfg.backend_output_dir,
         soc_desc_yaml,
@@ -200,52 +204,224 @@ def _compile(module, aten_module, module_name, sample_inputs, aten_sample_inputs
     return workload, compiled_graph_state
 
 
-def _create_compile_key(module, module_name, sample_inputs, device, compiler_cfg):
-    m = hashlib.sha256()
-    m.update(id(module).to_bytes(8, "little"))
-    for i in sample_inputs:
-        for s in i.shape:
-            m.update(s.to_bytes(8, "little"))
-    # TODO: It'd probably be better to encode the contents of said files
-    m.update(device.soc_desc_yaml.encode("utf-8"))
-    m.update(device.cluster_yaml.encode("utf-8"))
-    m.update(compiler_cfg.to_json().encode("utf-8"))
-    return f"{module_name}_{m.hexdigest()}"
+class CompileCache:
+    """
+    Persistent cache of torch.compile results.
+
+    Each entry is a directory holding the backend build output of one subgraph together with its serialized
+    CompiledGraphState. Entries are keyed on the aten graph, parameter and input shapes and dtypes, the device
+    descriptors and the compiler config, so they are reused across processes. Hits skip the frontend compile and
+    start the backend from the prebuilt binaries. Total size is capped, and least recently used entries are evicted
+    first, using the modification time of the state file as the access stamp.
+    """
+    VERSION = 1
+    STATE_FILE_NAME = "compiled_graph_state.pt"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _file_or_path(path: str) -> str:
+        # Descriptor files are hashed by content, since their paths are usually temporary
+        if path and os.path.isfile(path):
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        return path
+
+    def key(self, module, aten_module, module_name, subgraph_index, sample_inputs, device, compiler_cfg) -> str:
+        compiler_cfg_dict = json.loads(compiler_cfg.to_json())
+        # Output directory is per-test/per-run, and gets pointed into the cache anyway
+        compiler_cfg_dict.pop("backend_output_dir", None)
+        env_options = {
+            name: value for name, value in pybuda.utils.get_buda_compile_and_runtime_configs().items()
+            if not name.startswith(("PYBUDA_COMPILE_CACHE", "PYBUDA_DISABLE_COMPILE_CACHE"))
+        }
+
+        h = hashlib.sha256()
+        h.update(json.dumps([
+            self.VERSION,
+            module_name,
+            subgraph_index,
+            aten_module.code,
+            [(name, list(t.shape), str(t.dtype)) for name, t in _named_tensors(module)],
+            [(list(t.shape), str(t.dtype)) for t in sample_inputs],
+            str(device.arch),
+            str(device.type),
+            self._file_or_path(device.soc_desc_yaml),
+            self._file_or_path(device.cluster_yaml),
+            compiler_cfg_dict,
+            env_options,
+        ], sort_keys=True, default=str).encode("utf-8"))
+        return f"{module_name}_{h.hexdigest()}"
+
+    def entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str, weights_digest: str) -> Optional[CompiledGraphState]:
+        entry_dir = self.entry_dir(key)
+        state_path = os.path.join(entry_dir, self.STATE_FILE_NAME)
+        try:
+            entry = torch.load(state_path, mmap=True)
+            if entry["version"] != self.VERSION:
+                entry = None
+            elif entry["weights_digest"] != weights_digest:
+                # Post-consteval parameters are baked into the entry; changed weights need a recompile
+                logger.debug("Compile cache entry {} was built with different weights", key)
+                entry = None
+        except (FileNotFoundError, RuntimeError, EOFError, KeyError, pickle.UnpicklingError) as e:
+            if not isinstance(e, FileNotFoundError):
+                # e.g. truncated by a crash while it was written; evicted so it gets rebuilt
+                logger.warning("Evicting corrupt compile cache entry {}: {}", entry_dir, e)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            entry = None
+
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        os.utime(state_path)
+        compiled_graph_state = CompiledGraphState.from_dict(entry["compiled_graph_state"])
+        compiled_graph_state.netlist_filename = os.path.join(entry_dir, entry["netlist_filename"])
+        with self.lock:
+            self.hits += 1
+        return compiled_graph_state
+
+    def put(self, key: str, weights_digest: str, compiled_graph_state: CompiledGraphState):
+        entry_dir = self.entry_dir(key)
+        entry = {
+            "version": self.VERSION,
+            "weights_digest": weights_digest,
+            "netlist_filename": os.path.relpath(compiled_graph_state.netlist_filename, entry_dir),
+            "compiled_graph_state": compiled_graph_state.to_dict(),
+        }
+
+        # Write to a temporary file and rename, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                torch.save(entry, f)
+            os.replace(tmp_path, os.path.join(entry_dir, self.STATE_FILE_NAME))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        size = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    size += os.lstat(os.path.join(dirpath, filename)).st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    def evict(self, keep: Optional[str] = None):
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                state_path = os.path.join(entry.path, self.STATE_FILE_NAME)
+                if entry.is_dir() and os.path.exists(state_path):
+                    entries.append((os.stat(state_path).st_mtime, self._dir_size(entry.path), entry.name))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                shutil.rmtree(self.entry_dir(name), ignore_errors=True)
+                total_bytes -= size
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_persistent_compile_cache: Optional[CompileCache] = None
+
+def get_compile_cache() -> CompileCache:
+    """
+    Persistent torch.compile cache in PYBUDA_COMPILE_CACHE_DIR (default tt_build). Size is capped to
+    PYBUDA_COMPILE_CACHE_SIZE_MB (default 16384).
+    """
+    global _persistent_compile_cache
+    cache_dir = os.environ.get("PYBUDA_COMPILE_CACHE_DIR", "tt_build")
+    max_bytes = int(os.environ.get("PYBUDA_COMPILE_CACHE_SIZE_MB", "16384")) * 1024 * 1024
+    if _persistent_compile_cache is None or _persistent_compile_cache.cache_dir != cache_dir:
+        _persistent_compile_cache = CompileCache(cache_dir, max_bytes)
+    _persistent_compile_cache.max_bytes = max_bytes
+    return _persistent_compile_cache
+
 
+def _named_tensors(module):
+    return list(module.named_parameters(remove_duplicate=False)) + list(module.named_buffers(remove_duplicate=False))
 
-def _populate_compile_cache():
-    compile_cache = {}
-    return compile_cache
 
+def _compute_weights_digest(module) -> str:
+    h = hashlib.sha256()
+    for name, t in _named_tensors(module):
+        t = t.detach().cpu().contiguous()
+        h.update(f"{name}:{t.dtype}:{list(t.shape)}".encode("utf-8"))
+        h.update(t.reshape(-1).view(torch.uint8).numpy().data)
+    return h.hexdigest()
+
+
+def _is_user_output_dir(output_dir: str, cache_dir: str) -> bool:
+    # Directories resolved by default, or pointed into the compile cache by an earlier compile, aren't the user's
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    return parent not in (os.path.abspath(pybuda.utils.get_output_build_dir()), os.path.abspath(cache_dir))
 
 def _compile_cached(module, aten_module, module_name, sample_inputs, aten_sample_inputs, device, compiler_cfg, cache):
     global _compile_cache
-    global _tt0
+    global _subgraph_index
 
-    key = None
+    if cache and _is_user_output_dir(compiler_cfg.backend_output_dir, get_compile_cache().cache_dir):
+        logger.warning("PyBuda compile cache disabled because of user compiler_cfg.backend_output_dir path override")
+        return _compile(module, aten_module, module_name, sample_inputs, aten_sample_inputs, device, compiler_cfg)
 
-    default_output_dir = compiler_cfg.backend_output_dir == "tt_build/test_out"
-    if cache and default_output_dir:
-        if _compile_cache is None:
-            _compile_cache = _populate_compile_cache()
-        key = _create_compile_key(
-            module, module_name, sample_inputs, device, compiler_cfg
-        )
-        logger.debug(f"Created compile key {key}")
-        compiler_cfg.backend_output_dir = f"{_compile_cache_dir}/{key}"
-        if key in _compile_cache:
-            return _compile_cache[key]
-    elif cache and not default_output_dir:
-        logger.warning(
-            "PyBuda compile cache disabled because of user compiler_cfg.backend_output_dir path override"
+    if not cache:
+        compiler_cfg.backend_output_dir = pybuda.utils.resolve_output_build_directory()
+        return _compile(module, aten_module, module_name, sample_inputs, aten_sample_inputs, device, compiler_cfg)
+
+    if _compile_cache is None:
+        _compile_cache = {}
+
+    persistent_cache = get_compile_cache()
+    key = persistent_cache.key(module, aten_module, module_name, _subgraph_index, sample_inputs, device, compiler_cfg)
+    weights_digest = _compute_weights_digest(module)
+    logger.debug(f"Created compile key {key}")
+    compiler_cfg.backend_output_dir = persistent_cache.entry_dir(key)
+
+    if key in _compile_cache and _compile_cache[key][0] == weights_digest:
+        _subgraph_index += 1
+        return _compile_cache[key][1:]
+
+    compiled_graph_state = persistent_cache.get(key, weights_digest)
+    if compiled_graph_state is not None:
+        logger.info(f"Loading {module_name} from compile cache {compiler_cfg.backend_output_dir}")
+        # The workload holds live backend state and can't be serialized, so the backend is started again,
+        # this time from the prebuilt binaries
+        workload = device.compile(
+            _build_backend_compile_request(device, compiler_cfg, compiled_graph_state, pybuda._C.backend_api.DeviceMode.RunOnly)
         )
+        _subgraph_index += 1
     else:
-        compiler_cfg.backend_output_dir = pybuda.utils.resolve_output_build_directory()
+        shutil.rmtree(compiler_cfg.backend_output_dir, ignore_errors=True)
+        workload, compiled_graph_state = _compile(module, aten_module, module_name, sample_inputs, aten_sample_inputs, device, compiler_cfg)
+        persistent_cache.put(key, weights_digest, compiled_graph_state)
 
-    workload, compiled_graph_state = _compile(module, aten_module, module_name, sample_inputs, aten_sample_inputs, device, compiler_cfg)
+    persistent_cache.evict(keep=key)
+    logger.debug("Compile cache stats: {}", persistent_cache.stats())
 
-    if key is not None:
-        _compile_cache[key] = workload
+    _compile_cache[key] = (weights_digest, workload, compiled_graph_state)
     return workload, compiled_graph_state
 
 class compiledModel(torch.nn.Module):
@@ -349,7 +525,7 @@ def _torch_compile(
     device=None,
     compiler_cfg=None,
     module_name=None,
-    cache=False,  # Disabled for now
+    cache=None,
 ):
     """
     Ideally we can remove having to pass in tt0 (the ttdevice.py) object here,
@@ -376,7 +552,9 @@ def _torch_compile(
             module_name = f"{module.__class__.__name__}_{_module_index}"
             _module_index += 1
 
-    cache &= not bool(os.environ.get("PYBUDA_DISABLE_COMPILE_CACHE", "0"))
+    if cache is None:
+        cache = "PYBUDA_COMPILE_CACHE_DIR" in os.environ
+    cache &= os.environ.get("PYBUDA_DISABLE_COMPILE_CACHE", "0") == "0"
 
     rand_inputs = [torch.rand(sample_input.shape).to(sample_input.dtype) for sample_input in sample_inputs]
     rand_atan_inputs = [torch.rand(aten_sample_input.shape).to(aten_sample_input.dtype).to(aten_sample_input.device) for aten_sample_input in aten_sample_inputs]
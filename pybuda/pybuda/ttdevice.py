@@ -30,6 +30,7 @@ from pybuda.tvm_utils import flatten_inputs
 from .pybudaglobal import TILE_DIM, create_queue
 from .verify import VerifyConfig
 from .config import CompilerConfig, _get_global_compiler_config
+from .op.eval.pybuda import is_batch_safe
 from .backend import BackendAPI
 from pybuda._C.backend_api import BackendDevice, BackendType, DeviceMode, StrideDescriptor, DramIODesc, DeviceConfig, get_device_descs_for_available_devices, get_custom_device_desc, get_device_cluster_yaml, load_cached_sys_param
 from .device_connector import (
@@ -106,6 +107,7 @@ class TTDevice(Device):
 
         self._checkpoint_interval = 0
         self._unused_parameters = set() # populated during `self.generate_graph`; records unused params
+        self._batch_unsafe_ops: Optional[Set[str]] = None # populated during `self.generate_graph`; None if unknown
 
         #self._perf_dump_mode: buda.PerfDumpMode = buda.PerfDumpMode.Disable
         #self._perf_desc: Optional[buda.PerfDesc] = None
@@ -414,6 +416,8 @@ class TTDevice(Device):
         graph.set_enable_training(compiler_cfg.enable_training)
 
         reset_unique_node_id()
+        if not trace_only:
+            self._batch_unsafe_ops = None
 
         # Trace through the modules
         all_subgraph_outputs = []
@@ -442,7 +446,8 @@ class TTDevice(Device):
                     clear_state_changed()
                 return graph, outputs, intermediate, inputs, target_tensors
 
-            start_tracing()
+            # Intermediate values are read for every op below, so there's nothing to gain from deferring them
+            start_tracing(shapes_only=compiler_cfg.trace_shapes_only and not return_intermediate)
             if module == self.loss_module:
                 if len(target_tensors) == 0:
                     assert trace_only, "Target tensors must be provided for each output if generate_graph is not in trace only mode"
@@ -475,6 +480,7 @@ class TTDevice(Device):
         if trace_only:
             return graph, all_subgraph_outputs, {}, inputs, target_tensors
 
+        self._batch_unsafe_ops = set()
         visited_tensors = {}
         pending_tensors = deque()
         intermediate = {}
@@ -671,6 +677,9 @@ class TTDevice(Device):
             if tensor.src_layer is not None:
                 tags["layer"] = tensor.src_layer
             op = create_op_node(graph, tensor.src_op.name, tensor.src_op.cpp_op_type, tensor.shape.get_pytorch_shape(), tensor.data_format, subgraph_idx, tags)
+            operand_shapes = [o.shape.get_pytorch_shape() for o in tensor.src_op.operands]
+            if not is_batch_safe(tensor.src_op.op_type, tensor.src_op.attrs, tensor.src_op.named_attrs, operand_shapes):
+                self._batch_unsafe_ops.add(tensor.src_op.name)
 
             visited_tensors[tensor] = op
             if return_intermediate and tensor.has_value():
@@ -963,6 +972,53 @@ class TTDevice(Device):
 
         microbatch_size = self._compile_output.initial_graph.get_microbatch()
         assert inputs[0].shape[0] == microbatch_size
+
+        outputs = None
+        if microbatch_size > 1 and self._can_cpueval_batched():
+            logger.debug("Evaluating {} golden over the whole microbatch of {}", self, microbatch_size)
+            try:
+                outputs, *_ = graph_eval(self._compile_output.initial_graph, inputs, parameters, self, 0.1, 1.00, targets=targets, allow_modified_shapes=True)
+                outputs = tuple(outputs)
+            except Exception as e:
+                # e.g. concatenating an activation with a parameter that only has a single-sample leading dim
+                logger.warning("Batched golden evaluation on {} failed ({}), falling back to per-sample evaluation", self, e)
+                outputs = None
+            if outputs is not None and any(out.shape[0] != microbatch_size for out in outputs):
+                logger.warning("Batched golden evaluation on {} returned unexpected output shapes, falling back to per-sample evaluation", self)
+                outputs = None
+
+        if outputs is None:
+            if microbatch_size > 1:
+                logger.debug("Evaluating {} golden per sample for microbatch of {}", self, microbatch_size)
+            outputs = self._cpueval_forward_per_sample(inputs, parameters, targets, microbatch_size)
+
+        if save_for_backward:
+            self._saved_fw_outputs = outputs
+
+        return outputs
+
+    def _can_cpueval_batched(self) -> bool:
+        """
+        Return true if every op in the initial graph can be evaluated over a leading microbatch dimension
+        """
+        if "PYBUDA_CPUEVAL_PER_SAMPLE" in os.environ:
+            logger.debug("Batched golden evaluation disabled by PYBUDA_CPUEVAL_PER_SAMPLE")
+            return False
+
+        if self._batch_unsafe_ops is None:
+            logger.debug("Ops in the graph for {} weren't traced, batched golden evaluation not possible", self)
+            return False
+
+        if len(self._batch_unsafe_ops) > 0:
+            logger.debug("Batched golden evaluation not possible for {} due to batch-unsafe ops: {}", self, sorted(self._batch_unsafe_ops))
+            return False
+
+        return True
+
+    def _cpueval_forward_per_sample(self, inputs: List[torch.Tensor], parameters: Dict[str, torch.Tensor], targets: List[torch.Tensor], microbatch_size: int) -> Tuple[torch.Tensor, ...]:
+        """
+        Evaluate forward pass one microbatch sample at a time, and concatenate the outputs
+        """
         output_list = []
         for i in range(microbatch_size):
             if microbatch_size > 1:
@@ -981,12 +1037,7 @@ class TTDevice(Device):
         outputs = []
         for out in zip(*output_list):
             outputs.append(torch.cat(out, 0))
-        outputs = tuple(outputs)
-
-        if save_for_backward:
-            self._saved_fw_outputs = outputs
-
-        return outputs
+        return tuple(outputs)
 
     def backward(self, loop_count: int, zero_grad: bool):
         """
@@ -1372,6 +1423,33 @@ class TTDevice(Device):
         logger.debug("Creating forward output queue connector on {}", self)
         self.forward_dc = OutputQueueDirectPoppperDeviceConnector(q, self.shutdown_event)
 
+    def register_output_buffers(self, index: int, buffers: List[torch.Tensor]):
+        """
+        Register a ring of preallocated destination tensors for forward output at given index. Outputs are read
+        straight into the next free tensor instead of freshly allocated ones. The caller must give each tensor
+        back with `release_output_buffer` once done with it; reading blocks while all of them are in use.
+
+        The device must run in the caller's process (i.e. sequential mode), and the pipeline must be initialized.
+
+        Parameters
+        ----------
+        index: int
+            Output index
+
+        buffers: List[torch.Tensor]
+            Contiguous tensors of the output's shape. A different dtype than the output's is allowed, conversion
+            is then done while copying.
+        """
+        assert isinstance(self.forward_dc, DirectPopperDeviceConnector), "Output buffers can only be registered on a device that outputs to host, after pipeline is initialized"
+        self.forward_dc.register_output_buffers(index, buffers)
+
+    def release_output_buffer(self, tensor: Union[Tensor, torch.Tensor]):
+        """
+        Return an output tensor previously filled from a registered output buffer ring, so it can be reused
+        """
+        assert isinstance(self.forward_dc, DirectPopperDeviceConnector), "No output buffers registered"
+        self.forward_dc.release_output_buffer(tensor)
+
     # Create device connector for the first device, pushing backward
     def _create_backward_output_queue_device_connector(self, q: queue.Queue):
         logger.debug("Creating backward output queue connector on {}", self)
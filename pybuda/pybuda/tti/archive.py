@@ -4,14 +4,20 @@
 import os
 import shutil
 import importlib
-import subprocess
 import inspect
 import packaging
 import struct
 import sys
+import tarfile
 import tempfile
+import threading
 import time
 import functools
+import math
+import fnmatch
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 import pathlib
 
@@ -19,17 +25,20 @@ from collections.abc import Iterable
 from pybuda.config import _set_global_compiler_config, TTIDumpFormat
 from pybuda.module import PyBudaModule
 from pybuda.tensor import pytorch_tensor_to_tensor_desc, tensor_desc_to_pytorch_tensor
-from pybuda.utils import generate_hash, get_current_pytest, write_buda_envs_configs
+from pybuda.utils import generate_hash, get_current_pytest, get_buda_compile_and_runtime_configs
+from pybuda.tti.blob_store import TTIBlobStore, get_tti_blob_store, make_manifest
 from pybuda.tti.utils import (
     compute_file_checksum,
+    compute_file_fingerprint,
     write_checksum_to_file,
     read_checksum_from_file,
 )
 
+import numpy as np
 import torch
 import json
 import pickle
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from pybuda.optimizers import Optimizer
 from pybuda.backend import BackendAPI
 from pybuda._C.backend_api import (
@@ -64,6 +73,199 @@ def load_tensor_from_disk(filepath, value):
     return desc
 
 
+def get_tti_save_num_threads() -> int:
+    return int(os.environ.get("PYBUDA_TTI_SAVE_THREADS", min(8, os.cpu_count() or 1)))
+
+
+class TTIArchiveWriter:
+    """
+    Streams files straight into a TTI tar archive, without staging the whole image in a directory first.
+
+    Serialization jobs passed to `submit`/`submit_file` run on a worker pool, and each result is appended to the
+    archive as soon as it's ready. Only the tar writes themselves are serialized.
+
+    With a `blob_store`, tensors are put in the store instead, and the archive gets a manifest referencing them.
+    """
+    TENSORS_DIR = "tensors/"
+
+    def __init__(self, archive_path: str, root: str, num_threads: int, blob_store: Optional[TTIBlobStore] = None):
+        self.root = root
+        self.blob_store = blob_store
+        self.blobs: Dict[str, str] = {}
+        self.tar = tarfile.open(archive_path, "w", format=tarfile.PAX_FORMAT)
+        self.lock = threading.Lock()
+        self.scratch = tempfile.TemporaryDirectory()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, num_threads))
+        self.futures = []
+        self.add_directory("")
+
+    def _arcname(self, name: str) -> str:
+        return os.path.join(self.root, name) if name else self.root
+
+    def add_directory(self, name: str):
+        info = tarfile.TarInfo(self._arcname(name))
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = int(time.time())
+        with self.lock:
+            self.tar.addfile(info)
+
+    def add_bytes(self, name: str, data: bytes):
+        info = tarfile.TarInfo(self._arcname(name))
+        info.size = len(data)
+        info.mode = 0o644
+        info.mtime = int(time.time())
+        with self.lock:
+            self.tar.addfile(info, io.BytesIO(data))
+
+    def add_file(self, name: str, path: str):
+        with self.lock:
+            self.tar.add(path, arcname=self._arcname(name), recursive=False)
+
+    def add_tree(self, name: str, src_dir: str, exclude: Optional[List[str]] = None):
+        """ Add a directory tree, skipping files matching any of the `exclude` glob patterns """
+        for dirpath, dirnames, filenames in os.walk(src_dir):
+            dirnames.sort()
+            relative_dir = os.path.relpath(dirpath, src_dir)
+            self.add_directory(os.path.normpath(os.path.join(name, relative_dir)))
+            for filename in sorted(filenames):
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in exclude or []):
+                    continue
+                self.add_file(os.path.normpath(os.path.join(name, relative_dir, filename)), os.path.join(dirpath, filename))
+
+    def _use_blob_store(self, name: str) -> bool:
+        return self.blob_store is not None and name.startswith(TTIArchiveWriter.TENSORS_DIR)
+
+    def _add_blob(self, name: str, digest: str):
+        with self.lock:
+            self.blobs[name] = digest
+
+    def submit(self, name: str, serialize: Callable[[], bytes]):
+        """ Run `serialize` on the worker pool, and add the returned bytes to the archive """
+        def job():
+            data = serialize()
+            if self._use_blob_store(name):
+                self._add_blob(name, self.blob_store.put_bytes(data))
+            else:
+                self.add_bytes(name, data)
+        self.futures.append(self.executor.submit(job))
+
+    def submit_file(self, name: str, write: Callable[[str], None]):
+        """ Run `write` on the worker pool for writers that need a file path, and move the written file into the archive """
+        def job():
+            fd, path = tempfile.mkstemp(dir=self.scratch.name)
+            os.close(fd)
+            os.chmod(path, 0o644)
+            try:
+                write(path)
+                if self._use_blob_store(name):
+                    self._add_blob(name, self.blob_store.put_file(path, move=True))
+                else:
+                    self.add_file(name, path)
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+        self.futures.append(self.executor.submit(job))
+
+    def wait(self):
+        """ Wait for all submitted jobs, re-raising the first failure """
+        for future in self.futures:
+            future.result()
+        self.futures = []
+
+    def close(self):
+        try:
+            self.wait()
+            if self.blobs:
+                self.add_bytes(TTIBlobStore.MANIFEST_FILE_NAME, make_manifest(self.blob_store, self.blobs))
+        finally:
+            self.abort()
+
+    def abort(self):
+        """ Drop pending jobs and release resources, leaving the archive incomplete """
+        for future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        self.tar.close()
+        self.scratch.cleanup()
+
+
+class TTIArchiveIndex:
+    """
+    Locations of tensor blobs inside an (uncompressed) TTI archive, or in the TTI blob store, so they can be
+    memory-mapped in place rather than extracted. Each backing file is mapped copy-on-write once, on first use, and
+    tensors created from it keep the mapping alive.
+    """
+    INDEX_FILE_NAME = "tensor_index.json"
+
+    def __init__(self, archive_path: str, members: Dict[str, Tuple[int, int, Optional[str]]]):
+        self.archive_path = archive_path
+        self.members = members
+        self.mappings: Dict[str, mmap.mmap] = {}
+        self.lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def view(self, name: str) -> memoryview:
+        offset, size, blob_path = self.members[name]
+        path = blob_path or self.archive_path
+        with self.lock:
+            if path not in self.mappings:
+                with open(path, "rb") as f:
+                    self.mappings[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        return memoryview(self.mappings[path])[offset : offset + size]
+
+    def extract(self, name: str, directory: str) -> str:
+        """ Extract a single blob to `directory`, for readers that need a file path """
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp.{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                f.write(self.view(name))
+            os.replace(tmp_path, path)
+        return path
+
+    def add_blobs(self, manifest: Dict):
+        """ Add tensors stored in the blob store, as listed in the image's blob manifest """
+        store = get_tti_blob_store() or TTIBlobStore(manifest["store"])
+        for name, digest in manifest["blobs"].items():
+            blob_path = store.path(digest)
+            if not os.path.exists(blob_path):
+                raise RuntimeError(f"TTI: blob {digest} for {name} is missing from blob store {store.root}")
+            self.members[name] = (0, os.path.getsize(blob_path), blob_path)
+
+    def save(self, directory: str):
+        with open(os.path.join(directory, TTIArchiveIndex.INDEX_FILE_NAME), "w") as f:
+            json.dump(self.members, f)
+
+    @staticmethod
+    def load(archive_path: str, directory: str) -> "TTIArchiveIndex":
+        with open(os.path.join(directory, TTIArchiveIndex.INDEX_FILE_NAME), "r") as f:
+            members = {}
+            for name, location in json.load(f).items():
+                offset, size, blob_path = (list(location) + [None])[:3]
+                members[name] = (offset, size, blob_path)
+        return TTIArchiveIndex(archive_path, members)
+
+
+def load_tensor_from_archive(index: TTIArchiveIndex, directory: str, filepath: str, value):
+    """
+    Map an untilized tensor blob straight out of the archive or blob store. Anything that isn't a plain row-major dump of the
+    tensor (tilized blobs, unexpected sizes or formats) is extracted and debinarized as before.
+    """
+    dtype = TTDeviceImageJsonDecoder.DATA_FORMAT_TO_DTYPE.get(DataFormat.from_json(value["format"]), None)
+    if filepath.endswith(TTIDumpFormat.BACKEND.extension()) and dtype is not None:
+        shape = value["shape"]
+        view = index.view(filepath)
+        if len(view) == math.prod(shape) * value["itemsize"]:
+            tensor = torch.frombuffer(view, dtype=dtype).reshape(shape)
+            return PytorchTensorDesc(tensor, value["itemsize"], DataFormat.from_json(value["format"]), value["dim"], shape, value["strides"])
+
+    return load_tensor_from_disk(index.extract(filepath, directory), value)
+
+
 class TTDeviceImageJsonEncoder(json.JSONEncoder):
     DTYPE_TO_BIN_FORMAT = {
         torch.half: "f",
@@ -97,23 +299,22 @@ class TTDeviceImageJsonEncoder(json.JSONEncoder):
 
     @staticmethod
     def rehash_as_pickled_object(
-        d, key, object_value, filename_encoding, base_directory
+        d, key, object_value, filename_encoding, writer: TTIArchiveWriter
     ):
-        with open(os.path.join(base_directory, filename_encoding), "wb") as pkl_file:
-            pickle.dump(object_value, pkl_file, pickle.HIGHEST_PROTOCOL)
+        writer.submit(filename_encoding, lambda: pickle.dumps(object_value, pickle.HIGHEST_PROTOCOL))
         d[key] = filename_encoding
 
     @staticmethod
-    def rehash_tensor_as_pickled_object(d, key, object_value, base_directory):
+    def rehash_tensor_as_pickled_object(d, key, object_value, writer: TTIArchiveWriter):
         filename_encoding = os.path.join(
             "tensors", f"torch.Tensor.{key}.pkl".replace("/", "_")
         )
         TTDeviceImageJsonEncoder.rehash_as_pickled_object(
-            d, key, object_value, filename_encoding, base_directory
+            d, key, object_value, filename_encoding, writer
         )
 
     @staticmethod
-    def rehash_tensor_as_bin_object(d, key, object_value, base_directory, tti_dump_format=Optional[TTIDumpFormat], backend_api: Optional[BackendAPI] = None):
+    def rehash_tensor_as_bin_object(d, key, object_value, writer: TTIArchiveWriter, tti_dump_format=Optional[TTIDumpFormat], backend_api: Optional[BackendAPI] = None):
         filename_encoding = os.path.join(
             "tensors", f"torch.Tensor.{key}.{tti_dump_format.extension()}".replace("/", "_")
         )
@@ -126,26 +327,27 @@ class TTDeviceImageJsonEncoder(json.JSONEncoder):
 
         tensor = object_value.contiguous()  # contiguous row-major memory layout
         if is_version_at_least(TTDeviceImage.TTI_VERSION, min_version="1.1.0"):
-            qdesc = backend_api.be_api.get_queue_descriptor(key)
-            tensor_desc = pytorch_tensor_to_tensor_desc(tensor)
-            tilized_tensor_desc = tilize_tensor(qdesc, tensor_desc) if tti_dump_format == TTIDumpFormat.BACKEND_TILIZED else None
-            desc_to_binarize = tilized_tensor_desc if tilized_tensor_desc else tensor_desc
+            qdesc = backend_api.be_api.get_queue_descriptor(key) if tti_dump_format == TTIDumpFormat.BACKEND_TILIZED else None
+
+            # Tilizing and binarizing run on the writer's pool; the descriptor is filled in before device.json is written
+            def write(path):
+                tensor_desc = pytorch_tensor_to_tensor_desc(tensor)
+                tilized_tensor_desc = tilize_tensor(qdesc, tensor_desc) if qdesc is not None else None
+                desc_to_binarize = tilized_tensor_desc if tilized_tensor_desc else tensor_desc
 
-            binarize_tensor(desc_to_binarize, os.path.join(base_directory, filename_encoding))
-            d[key] = TTDeviceImageJsonEncoder.encode_descriptor(filename_encoding, tensor_desc, tilized_tensor_desc)
+                binarize_tensor(desc_to_binarize, path)
+                d[key] = TTDeviceImageJsonEncoder.encode_descriptor(filename_encoding, tensor_desc, tilized_tensor_desc)
+
+            writer.submit_file(filename_encoding, write)
 
         else:
             tensor_desc = pytorch_tensor_to_tensor_desc(tensor)
             fmt = TTDeviceImageJsonEncoder.DTYPE_TO_BIN_FORMAT[object_value.dtype]
-            with open(
-                os.path.join(base_directory, filename_encoding), "wb"
-            ) as bin_file:
-                for val in tensor.ravel().tolist():
-                    bin_file.write(struct.pack(fmt, val))
-            d[key] = TTDeviceImageJsonEncoder.encode_descriptor(filename_encoding, desc, tilized_tensor_desc)
+            writer.submit(filename_encoding, lambda: b"".join(struct.pack(fmt, val) for val in tensor.ravel().tolist()))
+            d[key] = TTDeviceImageJsonEncoder.encode_descriptor(filename_encoding, tensor_desc)
 
     @staticmethod
-    def preprocess_keys(d, base_directory: str, tti_dump_format: Optional[TTIDumpFormat] = None, backend_api: Optional[BackendAPI] = None):
+    def preprocess_keys(d, writer: TTIArchiveWriter, tti_dump_format: Optional[TTIDumpFormat] = None, backend_api: Optional[BackendAPI] = None):
         """Convert a dict's keys to strings if they are not."""
         kvs = list(d.items())
         for key, value in kvs:
@@ -159,20 +361,20 @@ class TTDeviceImageJsonEncoder(json.JSONEncoder):
                 use_backend_format = tti_dump_format in (TTIDumpFormat.BACKEND, TTIDumpFormat.BACKEND_TILIZED)
                 if use_backend_format and key != "cpueval_outputs":
                     TTDeviceImageJsonEncoder.rehash_tensor_as_bin_object(
-                        d, key, value, base_directory, tti_dump_format=tti_dump_format, backend_api=backend_api
+                        d, key, value, writer, tti_dump_format=tti_dump_format, backend_api=backend_api
                     )
                 else:
                     TTDeviceImageJsonEncoder.rehash_tensor_as_pickled_object(
-                        d, key, value, base_directory
+                        d, key, value, writer
                     )
             elif isinstance(value, Optimizer):
                 pkl_filepath = f"Optimizer.{value.get_type()}.pkl"
                 TTDeviceImageJsonEncoder.rehash_as_pickled_object(
-                    d, key, value, pkl_filepath, base_directory
+                    d, key, value, pkl_filepath, writer
                 )
             elif isinstance(value, dict):
                 d[key] = TTDeviceImageJsonEncoder.preprocess_keys(
-                    value, base_directory, tti_dump_format, backend_api
+                    value, writer, tti_dump_format, backend_api
                 )
 
         return d
@@ -209,11 +411,13 @@ class TTDeviceImageJsonDecoder(json.JSONDecoder):
         return dct
 
     @staticmethod
-    def rehash_as_tensor(value, directory):
+    def rehash_as_tensor(value, directory, index: Optional[TTIArchiveIndex] = None):
         from .tti import TTDeviceImage
 
+        filepath = value["bin"]
         if is_version_at_least(TTDeviceImage.TTI_VERSION, min_version="1.1.0"):
-            filepath= value["bin"]
+            if index is not None and filepath in index:
+                return functools.partial(load_tensor_from_archive, index, directory, filepath, value)
             lazy_load_callable  = functools.partial(load_tensor_from_disk, os.path.join(directory, filepath), value)
             return lazy_load_callable
         else:
@@ -221,30 +425,24 @@ class TTDeviceImageJsonDecoder(json.JSONDecoder):
                 DataFormat.from_json(value["format"])
             ]
             fmt = TTDeviceImageJsonEncoder.DTYPE_TO_BIN_FORMAT[dtype]
-            itemsize = struct.calcsize(fmt)
-            tensor_data = []
-            bin_filepath = value["bin"]
-            with open(os.path.join(directory, bin_filepath), "rb") as bin_file:
-                while True:
-                    bytes_data = bin_file.read(itemsize)
-                    if not bytes_data:
-                        break
-                    (val,) = struct.unpack(fmt, bytes_data)
-                    tensor_data.append(val)
-
-            tensor = torch.tensor(tensor_data, dtype=dtype).reshape(*value["shape"])
+            if index is not None and filepath in index:
+                data = np.frombuffer(index.view(filepath), dtype=np.dtype(fmt))
+            else:
+                data = np.fromfile(os.path.join(directory, filepath), dtype=np.dtype(fmt))
+
+            tensor = torch.from_numpy(data).to(dtype).reshape(*value["shape"])
             return tensor
 
     @staticmethod
-    def postprocess_keys(d, directory):
+    def postprocess_keys(d, directory, index: Optional[TTIArchiveIndex] = None):
         """Convert a encoded dict's keys to back to original type ."""
         kvs = list(d.items())
         for key, value in kvs:
             if isinstance(d[key], dict):
                 if "bin" in d[key]:
-                    d[key] = TTDeviceImageJsonDecoder.rehash_as_tensor(value, directory)
+                    d[key] = TTDeviceImageJsonDecoder.rehash_as_tensor(value, directory, index)
                 else:
-                    value = TTDeviceImageJsonDecoder.postprocess_keys(value, directory)
+                    value = TTDeviceImageJsonDecoder.postprocess_keys(value, directory, index)
 
             # convert nonstring to string if needed
             for (
@@ -256,8 +454,11 @@ class TTDeviceImageJsonDecoder(json.JSONDecoder):
                     d[decoded_type] = value
                     del d[key]
             if isinstance(value, str) and value.endswith(".pkl"):
-                with open(os.path.join(directory, value), "rb") as pkl_file:
-                    d[key] = pickle.load(pkl_file)
+                if index is not None and value in index:
+                    d[key] = pickle.loads(index.view(value))
+                else:
+                    with open(os.path.join(directory, value), "rb") as pkl_file:
+                        d[key] = pickle.load(pkl_file)
 
         return d
 
@@ -265,59 +466,60 @@ class TTDeviceImageJsonDecoder(json.JSONDecoder):
 class TTIArchive:
     TTI_UNZIPPED_DIR_NAME = "unzipped_tti"
 
-    @staticmethod
-    def _create_tti_archive(device_images_directory: str, device_img_path: str) -> None:
-        tti_absolute_file_path = os.path.realpath(device_img_path)
-
-        try:
-            subprocess.run(
-                [
-                    "tar",
-                    "-cf",
-                    tti_absolute_file_path,
-                    "-C",
-                    device_images_directory,
-                    TTIArchive.TTI_UNZIPPED_DIR_NAME,
-                ]
-            )
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed with error {e}")
+    BACKEND_BUILD_FILES_EXCLUDE = ["*.log", "blob.yaml", "*.d"]
 
     @staticmethod
-    def _copy_backend_build_files(*, src_dir: str, dst_dir: str):
+    def _add_backend_build_files(writer: TTIArchiveWriter, *, src_dir: str, dst_dir: str):
         logger.info(
-            "TTDeviceImage: copying backend build files from {} to {}", src_dir, dst_dir
+            "TTDeviceImage: adding backend build files from {} to {}", src_dir, dst_dir
         )
         os.makedirs(src_dir, exist_ok=True)
-        try:
-            if not src_dir.endswith("/"):
-                src_dir += "/"
-            cmd = [
-                "rsync",
-                "-a",
-                "--exclude=*.log",
-                "--exclude=blob.yaml",
-                "--exclude=*.d",
-                src_dir,
-                dst_dir,
-            ]
-            logger.info("Running command: {}", " ".join(cmd))
-            subprocess.run(cmd, check=True)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed with error {e}")
+        writer.add_tree(dst_dir, src_dir, exclude=TTIArchive.BACKEND_BUILD_FILES_EXCLUDE)
 
     @staticmethod
-    def _copy_netlist_yaml(*, netlist_yaml: str, dst_dir: str):
-        shutil.copy(src=netlist_yaml, dst=dst_dir)
+    def _add_module_file(writer: TTIArchiveWriter, *, module_file, dst_dir):
+        src = os.path.relpath(module_file, start=os.curdir)
+        writer.add_file(os.path.join(dst_dir, src), src)
 
     @staticmethod
-    def _copy_module_file(*, module_file, dst_dir):
-        src = os.path.relpath(module_file, start=os.curdir)
-        dst = os.path.join(dst_dir, src)
-        dstfolder = os.path.dirname(dst)
-        if not os.path.exists(dstfolder):
-            os.makedirs(dstfolder, exist_ok=True)
-        shutil.copy(src=src, dst=dst)
+    def _compute_tti_checksum(tti_file_path: str) -> str:
+        """
+        Checksum used to tell whether a previously extracted image is still current. By default this is a cheap
+        fingerprint of size, mtime and archive headers; set PYBUDA_TTI_FULL_CHECKSUM=1 to hash the whole file.
+        """
+        if bool(int(os.environ.get("PYBUDA_TTI_FULL_CHECKSUM", "0"))):
+            return f"sha256:{compute_file_checksum(tti_file_path)}"
+        return f"fingerprint:{compute_file_fingerprint(tti_file_path)}"
+
+    @staticmethod
+    def _extract_tti_archive(tti_file_path: str, dst_dir: str) -> TTIArchiveIndex:
+        """
+        Extract everything but the tensor blobs, which are indexed by their offset in the archive so they can be
+        memory-mapped in place.
+        """
+        tensors_prefix = os.path.join(TTIArchive.TTI_UNZIPPED_DIR_NAME, "tensors") + "/"
+        members = {}
+        with tarfile.open(tti_file_path, "r:") as tar:
+            to_extract = []
+            for member in tar:
+                name = os.path.relpath(member.name, TTIArchive.TTI_UNZIPPED_DIR_NAME)
+                if member.isfile() and member.name.startswith(tensors_prefix):
+                    members[name] = (member.offset_data, member.size, None)
+                elif member.islnk() and member.name.startswith(tensors_prefix):
+                    # Duplicate tensors in merged images are stored once, as hard links to the first copy
+                    members[name] = members[os.path.relpath(member.linkname, TTIArchive.TTI_UNZIPPED_DIR_NAME)]
+                else:
+                    to_extract.append(member)
+            tar.extractall(dst_dir, members=to_extract)
+        unzipped_tti_directory = os.path.join(dst_dir, TTIArchive.TTI_UNZIPPED_DIR_NAME)
+        os.makedirs(os.path.join(unzipped_tti_directory, "tensors"), exist_ok=True)
+
+        index = TTIArchiveIndex(tti_file_path, members)
+        manifest_path = os.path.join(unzipped_tti_directory, TTIBlobStore.MANIFEST_FILE_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                index.add_blobs(json.load(f))
+        return index
 
     @staticmethod
     def _get_device_img_path(device_img_path_override: Optional[str] = None):
@@ -363,7 +565,7 @@ class TTIArchive:
         return instantiated_modules
 
     @staticmethod
-    def construct_device_image(unzipped_tti_directory: str) -> "TTDeviceImage":
+    def construct_device_image(unzipped_tti_directory: str, index: Optional[TTIArchiveIndex] = None) -> "TTDeviceImage":
         from .tti import TTDeviceImage
 
         device_image = None
@@ -372,7 +574,7 @@ class TTIArchive:
         ) as json_file:
             device_image_dict = json.load(json_file, cls=TTDeviceImageJsonDecoder)
             TTDeviceImageJsonDecoder.postprocess_keys(
-                device_image_dict, unzipped_tti_directory
+                device_image_dict, unzipped_tti_directory, index
             )
 
             try:
@@ -413,27 +615,26 @@ class TTIArchive:
             )
             return tti_checksum == directory_checksum
 
-        tti_checksum = compute_file_checksum(absolute_device_image_path)
-        if contains_matching_checksum(tti_checksum):
+        tti_checksum = TTIArchive._compute_tti_checksum(absolute_device_image_path)
+        if contains_matching_checksum(tti_checksum) and os.path.exists(os.path.join(unzipped_tti_directory, TTIArchiveIndex.INDEX_FILE_NAME)):
             logger.info(
                 f"TTI: Netlist checksum matches - populating TTDevice from pre-existing dir {unzipped_tti_directory}"
             )
+            index = TTIArchiveIndex.load(absolute_device_image_path, unzipped_tti_directory)
         else:
             logger.info(
                 f"TTI: No matching checksum found - extracting TTI to dir {os.path.realpath(unzipped_tti_directory)} "
             )
             shutil.rmtree(unzipped_tti_directory, ignore_errors=True)
-            try:
-                subprocess.run(
-                    ["tar", "-xf", tti_file_path, "-C", absolute_device_image_directory]
-                )
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Command failed with error {e}")
+            extract_start = time.time()
+            index = TTIArchive._extract_tti_archive(absolute_device_image_path, absolute_device_image_directory)
+            index.save(unzipped_tti_directory)
             write_checksum_to_file(
                 tti_checksum, os.path.join(unzipped_tti_directory, "checksum.txt")
             )
+            logger.debug("TTI: Extracting took {} seconds", time.time() - extract_start)
 
-        device_image = TTIArchive.construct_device_image(unzipped_tti_directory)
+        device_image = TTIArchive.construct_device_image(unzipped_tti_directory, index)
         device_image.compiler_cfg.backend_output_dir = os.path.join(
             absolute_device_image_directory,
             device_image.compiler_cfg.backend_output_dir,
@@ -468,71 +669,88 @@ class TTIArchive:
         dst_relative_directory_tti = os.path.dirname(device_img_path)
         os.makedirs(os.path.realpath(dst_relative_directory_tti), exist_ok=True)
 
-        with tempfile.TemporaryDirectory() as tmp:
-            src_tti_directory_to_zip = os.path.join(
-                tmp, TTIArchive.TTI_UNZIPPED_DIR_NAME
-            )
-            os.makedirs(src_tti_directory_to_zip, exist_ok=True)
-
-            copy_start = time.time()
-            relative_backend_output_dir = os.path.join(
-                TTIArchive.TTI_UNZIPPED_DIR_NAME, "backend_build_binaries"
-            )
-            TTIArchive._copy_backend_build_files(
-                src_dir=device_image.compiler_cfg.backend_output_dir,
-                dst_dir=os.path.join(
-                    src_tti_directory_to_zip, "backend_build_binaries"
-                ),
-            )
-            logger.debug(
-                "TTI: Copying backend build files took {} seconds",
-                time.time() - copy_start,
-            )
-
-            netlist_path = device_image.compiled_graph_state.netlist_filename
-            device_image.compiler_cfg.backend_output_dir = relative_backend_output_dir
-            device_image.compiler_cfg.backend_runtime_params_path = ""
-            netlist_file_basename = os.path.basename(netlist_path)
-            device_image.compiled_graph_state.netlist_filename = os.path.join(
-                relative_backend_output_dir, netlist_file_basename
-            )
+        # Write to a temporary file next to the destination, so a failed save never leaves a partial image behind
+        tti_absolute_file_path = os.path.realpath(device_img_path)
+        tmp_tti_file_path = f"{tti_absolute_file_path}.tmp"
+        writer = TTIArchiveWriter(tmp_tti_file_path, TTIArchive.TTI_UNZIPPED_DIR_NAME, get_tti_save_num_threads(), blob_store=get_tti_blob_store())
+        saved = False
+        try:
+            try:
+                copy_start = time.time()
+                relative_backend_output_dir = os.path.join(
+                    TTIArchive.TTI_UNZIPPED_DIR_NAME, "backend_build_binaries"
+                )
+                TTIArchive._add_backend_build_files(
+                    writer,
+                    src_dir=device_image.compiler_cfg.backend_output_dir,
+                    dst_dir="backend_build_binaries",
+                )
+                logger.debug(
+                    "TTI: Adding backend build files took {} seconds",
+                    time.time() - copy_start,
+                )
 
-            tensors_directory = os.path.join(src_tti_directory_to_zip, "tensors")
-            os.makedirs(tensors_directory, exist_ok=True)
+                netlist_path = device_image.compiled_graph_state.netlist_filename
+                device_image.compiler_cfg.backend_output_dir = relative_backend_output_dir
+                device_image.compiler_cfg.backend_runtime_params_path = ""
+                netlist_file_basename = os.path.basename(netlist_path)
+                device_image.compiled_graph_state.netlist_filename = os.path.join(
+                    relative_backend_output_dir, netlist_file_basename
+                )
 
-            with open(os.path.join(src_tti_directory_to_zip, "device.json"), "w") as f:
+                tensors_start = time.time()
+                writer.add_directory("tensors")
                 device_image_state_dict = TTDeviceImage.to_dict(device_image)
                 del device_image_state_dict["modules"]
                 TTDeviceImageJsonEncoder.preprocess_keys(
                     device_image_state_dict,
-                    src_tti_directory_to_zip,
+                    writer,
                     device_image.compiler_cfg.tti_dump_format,
                     backend_api=backend_api,
                 )
+                writer.wait()
+                logger.debug(
+                    "TTI: Serializing tensors took {} seconds",
+                    time.time() - tensors_start,
+                )
+
+                metadata_start = time.time()
                 device_image_state_json = json.dumps(
                     device_image_state_dict,
                     cls=TTDeviceImageJsonEncoder,
                     indent=4,
                     skipkeys=True,
                 )
-                f.write(device_image_state_json)
+                writer.add_bytes("device.json", device_image_state_json.encode("utf-8"))
 
-            module_files_directory = os.path.join(
-                src_tti_directory_to_zip, "module_files"
-            )
-            os.makedirs(module_files_directory, exist_ok=True)
+                writer.add_directory("module_files")
+                for pybuda_module in device_image.modules:
+                    module_file = inspect.getfile(pybuda_module.__class__)
+                    TTIArchive._add_module_file(
+                        writer, module_file=module_file, dst_dir="module_files"
+                    )
 
-            for pybuda_module in device_image.modules:
-                module_file = inspect.getfile(pybuda_module.__class__)
-                TTIArchive._copy_module_file(
-                    module_file=module_file, dst_dir=module_files_directory
+                writer.add_file(netlist_file_basename, netlist_path)
+                writer.add_bytes(
+                    "compile_and_runtime_config.json",
+                    json.dumps(get_buda_compile_and_runtime_configs(), indent=4).encode("utf-8"),
                 )
-
-                TTIArchive._copy_netlist_yaml(
-                    netlist_yaml=netlist_path, dst_dir=src_tti_directory_to_zip
+                logger.debug(
+                    "TTI: Writing metadata and module files took {} seconds",
+                    time.time() - metadata_start,
                 )
-                write_buda_envs_configs(src_tti_directory_to_zip)
-            TTIArchive._create_tti_archive(tmp, device_img_path)
+            except Exception:
+                writer.abort()
+                raise
+
+            writer.close()
+            os.replace(tmp_tti_file_path, tti_absolute_file_path)
+            saved = True
+        finally:
+            # Also covers abort() or close() failing, which would otherwise leave the partial archive behind
+            if not saved and os.path.exists(tmp_tti_file_path):
+                os.remove(tmp_tti_file_path)
+
         logger.info(
             "TTI: Saving device image took {} seconds", time.time() - start_time
         )
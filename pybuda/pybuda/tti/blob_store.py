@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Content-addressed store for TTI tensor blobs.
+
+When PYBUDA_TTI_BLOB_STORE points to a directory, TTI images don't embed their tensors. Each blob is stored once
+under its sha256, and the image carries a `blobs.json` manifest mapping tensor file names to digests. Variants of
+the same checkpoint (different batch sizes, balancer policies, ...) and merged models then share one copy of
+every identical tensor on disk and in the page cache.
+
+Blobs that are no longer referenced by any image can be removed with:
+
+    python -m pybuda.tti.blob_store gc --store <dir> <tti files or directories>...
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+from loguru import logger
+
+
+class TTIBlobStore:
+    MANIFEST_FILE_NAME = "blobs.json"
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def _commit(self, tmp_path: str, digest: str) -> str:
+        path = self.path(digest)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            # Refresh mtime, so a concurrent gc sees the blob as recently used
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        return digest
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self:
+            os.utime(self.path(digest))
+            return digest
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self._commit(tmp_path, digest)
+
+    def put_file(self, path: str, move: bool = False) -> str:
+        """ Add the contents of `path` to the store. With `move`, the file is consumed. """
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        if move:
+            shutil.move(path, tmp_path)
+        else:
+            shutil.copyfile(path, tmp_path)
+        return self._commit(tmp_path, digest)
+
+    def digests(self) -> Iterator[str]:
+        for prefix in os.scandir(self.root):
+            if prefix.is_dir() and len(prefix.name) == 2:
+                for entry in os.scandir(prefix.path):
+                    yield entry.name
+
+    def gc(self, referenced: Set[str], min_age_secs: float = 3600, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Remove blobs that aren't in `referenced`. Blobs touched within the last `min_age_secs` are kept, since they
+        may belong to an image that is still being written.
+        """
+        now = time.time()
+        removed, removed_bytes, kept = 0, 0, 0
+        for digest in list(self.digests()):
+            path = self.path(digest)
+            stat = os.stat(path)
+            if digest in referenced or now - stat.st_mtime < min_age_secs:
+                kept += 1
+                continue
+            if not dry_run:
+                os.remove(path)
+            removed += 1
+            removed_bytes += stat.st_size
+        return {"removed": removed, "removed_bytes": removed_bytes, "kept": kept}
+
+
+def get_tti_blob_store() -> Optional[TTIBlobStore]:
+    root = os.environ.get("PYBUDA_TTI_BLOB_STORE", None)
+    return TTIBlobStore(root) if root else None
+
+
+def make_manifest(store: TTIBlobStore, blobs: Dict[str, str]) -> bytes:
+    return json.dumps({"store": store.root, "blobs": blobs}, indent=4, sort_keys=True).encode("utf-8")
+
+
+def read_manifest_from_tti(tti_file_path: str) -> Optional[Dict]:
+    """ Read the blob manifest of a TTI image without extracting it """
+    with tarfile.open(tti_file_path, "r:") as tar:
+        for member in tar:
+            if os.path.basename(member.name) == TTIBlobStore.MANIFEST_FILE_NAME and member.name.count("/") == 1:
+                return json.load(tar.extractfile(member))
+    return None
+
+
+def find_tti_files(paths: List[str]) -> List[str]:
+    tti_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                tti_files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".tti"))
+        else:
+            tti_files.append(path)
+    return tti_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the content-addressed TTI blob store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subparsers.add_parser("gc", help="Remove blobs not referenced by any of the given TTI images")
+    gc_parser.add_argument("images", nargs="+", help="TTI files, or directories to search for them, that are still in use")
+    gc_parser.add_argument("--store", type=str, default=os.environ.get("PYBUDA_TTI_BLOB_STORE", None), help="Blob store directory (default: $PYBUDA_TTI_BLOB_STORE)")
+    gc_parser.add_argument("--min-age", type=float, default=3600, help="Keep blobs touched within this many seconds")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+    args = parser.parse_args()
+
+    if args.store is None:
+        parser.error("--store or PYBUDA_TTI_BLOB_STORE is required")
+
+    referenced = set()
+    for tti_file in find_tti_files(args.images):
+        manifest = read_manifest_from_tti(tti_file)
+        if manifest is not None:
+            referenced.update(manifest["blobs"].values())
+
+    result = TTIBlobStore(args.store).gc(referenced, min_age_secs=args.min_age, dry_run=args.dry_run)
+    logger.info(
+        "TTI blob store gc: {} {} blobs ({:.1f} MB), kept {}",
+        "would remove" if args.dry_run else "removed",
+        result["removed"],
+        result["removed_bytes"] / 2**20,
+        result["kept"],
+    )
+
+if __name__ == "__main__":
+    main()
@@ -24,4 +24,19 @@ def read_checksum_from_file(checksum_file_name):
         return None
     with open(checksum_file_name, 'r') as f:
         checksum = f.read().strip()
-    return checksum
\ No newline at end of file
+    return checksum
+
+
+def compute_file_fingerprint(file_path, chunk_size=1 << 20):
+    """
+    Cheap stand-in for a full checksum: file size and mtime, plus a hash of the first and last `chunk_size` bytes
+    (which cover the archive's leading and trailing headers).
+    """
+    stat = os.stat(file_path)
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read(chunk_size))
+        if stat.st_size > chunk_size:
+            f.seek(max(chunk_size, stat.st_size - chunk_size))
+            hasher.update(f.read(chunk_size))
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{hasher.hexdigest()}"
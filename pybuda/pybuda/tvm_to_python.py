@@ -3,15 +3,18 @@
 # SPDX-License-Identifier: Apache-2.0
 import re
 import json
+import hashlib
+import inspect
+import shutil
+import tempfile
+import threading
 from collections import OrderedDict
+from typing import Optional
 
 from loguru import logger
 
 import torch
 import numpy as np
-import tensorflow as tf
-import onnx
-import mxnet as mx
 
 import pybuda._C.pattern_matcher as pypattern_matcher
 from pybuda.module import OnnxModule, PyBudaModule, TFLiteModule
@@ -23,9 +26,10 @@ from pybuda.tvm_utils import flatten_inputs
 
 import os
 import sys
+import time
 import importlib
 
-from pybuda.python_codegen import PyTorchWriter, PyBudaWriter, PythonWriter
+from pybuda.python_codegen import PyTorchWriter, PyBudaWriter, PythonWriter, get_incompatible_np_float_types
 
 
 def populate_torch_all_to_args(graph, nid, compiler_cfg):
@@ -1501,6 +1505,23 @@ def verify_framework_vs_buda_codegen(frame_outputs, buda_outputs, verify_cfg):
         assert test_pass, f"Data mismatch on output {i} between framework and Pybuda codegen"
     logger.info("Verified python codegen agains framework")
 
+def get_input_indices(inputs, sorted_inputs):
+    """
+    Map each position in `inputs` to the position of the same tensor object in `sorted_inputs`. Inputs are
+    matched by identity, so this is linear and doesn't confuse distinct inputs that happen to hold equal values.
+    """
+    # The same tensor may be passed in more than once; its positions are handed out in order
+    positions = {}
+    for index, unsorted_input in enumerate(inputs):
+        positions.setdefault(id(unsorted_input), []).append(index)
+
+    input_indices = {}
+    for sorted_index, sorted_input in enumerate(sorted_inputs):
+        if sorted_input is None or not positions.get(id(sorted_input), None):
+            continue
+        input_indices[positions[id(sorted_input)].pop(0)] = sorted_index
+    return input_indices
+
 def save_writers_metadata(modules, inputs, sorted_inputs, module_name):
     metadata = {}
     metadata["writers"] = []
@@ -1513,26 +1534,24 @@ def save_writers_metadata(modules, inputs, sorted_inputs, module_name):
         metadata["writers"][index]["module_name"] = module.module_name
         metadata["writers"][index]["filename"] = module.filename
 
-    metadata["input_indices"] = {}
-    for index, unsorted_input in enumerate(inputs):
-        for sorted_index, sorted_input in enumerate(sorted_inputs):
-            if sorted_input.dtype == unsorted_input.dtype and torch.equal(sorted_input, unsorted_input):
-                metadata["input_indices"][index] = sorted_index
+    metadata["input_indices"] = get_input_indices(inputs, sorted_inputs)
 
     metadata["framework"] = modules[0].framework
 
     filename = module_name + ".json"
-    with open(os.path.join(modules[0].module_directory, filename), "w") as metadata_file:
+    filepath = os.path.join(modules[0].module_directory, filename)
+    with open(filepath, "w") as metadata_file:
         json.dump(metadata, metadata_file)
-    return
+    return filepath
 
 def metadata_path(module_name):
     module_directory = "generated_modules"
     filename = module_name + ".json"
     return os.path.join(module_directory, filename)
 
-def load_writers_metadata(module_name, inputs):
-    filepath = metadata_path(module_name)
+def load_writers_metadata(module_name, inputs, filepath=None):
+    if filepath is None:
+        filepath = metadata_path(module_name)
     assert os.path.exists(filepath), f"{filepath} not found, has the test been run with PYBUDA_RELOAD_GENERATED_MODULES disabled and compiler_cfg.retain_tvm_python_files enabled"
     with open(filepath, "r") as metadata_file:
         metadata = json.load(metadata_file)
@@ -1556,8 +1575,304 @@ def load_writers_metadata(module_name, inputs):
 
     return module_writers, ordered_inptus
 
+def _hash_file(h, path):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+
+def _hash_tensor(h, name, tensor):
+    tensor = tensor.detach().cpu().contiguous()
+    h.update(f"{name}:{tensor.dtype}:{list(tensor.shape)}".encode("utf-8"))
+    h.update(tensor.reshape(-1).view(torch.uint8).numpy().data)
+
+def _hash_class_sources(h, classes):
+    for cls in sorted(classes, key=lambda c: f"{c.__module__}.{c.__qualname__}"):
+        h.update(f"{cls.__module__}.{cls.__qualname__}".encode("utf-8"))
+        try:
+            h.update(inspect.getsource(cls).encode("utf-8"))
+        except (OSError, TypeError):
+            pass
+
+def _hash_value(h, value, depth=0):
+    # Stable encoding of module attributes; object ids and addresses never get into the hash
+    if depth > 8:
+        h.update(f"{type(value).__module__}.{type(value).__qualname__}".encode("utf-8"))
+    elif value is None or isinstance(value, (bool, int, float, str, bytes)):
+        h.update(repr(value).encode("utf-8"))
+    elif isinstance(value, torch.Tensor):
+        _hash_tensor(h, "", value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        h.update(f"{type(value).__name__}[".encode("utf-8"))
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        for item in items:
+            _hash_value(h, item, depth + 1)
+        h.update(b"]")
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode("utf-8"))
+            _hash_value(h, value[k], depth + 1)
+        h.update(b"}")
+    else:
+        h.update(f"{type(value).__module__}.{type(value).__qualname__}".encode("utf-8"))
+        # Config-like objects, e.g. a transformers config, are hashed by their fields
+        if depth < 4 and hasattr(value, "__dict__") and not isinstance(value, (torch.nn.Module, type)) and not callable(value):
+            _hash_value(h, vars(value), depth + 1)
+
+_TORCH_MODULE_INTERNALS = None
+
+def _hash_module_attributes(h, module):
+    """
+    Hash plain attributes of each submodule (flags, config values), which can change what forward does, but
+    aren't in the state dict or the module's repr. nn.Module bookkeeping and submodules are skipped.
+    """
+    global _TORCH_MODULE_INTERNALS
+    if _TORCH_MODULE_INTERNALS is None:
+        _TORCH_MODULE_INTERNALS = set(vars(torch.nn.Module()))
+    for name, m in module.named_modules():
+        h.update(name.encode("utf-8"))
+        for attr in sorted(vars(m)):
+            if attr in _TORCH_MODULE_INTERNALS and attr != "training":
+                continue
+            h.update(attr.encode("utf-8"))
+            _hash_value(h, vars(m)[attr])
+
+def framework_fingerprint(framework_mod) -> Optional[str]:
+    """
+    Hash of a framework module's graph and weights, or None if the framework isn't supported. Weights are
+    included since TVM folds some of them into the generated params file. For PyTorch, plain module attributes
+    are included too, since they can change what forward traces to.
+    """
+    h = hashlib.sha256()
+    framework = get_framework(framework_mod)
+    h.update(framework.encode("utf-8"))
+    if framework == "pytorch":
+        module = framework_mod.module
+        h.update(repr(module).encode("utf-8"))
+        _hash_class_sources(h, {type(m) for m in module.modules()})
+        _hash_module_attributes(h, module)
+        for name, tensor in module.state_dict(keep_vars=False).items():
+            _hash_tensor(h, name, tensor)
+    elif framework == "onnx":
+        model = framework_mod.module
+        for proto in list(model.opset_import) + list(model.graph.node) + list(model.graph.input) + list(model.graph.output):
+            h.update(proto.SerializeToString())
+        # Weights may live in raw_data, typed fields, or separate files next to the graph
+        external_files = set()
+        for initializer in model.graph.initializer:
+            if initializer.raw_data:
+                h.update(f"{initializer.name}:{initializer.data_type}:{list(initializer.dims)}".encode("utf-8"))
+                h.update(initializer.raw_data)
+            else:
+                h.update(initializer.SerializeToString())
+            for entry in initializer.external_data:
+                if entry.key == "location":
+                    external_files.add(entry.value)
+        for location in sorted(external_files):
+            _hash_file(h, os.path.join(os.path.dirname(framework_mod.onnx_path), location))
+    elif framework == "tflite":
+        _hash_file(h, framework_mod.tflite_path)
+    elif framework == "tf_graphdef":
+        h.update(framework_mod.module.SerializeToString())
+    elif framework == "tensorflow":
+        module = framework_mod.module
+        _hash_class_sources(h, {type(module)} | {type(layer) for layer in getattr(module, "submodules", [])})
+        for weight in module.weights:
+            h.update(weight.name.encode("utf-8"))
+            h.update(np.ascontiguousarray(weight.numpy()).tobytes())
+    else:
+        return None
+    return h.hexdigest()
+
+
+class TVMCodegenCache:
+    """
+    On-disk cache of python modules generated from TVM.
+
+    Entries are keyed on a fingerprint of the framework graph and weights, the input shapes and dtypes, and the
+    compile and verify configs. Each entry holds the generated module files, their params files and the writers
+    metadata, and is restored into the generated modules directory on a hit, skipping TVM conversion entirely.
+    Total size is capped, and least recently used entries are evicted first, using the modification time of the
+    metadata file as the access stamp.
+    """
+    VERSION = 2
+    METADATA_FILE_NAME = "metadata.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, framework_mod, inputs, compiler_cfg, verify_cfg, input_names) -> Optional[str]:
+        fingerprint = framework_fingerprint(framework_mod)
+        if fingerprint is None:
+            return None
+
+        compiler_cfg_dict = json.loads(compiler_cfg.to_json())
+        compiler_cfg_dict.pop("backend_output_dir", None)
+        flattened_inputs, _, _ = flatten_inputs(inputs)
+        env_options = {
+            name: value for name, value in pybuda.utils.get_buda_compile_and_runtime_configs().items()
+            if not name.startswith("PYBUDA_TVM_CODEGEN_CACHE")
+        }
+
+        h = hashlib.sha256()
+        h.update(json.dumps([
+            self.VERSION,
+            fingerprint,
+            [(list(t.shape), str(t.dtype)) for t in flattened_inputs],
+            list(input_names),
+            compiler_cfg_dict,
+            None if verify_cfg is None else str(verify_cfg.test_kind),
+            env_options,
+        ], sort_keys=True, default=str).encode("utf-8"))
+        # Changes to the code generator itself invalidate all entries
+        for source in (__file__, inspect.getfile(PythonWriter)):
+            _hash_file(h, source)
+        return h.hexdigest()
+
+    def entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _writer_files(module_directory, module_name):
+        return [
+            os.path.join(module_directory, module_name + ".py"),
+            os.path.join(module_directory, module_name + "_params.pt"),
+        ]
+
+    @staticmethod
+    def _replace_file(path, data: bytes):
+        # Write next to the destination and rename over it, so a file that's already open or memory-mapped
+        # (e.g. params of an earlier module) keeps its contents
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _restore_writer(self, entry_dir, writer, module_name):
+        """
+        Restore cached files of a writer into its module directory under module_name, renaming the generated
+        class and the params file it loads to match
+        """
+        cached_name, cached_class_name = writer.module_name, writer.class_name
+        writer.module_name = module_name
+        writer.class_name = module_name.title().replace("_", "")
+        writer.filename = module_name + ".py"
+        os.makedirs(writer.module_directory, exist_ok=True)
+
+        cached_params = os.path.join(entry_dir, cached_name + "_params.pt")
+        if os.path.exists(cached_params):
+            with open(cached_params, "rb") as f:
+                self._replace_file(os.path.join(writer.module_directory, module_name + "_params.pt"), f.read())
+
+        with open(os.path.join(entry_dir, cached_name + ".py"), "r") as f:
+            source = f.read()
+        source = source.replace(f"class {cached_class_name}(", f"class {writer.class_name}(")
+        source = source.replace(
+            f"\"{os.path.join(writer.module_directory, cached_name + '_params.pt')}\"",
+            f"\"{os.path.join(writer.module_directory, module_name + '_params.pt')}\"")
+        self._replace_file(os.path.join(writer.module_directory, module_name + ".py"), source.encode("utf-8"))
+
+    def get(self, key: str, graph_name, inputs, module_name):
+        """
+        Restore the entry's modules under module_name, as a fresh compile would name them, or return None on a miss
+        """
+        entry_dir = self.entry_dir(key)
+        metadata_file = os.path.join(entry_dir, self.METADATA_FILE_NAME)
+        if not os.path.exists(metadata_file):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        os.utime(metadata_file)
+        with open(metadata_file, "r") as f:
+            cached_module_name = json.load(f)["cached_module_name"]
+        module_writers, flattened_inputs = load_writers_metadata(graph_name, inputs, filepath=metadata_file)
+        for writer in module_writers:
+            # Device suffixes of multi-graph modules are kept
+            assert writer.module_name.startswith(cached_module_name)
+            self._restore_writer(entry_dir, writer, module_name + writer.module_name[len(cached_module_name):])
+
+        with self.lock:
+            self.hits += 1
+        return module_writers, flattened_inputs
+
+    def put(self, key: str, module_writers, metadata_file, module_name):
+        # Build the entry in a temporary directory and rename it into place, so readers never see a partial entry
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            for writer in module_writers:
+                for path in self._writer_files(writer.module_directory, writer.module_name):
+                    if os.path.exists(path):
+                        shutil.copyfile(path, os.path.join(tmp_dir, os.path.basename(path)))
+            # Metadata goes last; its presence marks a complete entry. The name modules were generated under is
+            # kept, so that hits can rename them.
+            with open(metadata_file, "r") as f:
+                metadata = json.load(f)
+            metadata["cached_module_name"] = module_name
+            with open(os.path.join(tmp_dir, self.METADATA_FILE_NAME), "w") as f:
+                json.dump(metadata, f)
+
+            entry_dir = self.entry_dir(key)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def evict(self, keep: Optional[str] = None):
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                metadata_file = os.path.join(entry.path, self.METADATA_FILE_NAME)
+                if entry.is_dir() and os.path.exists(metadata_file):
+                    size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                    entries.append((os.stat(metadata_file).st_mtime, size, entry.name))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                shutil.rmtree(self.entry_dir(name), ignore_errors=True)
+                total_bytes -= size
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_tvm_codegen_cache: Optional[TVMCodegenCache] = None
+
+def get_tvm_codegen_cache() -> Optional[TVMCodegenCache]:
+    """
+    TVM codegen cache, enabled by setting PYBUDA_TVM_CODEGEN_CACHE_DIR. Size is capped to
+    PYBUDA_TVM_CODEGEN_CACHE_SIZE_MB (default 8192).
+    """
+    global _tvm_codegen_cache
+    cache_dir = os.environ.get("PYBUDA_TVM_CODEGEN_CACHE_DIR", None)
+    if not cache_dir:
+        return None
+
+    max_bytes = int(os.environ.get("PYBUDA_TVM_CODEGEN_CACHE_SIZE_MB", "8192")) * 1024 * 1024
+    if _tvm_codegen_cache is None or _tvm_codegen_cache.cache_dir != cache_dir:
+        _tvm_codegen_cache = TVMCodegenCache(cache_dir, max_bytes)
+    _tvm_codegen_cache.max_bytes = max_bytes
+    return _tvm_codegen_cache
+
 def generate_pybuda_module(framework_mod, inputs, compiler_cfg=None, graph_name=None, verify_cfg=None, clean_later=False, input_names=[]):
     global counter
+    global generated_files
 
     if compiler_cfg is None:
         compiler_cfg = _get_global_compiler_config()
@@ -1579,8 +1894,22 @@ def generate_pybuda_module(framework_mod, inputs, compiler_cfg=None, graph_name=
     if verify_cfg is not None and verify_cfg.verify_pybuda_codegen_vs_framework:
         framework_outputs = framework_mod.cpu_eval_forward(*pytorch_inputs)
 
-    if not reload:
-        module_name = graph_name if counter == 0 else f"{graph_name}_{counter}"
+    start = time.time()
+    module_name = graph_name if counter == 0 else f"{graph_name}_{counter}"
+    cache = None if reload else get_tvm_codegen_cache()
+    cache_key = None
+    cached = None
+    if cache is not None:
+        cache_key = cache.key(framework_mod, pytorch_inputs, compiler_cfg, verify_cfg, input_names)
+        if cache_key is not None:
+            cached = cache.get(cache_key, graph_name, pytorch_inputs, module_name)
+
+    if reload:
+        module_writers, flattened_inputs = load_writers_metadata(graph_name, inputs)
+    elif cached is not None:
+        logger.info(f"Loaded generated modules for {graph_name} from TVM codegen cache {cache.entry_dir(cache_key)}")
+        module_writers, flattened_inputs = cached
+    else:
         module_writers, flattened_inputs = compile_tvm_to_python(
                                                         framework_mod,
                                                         graph_name,
@@ -1590,8 +1919,14 @@ def generate_pybuda_module(framework_mod, inputs, compiler_cfg=None, graph_name=
                                                         verify_cfg=verify_cfg,
                                                         input_names=input_names,
                                                     )
-    else:
-        module_writers, flattened_inputs = load_writers_metadata(graph_name, inputs)
+        if cache_key is not None:
+            cache.put(cache_key, module_writers, metadata_path(graph_name), module_name)
+            if not compiler_cfg.retain_tvm_python_files:
+                generated_files.append(os.path.abspath(metadata_path(graph_name)))
+
+    if cache_key is not None:
+        cache.evict(keep=cache_key)
+        logger.debug("TVM codegen cache stats: {}", cache.stats())
 
     counter += 1
     sys.path.append(".")
@@ -1616,7 +1951,6 @@ def generate_pybuda_module(framework_mod, inputs, compiler_cfg=None, graph_name=
         buda_mods.append(buda_mod)
 
         if not compiler_cfg.retain_tvm_python_files:
-            global generated_files
             generated_files.append(writer.filename)
             param_filename = os.path.join(writer.module_directory, writer.module_name + "_params.pt")
             if os.path.exists(param_filename):
@@ -1625,6 +1959,13 @@ def generate_pybuda_module(framework_mod, inputs, compiler_cfg=None, graph_name=
             if not clean_later:
                 cleanup_temporary_files()
 
+    logger.info(
+        "Generated PyBuda modules for {} in {:.2f} seconds, peak RSS {:.1f} MB",
+        graph_name,
+        time.time() - start,
+        pybuda.utils.get_peak_rss_mb(),
+    )
+
     if devices[0] == "CPUDevice":
         buda_inputs = pybuda.tensor.to_pt_tensors(flattened_inputs)
     else:
@@ -2058,7 +2399,7 @@ def compile_tvm_to_python(framework_mod, graph_name, inputs, module_name=None, c
         contains_incompatible_np_floats = False
         if framework == "tensorflow":
             for weight in framework_mod.module.weights:
-                if weight.dtype in PyBudaWriter.incompatible_np_float_types:
+                if weight.dtype in get_incompatible_np_float_types():
                     contains_incompatible_np_floats = True
 
         current_module_name = module_name
@@ -2162,7 +2503,7 @@ def compile_tvm_to_python(framework_mod, graph_name, inputs, module_name=None, c
 
         modules.append(writer)
 
-    if compiler_cfg.retain_tvm_python_files:
+    if compiler_cfg.retain_tvm_python_files or get_tvm_codegen_cache() is not None:
         save_writers_metadata(modules, flattened_pytorch_inputs, pybuda_inputs, graph_name)
 
     return modules, pybuda_inputs
@@ -1,45 +1,53 @@
 # SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
 
 # SPDX-License-Identifier: Apache-2.0
-import tensorflow as tf
+import functools
+
 import torch
 import numpy as np
 
-tf_to_pt_type_map = {
-    tf.bfloat16: torch.bfloat16,
-    tf.bool: torch.bool,
-    tf.complex128: torch.complex128,
-    tf.complex64: torch.complex64,
-    tf.double: torch.double,
-    tf.float16: torch.float16,
-    tf.float32: torch.float32,
-    tf.float64: torch.float64,
-    tf.half: torch.half,
-    tf.int16: torch.int16,
-    tf.int32: torch.int32,
-    tf.int64: torch.int64,
-    tf.int8: torch.int8,
-    tf.qint16: torch.qint32, # No torch.qint16.
-    tf.qint32: torch.qint32,
-    tf.qint8: torch.qint8,
-    tf.quint16: None, # No torch.quint16.
-    tf.quint8: torch.quint8,
-    tf.resource: None, # No torch.resource.
-    tf.string: None, # No torch.string
-    tf.uint16: None, # No torch.uint16
-    tf.uint32: None, # No torch.uint16
-    tf.uint64: None, # No torch.uint16
-    tf.uint8: torch.uint8,
-    tf.variant: None # No torch.uint16
-}
+from pybuda.lazy_imports import tf, is_tf_tensor
+
+
+@functools.lru_cache(maxsize=None)
+def get_tf_to_pt_type_map():
+    # Built on first use, so that importing pybuda doesn't pull in TensorFlow
+    return {
+        tf.bfloat16: torch.bfloat16,
+        tf.bool: torch.bool,
+        tf.complex128: torch.complex128,
+        tf.complex64: torch.complex64,
+        tf.double: torch.double,
+        tf.float16: torch.float16,
+        tf.float32: torch.float32,
+        tf.float64: torch.float64,
+        tf.half: torch.half,
+        tf.int16: torch.int16,
+        tf.int32: torch.int32,
+        tf.int64: torch.int64,
+        tf.int8: torch.int8,
+        tf.qint16: torch.qint32, # No torch.qint16.
+        tf.qint32: torch.qint32,
+        tf.qint8: torch.qint8,
+        tf.quint16: None, # No torch.quint16.
+        tf.quint8: torch.quint8,
+        tf.resource: None, # No torch.resource.
+        tf.string: None, # No torch.string
+        tf.uint16: None, # No torch.uint16
+        tf.uint32: None, # No torch.uint16
+        tf.uint64: None, # No torch.uint16
+        tf.uint8: torch.uint8,
+        tf.variant: None # No torch.uint16
+    }
 
 
 def map_tf_dtype_to_pt(tf_dtype):
-    pt_type = tf_to_pt_type_map[tf_dtype]
+    pt_type = get_tf_to_pt_type_map()[tf_dtype]
     assert pt_type is not None, f"TensorFlow DType {tf_dtype} has no PyTorch equivalent"
     return pt_type
 
 def map_pt_dtype_to_tf(pt_dtype):
+    tf_to_pt_type_map = get_tf_to_pt_type_map()
     pt_types = list(tf_to_pt_type_map.values())
     assert pt_dtype in pt_types, f"{pt_dtype} Tensorflow equivelant not defined"
 
@@ -52,7 +60,7 @@ def flatten_inputs(inputs, names=None, force_float32=False):
     new_names = []
     flattened_name_map = {}
 
-    if isinstance(inputs, (torch.Tensor, tf.Tensor, Tensor)):
+    if isinstance(inputs, (torch.Tensor, Tensor)) or is_tf_tensor(inputs, include_variables=False):
         inputs = (inputs, )
 
     if names is None:
@@ -84,7 +92,7 @@ def flatten_inputs(inputs, names=None, force_float32=False):
             new_names += sub_names
             flattened_name_map[name] = sub_names
 
-        elif isinstance(inp, (torch.Tensor, tf.Tensor, Tensor)):
+        elif isinstance(inp, (torch.Tensor, Tensor)) or is_tf_tensor(inp, include_variables=False):
             new_inputs.append(inp)
             new_names.append(name)
             flattened_name_map[name] = [name]
@@ -117,7 +125,7 @@ def flatten_structured_output(outputs):
             sub_output= flatten_structured_output(sub_output,)
             new_outputs += sub_output
 
-        elif isinstance(out, (torch.Tensor, tf.Tensor, Tensor, np.ndarray)):
+        elif isinstance(out, (torch.Tensor, Tensor, np.ndarray)) or is_tf_tensor(out, include_variables=False):
             new_outputs.append(out)
 
         elif out is None:
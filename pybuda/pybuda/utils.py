@@ -13,6 +13,7 @@ import numpy as np
 import hashlib
 import getpass
 import os
+import resource
 import shutil
 import sys
 import subprocess
@@ -184,6 +185,13 @@ def detach_tensors(tensors: List[torch.Tensor], fix_non_contiguos: bool = False)
 
     return detached_tensors
 
+def get_peak_rss_mb() -> float:
+    """ Peak resident set size of this process so far, in MB """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, and in kilobytes everywhere else
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
 def get_pybuda_git_hash() -> Optional[str]:
     try:
         git_hash = (
@@ -11,8 +11,8 @@ import queue
 
 from loguru import logger
 from pybuda.tvm_utils import map_tf_dtype_to_pt, flatten_inputs
+from pybuda.lazy_imports import tf, is_loaded, is_tf_module
 import torch
-import tensorflow as tf
 
 import pybuda
 from pybuda import Module
@@ -102,7 +102,7 @@ def _generate_random_inputs(input_shapes: List[Tuple], input_params: List[Dict],
                 if "dev_data_format" in input_params[i]:
                     dev_data_format = input_params[i]["dev_data_format"]
 
-            if type(dtype) == tf.DType:
+            if is_loaded("tensorflow") and type(dtype) == tf.DType:
                 dtype = map_tf_dtype_to_pt(dtype)
 
             if dtype in [torch.int8, torch.int, torch.int64]:
@@ -277,7 +277,7 @@ def _create_devices(modules: List[Module], device_types: List[str], module_to_de
                     if isinstance(m, torch.nn.Module):
                         opt_klass = torch.optim.SGD
                         return opt_klass(m.parameters(), lr=lr)
-                    elif isinstance(m, (tf.keras.Model, tf.keras.layers.Layer)):
+                    elif is_tf_module(m):
                         opt_klass = tf.keras.optimizers.legacy.SGD
                         return opt_klass(lr=lr)
                     else:
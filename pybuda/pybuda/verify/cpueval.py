@@ -9,13 +9,13 @@ from typing import Tuple, Dict, List
 
 from loguru import logger
 import torch
-import tensorflow as tf
 
 from ..tensor import to_pt_tensors
 from ..pybudaglobal import get_devices
 from ..utils import detach_tensors
 import pybuda
 from pybuda.tvm_utils import map_tf_dtype_to_pt, map_pt_dtype_to_tf
+from pybuda.lazy_imports import tf
 
 def cpueval_inference(
         inputs: List[Tuple[torch.Tensor, ...]], 
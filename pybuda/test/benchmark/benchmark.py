@@ -13,7 +13,7 @@ import socket
 import pybuda
 import torch
 
-from benchmark.common import get_models, df_from_str, mf_from_str, trace_from_str
+from benchmark.common import get_models, df_from_str, mf_from_str, trace_from_str, IterationRecorder, RESULT_SCHEMA_VERSION, compare_results, load_results
 from pybuda._C.backend_api import BackendDevice, BackendType
 
 # Resolve imports for functional models
@@ -44,7 +44,7 @@ import benchmark.models.yolo_v3
 import benchmark.models.yolo_v5
 
 
-def single_thread_generative_model_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, first_current_index, pad_token_id, write_index):
+def single_thread_generative_model_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, first_current_index, pad_token_id, write_index, recorder):
     print("Executing in single-threaded generative model mode")
 
     if args.training:
@@ -61,6 +61,7 @@ def single_thread_generative_model_run(args, first_device, last_device, inputs,
 
     print_start_info()
 
+    recorder.start()
     start_time = time.time()
 
     first_device.set_active_subgraph(0)
@@ -79,16 +80,20 @@ def single_thread_generative_model_run(args, first_device, last_device, inputs,
             first_device.set_active_subgraph(1)
             generate_inputs = (decoder_input_ids, decoder_attention_mask, encoder_last_hidden_state, encoder_attention_mask)
             first_device.push_to_inputs(generate_inputs)
+            recorder.input_pushed()
             pybuda.run_generate(input_count=args.loop_count, write_index=write_index)
             ans = output_q.get()
+            recorder.output_received()
         else:
             if current_token_index == 1:
                 start_time1 = time.time()
             first_device.set_active_subgraph(2)
             generate_inputs = (decoder_input_ids, decoder_attention_mask, encoder_attention_mask)
             first_device.push_to_inputs(generate_inputs)
+            recorder.input_pushed()
             pybuda.run_generate(input_count=args.loop_count, write_index=write_index)
             ans = output_q.get()
+            recorder.output_received()
 
         if is_text_inputs or current_token_index < 2:
             current_token_index += 1
@@ -113,35 +118,89 @@ def single_thread_generative_model_run(args, first_device, last_device, inputs,
             decoder_attention_mask[0, first_current_index + (current_token_index % TILE_DIM)] = 1
 
     end_time = time.time()
+    recorder.stop()
 
     return start_time, start_time1, end_time
 
-def single_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate):
+def single_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, recorder):
     print("Executing in single-threaded mode")
 
     if args.training:
         assert False, "Training currently not supported in single-threaded mode"
 
+    def run_iteration(record: bool):
+        first_device.push_to_inputs(inputs)
+        if record:
+            recorder.input_pushed()
+        if num_tokens_to_generate:
+            pybuda.run_generate(input_count=1, write_index=0)
+        else:
+            pybuda.run_forward(input_count=1)
+        output_q.get()
+        if record:
+            recorder.output_received()
+
+    # Each iteration is a round-trip of one input, so latencies aren't affected by queueing
+    if not num_tokens_to_generate and args.warmup_count > 0:
+        print(f"Running {args.warmup_count} warm-up iterations")
+        for _ in range(args.warmup_count):
+            run_iteration(record=False)
+
     print_start_info()
 
+    recorder.start()
     start_time = time.time()
 
-    if num_tokens_to_generate:
-        for _ in range(num_tokens_to_generate):
-            first_device.push_to_inputs(inputs)
-            pybuda.run_generate(input_count=args.loop_count, write_index=0)
-            output_q.get()
-    else:
-        first_device.push_to_inputs(inputs)
-        pybuda.run_forward(input_count=args.loop_count)
-        output_q.get()
+    for _ in range(num_tokens_to_generate if num_tokens_to_generate else args.loop_count):
+        run_iteration(record=True)
 
     end_time = time.time()
+    recorder.stop()
 
     return start_time, end_time
 
 
-def multi_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate):
+def get_output(output_q) -> bool:
+    """
+    Wait for the next output, returning False if pybuda raised an error in the meantime
+    """
+    while True:
+        try:
+            output_q.get(timeout=1)
+            return True
+        except queue.Empty as _:
+            if pybuda.error_raised():
+                return False
+
+
+def warmup_run(args, first_device, last_device, inputs, targets, output_q):
+    """
+    Run warm-up iterations through the pipeline and wait for all of their outputs, before timing starts
+    """
+    print(f"Running {args.warmup_count} warm-up iterations")
+    assert args.warmup_count % args.microbatch_count == 0, "warmup_count must be a multiple of microbatch_count"
+    for _ in range(args.warmup_count):
+        first_device.push_to_inputs(inputs)
+        if args.training:
+            last_device.push_to_target_inputs(targets)
+
+    if args.training:
+        for _ in range(args.warmup_count // args.microbatch_count):
+            pybuda.run_forward(input_count=args.microbatch_count)
+            pybuda.run_backward(input_count=args.microbatch_count)
+    else:
+        pybuda.run_forward(input_count=args.warmup_count)
+
+    for _ in range(args.warmup_count):
+        if not get_output(output_q):
+            print(" * Aborting warm-up due to error")
+            return
+
+    if args.training:
+        pybuda.sync() # wait for the last backward to finish
+
+
+def multi_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, recorder):
     print("Executing in multi-threaded mode")
     
     #import pdb; pdb.set_trace()
@@ -156,6 +215,7 @@ def multi_thread_run(args, first_device, last_device, inputs, targets, output_q,
                 print(" * Aborting input thread due to error")
                 return
             first_device.push_to_inputs(inputs)
+            recorder.input_pushed()
             if args.training:
                 last_device.push_to_target_inputs(targets)
 
@@ -165,14 +225,10 @@ def multi_thread_run(args, first_device, last_device, inputs, targets, output_q,
     def pop_outputs_thread(output_q):
         loop_count = num_tokens_to_generate if num_tokens_to_generate else args.loop_count
         for _ in range(loop_count):
-            while True:
-                try:
-                    output_q.get(timeout=1)
-                    break # got data, break out of forever loop
-                except queue.Empty as _:
-                    if pybuda.error_raised():
-                        print(" * Aborting output thread due to error")
-                        return
+            if not get_output(output_q):
+                print(" * Aborting output thread due to error")
+                return
+            recorder.output_received()
 
     #
     # Define input and output threads
@@ -180,21 +236,26 @@ def multi_thread_run(args, first_device, last_device, inputs, targets, output_q,
     input_thread = threading.Thread(target=push_inputs_thread)
     output = output_q if not args.training else pybuda.get_loss_queue()
     output_thread = threading.Thread(target=pop_outputs_thread, args=(output, ))
-    output_thread.start()
 
     #
     # Sync - Make sure all process setup, compile, etc. is done
     #
     pybuda.sync()
 
+    if args.warmup_count > 0 and not num_tokens_to_generate:
+        warmup_run(args, first_device, last_device, inputs, targets, output)
+
     #
     # Run
     #
+    output_thread.start()
     input_thread.start()
-    time.sleep(2) # Let the input thread start up and transfer initial data, reaching something like "steady state"
+    if args.warmup_count == 0:
+        time.sleep(2) # Let the input thread start up and transfer initial data, reaching something like "steady state"
 
     print_start_info()
 
+    recorder.start()
     start_time = time.time()
     
     if args.training:
@@ -216,6 +277,7 @@ def multi_thread_run(args, first_device, last_device, inputs, targets, output_q,
         pybuda.sync() # wait for the last backward to finish
 
     end_time = time.time()
+    recorder.stop()
     
     return start_time, end_time
 
@@ -258,10 +320,17 @@ def run(
 
     assert args.arch
     arch = BackendDevice.from_string(args.arch) 
-    devtype = BackendType.from_string(args.device.title()) if args.device else None
+    devtype = BackendType.from_string(args.device.title()) if args.device and args.device != "cpu" else None
 
     assert "tt" in duts
-    if args.save_tti:
+    if args.device == "cpu":
+        # Run the model on host, so the harness can be used without silicon
+        if not isinstance(duts["tt"], pybuda.PyTorchModule):
+            raise RuntimeError("--device cpu requires a model whose 'tt' module is a PyTorchModule")
+        if args.save_tti or args.load_tti:
+            raise RuntimeError("--device cpu can't be combined with --save_tti or --load_tti")
+        tt = pybuda.CPUDevice("tt0", module=duts["tt"])
+    elif args.save_tti:
         tt = pybuda.TTDevice("tt0", module=duts["tt"], fp32_fallback=df_from_str(args.dataformat), num_chips=args.chips, arch=arch, devtype=devtype)
     elif args.load_tti:
         img = pybuda.TTDeviceImage.load_from_disk(args.load_tti)
@@ -327,10 +396,10 @@ def run(
     if num_tokens_to_generate:
         args.loop_count = 1
 
-    if args.chips == 0:
+    if args.chips == 0 and args.device != "cpu":
         args.chips = len(pybuda.detect_available_devices())
-    if args.chips == 0:
-        raise RuntimeError("No tenstorrent devices found.")
+        if args.chips == 0:
+            raise RuntimeError("No tenstorrent devices found.")
 
     if args.loop_count == 0:
         args.loop_count = 1 if args.perf_analysis else 15 * args.microbatch_count * (args.chips + len(duts) - 1)
@@ -343,7 +412,10 @@ def run(
     # the one being used with api calls like pybuda.run_forward(..). We'll fetch
     # the arch from the first device-type available
     device_list = pybuda.detect_available_devices()
-    arch = device_list[0] if len(device_list) > 0 else tt.arch
+    if args.device == "cpu":
+        arch = "cpu"
+    else:
+        arch = device_list[0] if len(device_list) > 0 else tt.arch
 
     #
     # Compile, and start
@@ -354,19 +426,28 @@ def run(
 
     output_q = pybuda.initialize_pipeline(training=args.training, sample_inputs=compile_inputs, microbatch_count=args.microbatch_count, _verify_cfg=pybuda.VerifyConfig.disabled(), sample_targets=targets)
 
+    if args.device == "golden" and not args.single_thread:
+        print("Golden backend runs the pipeline sequentially, switching to single-threaded mode")
+        args.single_thread = True
+
+    if num_tokens_to_generate and args.warmup_count > 0:
+        print("Warm-up iterations aren't supported for generative models, skipping them")
+
+    recorder = IterationRecorder(samples_per_output=args.loop_count * args.microbatch if num_tokens_to_generate else args.microbatch, throughput_window=args.throughput_window)
     if args.single_thread:
         if args.generative:
-            start_time, start_time1, end_time = single_thread_generative_model_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, first_current_index, pad_token_id, write_index)
+            start_time, start_time1, end_time = single_thread_generative_model_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, first_current_index, pad_token_id, write_index, recorder)
         else:
-            start_time, end_time = single_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate)
+            start_time, end_time = single_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, recorder)
     else:
-        start_time, end_time = multi_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate)
+        start_time, end_time = multi_thread_run(args, first_device, last_device, inputs, targets, output_q, num_tokens_to_generate, recorder)
 
     if pybuda.error_raised():
         print("*********************************")
         print(" Error raised, aborting benchmark")
         print("*********************************")
         return {
+            "schema_version": RESULT_SCHEMA_VERSION,
             "total_time": 0,
             "total_samples": 0,
             "samples_per_sec": 0,
@@ -389,21 +470,60 @@ def run(
         total_samples = args.loop_count * args.microbatch
         print(f" Total time for {total_samples} inputs: {total_time:.4f}")
         print(f" Samples/s: {(total_samples / total_time):.1f}")
+
+    summary = recorder.summary()
+    latency, iteration, host_cpu = summary["latency_ms"], summary["iteration_ms"], summary["host_cpu"]
+    print(f" Latency ms   p50: {latency['p50']:.2f}  p90: {latency['p90']:.2f}  p99: {latency['p99']:.2f}")
+    print(f" Iteration ms p50: {iteration['p50']:.2f}  p90: {iteration['p90']:.2f}  p99: {iteration['p99']:.2f}")
+    system_percent = f"{host_cpu['system_percent']:.1f}%" if host_cpu["system_percent"] is not None else "n/a"
+    print(f" Host CPU: {host_cpu['process_percent']:.1f}% of one core by pybuda processes, {system_percent} of {host_cpu['cores']} cores overall")
     print("*****************************************************")
 
     return {
+        "schema_version": RESULT_SCHEMA_VERSION,
         "total_time": total_time,
         "total_samples": total_samples,
         "samples_per_sec": total_samples / total_time,
+        "warmup_count": args.warmup_count,
+        **summary,
         "args": vars(args),
         "arch": str(arch),
         "machine_name": socket.gethostname()
     }
 
+
+def compare_main(argv: List[str]) -> int:
+    """
+    Compare two result files, returning a non-zero exit code if any metric regressed by more than the threshold
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="benchmark.py compare", description="Compare two benchmark result files, and flag regressions")
+    parser.add_argument('baseline', help='Result json file to compare against')
+    parser.add_argument('current', help='Result json file to check for regressions')
+    parser.add_argument('--threshold', default=5.0, type=float, help='Percent by which a metric has to get worse to be flagged as a regression')
+    args = parser.parse_args(argv)
+
+    comparisons, regressions = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    if len(comparisons) == 0:
+        print("No runs found in both files")
+        return 1
+
+    for c in comparisons:
+        run = " ".join(f"{k}={v}" for k, v in c["run"].items() if v != "None")
+        flag = "REGRESSION" if c["regressed"] else ""
+        print(f"{run:<60} {c['metric']:<18} {c['baseline']:>12.2f} {c['current']:>12.2f} {c['change_percent']:>+8.1f}% {flag}")
+
+    print(f"{len(regressions)} regression(s) over {args.threshold}% in {len(comparisons)} compared metrics")
+    return 1 if len(regressions) > 0 else 0
+
 if __name__ == "__main__":
     
     import argparse
 
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        exit(compare_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description='Benchmark a model on TT hardware')
     parser.add_argument('-m', '--model', help='Model to benchmark (i.e. bert)')
     # TODO parser.add_argument('-b', '--block', help='Block within model to benchmark, if supported. (i.e. self-attention)')
@@ -414,6 +534,8 @@ if __name__ == "__main__":
     parser.add_argument('-opt', '--backend_opt_level', choices=[0, 1, 2, 3, 4], default=4, type=int, help='Set backend optimization level')
     parser.add_argument(        '--loop_count', default=32, type=int, help='Set the number of times to loop through the model. By default, it will be 5x the number of chips.')
     parser.add_argument(        '--microbatch_count', default=1, type=int, help='Set the number of times to loop within each program.')
+    parser.add_argument(        '--warmup_count', default=0, type=int, help='Number of iterations to run before timing starts. With 0, the multi-threaded run waits 2 seconds for the pipeline to fill instead.')
+    parser.add_argument(        '--throughput_window', default=1.0, type=float, help='Window, in seconds, over which throughput over time is reported.')
     parser.add_argument('-mb',  '--microbatch', default=64, type=int, help='The microbatch size to run the benchmark on. The model should set its own reasonable default if no microbatch is forced here.')
     parser.add_argument(        '--chips', default=1, type=int, help='Number of chips to run benchmark on. 0 to run on all available.')
     parser.add_argument(        '--recompute', action='store_true', help='Enable recompute in training')
@@ -426,7 +548,7 @@ if __name__ == "__main__":
     parser.add_argument(        '--load_tti', default="", type=str, help='Skip compile and load from TTI-archive configured for silicon (specify path to TTI).')
     parser.add_argument(        '--save_tti', default="", type=str, help='Save compilation for TTDevice into a TTI-archive configured for silicon to file and exit program. (speciy path to save to).')
     parser.add_argument(        '--arch', choices=['grayskull', 'wormhole', 'wormhole_b0'], default=None, help='Set arch for offline TTI compilation.')
-    parser.add_argument(        '--device', choices=['silicon', 'golden', 'model'], default=None, help='Set device.')
+    parser.add_argument(        '--device', choices=['silicon', 'golden', 'model', 'cpu'], default=None, help='Set device. "cpu" runs PyTorch models on a CPU device instead of a TT device.')
     parser.add_argument(        '--runtime_params_yaml', default=None, help='Set runtime params yaml for offline compile of WH devices.')
     parser.add_argument(        '--device-config', choices=['galaxy', 'wh_nebula_x1', 'wh_nebula_x2', 'gs_e150', 'gs_e300'], default=None, type=str, help='Runtime params yaml for offline compile of WH devices would be configured based on that.')
     parser.add_argument(        '--auto_transpose', action='store_true', help='Enable auto-transpose on placement')
@@ -501,6 +623,8 @@ if __name__ == "__main__":
     device_list = pybuda.detect_available_devices()
     if device_list:
         args.arch = device_list[0].name.lower()
+    elif args.device == "cpu" and not args.arch:
+        args.arch = "wormhole_b0" # nothing is compiled for it, but models may configure the compiler by arch
     elif not args.arch:
         raise RuntimeError("On a machine without a silicon device, --arch must be specified to save a TTI file.")
 
@@ -542,6 +666,7 @@ if __name__ == "__main__":
 
     except RuntimeError as e:
         result = {
+            "schema_version": RESULT_SCHEMA_VERSION,
             "args": vars(args),
             "samples_per_sec": 0.0,
             "error": str(e),
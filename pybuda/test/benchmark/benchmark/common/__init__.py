@@ -2,5 +2,4 @@
 
 # SPDX-License-Identifier: Apache-2.0
 from .common import get_models, df_from_str, mf_from_str, trace_from_str, benchmark_model, generate_test_device
-
-
+from .results import IterationRecorder, RESULT_SCHEMA_VERSION, compare_results, load_results
@@ -0,0 +1,189 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Per-iteration timing, host CPU utilization and the result schema of benchmark.py, and comparison of two result files.
+"""
+import json
+import math
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Bump when keys of the result are renamed or change meaning. New keys can be added without a bump.
+RESULT_SCHEMA_VERSION = 1
+
+# Keys of "args" that identify a benchmark run, used to match results of two files against each other
+RUN_KEYS = ["model", "config", "training", "microbatch", "microbatch_count", "dataformat", "math_fidelity", "chips", "device"]
+
+# Metric, and whether higher is better
+COMPARED_METRICS = [
+    ("samples_per_sec", True),
+    ("latency_ms.p50", False),
+    ("latency_ms.p99", False),
+    ("iteration_ms.p50", False),
+    ("iteration_ms.p99", False),
+]
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values
+    """
+    if len(sorted_values) == 0:
+        return 0.0
+    rank = math.ceil(p / 100.0 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if len(values) > 0 else 0.0,
+        "min": values[0] if len(values) > 0 else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1] if len(values) > 0 else 0.0,
+    }
+
+def _read_system_cpu() -> Optional[Tuple[int, int]]:
+    # (busy, total) jiffies over all cores
+    try:
+        with open("/proc/stat") as f:
+            fields = [int(v) for v in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0) # idle + iowait
+    return sum(fields) - idle, sum(fields)
+
+def _read_process_tree_cpu() -> float:
+    # CPU seconds of this process and its live children (i.e. device processes)
+    times = os.times()
+    total = times.user + times.system
+    ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    for child in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{child.pid}/stat") as f:
+                # Skip past the command name, which can contain spaces
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / ticks # utime, stime
+        except (OSError, ValueError, IndexError):
+            pass
+    return total
+
+class IterationRecorder:
+    """
+    Records when inputs are pushed and outputs are received during the timed part of a benchmark run, along with
+    host CPU time. The pipeline is in-order, so the n-th output belongs to the n-th input.
+    """
+    def __init__(self, samples_per_output: int, throughput_window: float = 1.0):
+        self.samples_per_output = samples_per_output
+        self.throughput_window = throughput_window
+        self.push_times: List[float] = []
+        self.output_times: List[float] = []
+        self.start_time = 0.0
+        self.end_time = 0.0
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._start_system_cpu = _read_system_cpu()
+        self._start_process_cpu = _read_process_tree_cpu()
+
+    def input_pushed(self):
+        self.push_times.append(time.perf_counter())
+
+    def output_received(self):
+        self.output_times.append(time.perf_counter())
+
+    def stop(self):
+        self.end_time = time.perf_counter()
+        self._end_system_cpu = _read_system_cpu()
+        self._end_process_cpu = _read_process_tree_cpu()
+
+    def latencies_ms(self) -> List[float]:
+        # From the later of the input being pushed and the timed run starting, to its output being received
+        latencies = []
+        for i, out in enumerate(self.output_times):
+            pushed = self.push_times[i] if i < len(self.push_times) else self.start_time
+            latencies.append((out - max(pushed, self.start_time)) * 1000)
+        return latencies
+
+    def iteration_ms(self) -> List[float]:
+        # Time between consecutive outputs, the first one counted from the start of the timed run
+        previous = [self.start_time] + self.output_times[:-1]
+        return [(out - prev) * 1000 for out, prev in zip(self.output_times, previous)]
+
+    def throughput_over_time(self) -> List[Dict[str, float]]:
+        if len(self.output_times) == 0 or self.throughput_window <= 0:
+            return []
+        windows = [0] * (int((self.output_times[-1] - self.start_time) / self.throughput_window) + 1)
+        for out in self.output_times:
+            windows[int((out - self.start_time) / self.throughput_window)] += 1
+        return [
+            {"time_s": i * self.throughput_window, "samples_per_sec": count * self.samples_per_output / self.throughput_window}
+            for i, count in enumerate(windows)
+        ]
+
+    def host_cpu(self) -> Dict[str, Optional[float]]:
+        wall = self.end_time - self.start_time
+        system_percent = None
+        if self._start_system_cpu is not None and self._end_system_cpu is not None:
+            busy = self._end_system_cpu[0] - self._start_system_cpu[0]
+            total = self._end_system_cpu[1] - self._start_system_cpu[1]
+            system_percent = 100.0 * busy / total if total > 0 else 0.0
+        process_percent = 100.0 * (self._end_process_cpu - self._start_process_cpu) / wall if wall > 0 else 0.0
+        return {"cores": os.cpu_count(), "process_percent": process_percent, "system_percent": system_percent}
+
+    def summary(self) -> Dict:
+        return {
+            "latency_ms": distribution(self.latencies_ms()),
+            "iteration_ms": distribution(self.iteration_ms()),
+            "throughput_over_time": self.throughput_over_time(),
+            "host_cpu": self.host_cpu(),
+        }
+
+def _get_metric(result: Dict, metric: str) -> Optional[float]:
+    value = result
+    for key in metric.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def _run_key(result: Dict) -> Tuple:
+    args = result.get("args", {})
+    return tuple(str(args.get(k)) for k in RUN_KEYS)
+
+def load_results(path: str) -> List[Dict]:
+    with open(path) as f:
+        results = json.load(f)
+    return results if isinstance(results, list) else [results]
+
+def compare_results(baseline: List[Dict], current: List[Dict], threshold: float) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Compare metrics of runs present in both lists, matched on their arguments. If a run is there more than
+    once, its last result is used. Returns all comparisons, and the ones that regressed by more than threshold percent.
+    """
+    baseline_runs = {_run_key(r): r for r in baseline if "error" not in r}
+    comparisons = []
+    for result in current:
+        key = _run_key(result)
+        if "error" in result or key not in baseline_runs:
+            continue
+        base = baseline_runs[key]
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = _get_metric(base, metric), _get_metric(result, metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = 100.0 * (new - old) / old
+            regression = -change if higher_is_better else change
+            comparisons.append({
+                "run": dict(zip(RUN_KEYS, key)),
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change_percent": change,
+                "regressed": regression > threshold,
+            })
+    return comparisons, [c for c in comparisons if c["regressed"]]
@@ -135,4 +135,27 @@ def simple_add(training: bool, config: str, microbatch: int, devtype: str, arch:
     inputs = [torch.rand(1, 1, 32, 32)]
     targets = []
 
-    return models, inputs, targets, {}
\ No newline at end of file
+    return models, inputs, targets, {}
+
+
+@benchmark_model(configs=["default"])
+def simple_linear(training: bool, config: str, microbatch: int, devtype: str, arch: str):
+    """
+    Small PyTorch model, which can also run on a CPU device (--device cpu)
+    """
+    if microbatch == 0:
+        microbatch = 1
+
+    hidden = 128
+    mod = pybuda.PyTorchModule("simple_linear", torch.nn.Sequential(
+        torch.nn.Linear(hidden, hidden), torch.nn.ReLU(), torch.nn.Linear(hidden, hidden)))
+
+    models = {"tt": mod}
+    inputs = [torch.rand(microbatch, hidden)]
+    targets = []
+
+    if training:
+        targets = [torch.rand(microbatch, hidden)]
+        models["cpu-loss"] = pybuda.PyTorchModule("l1loss", torch.nn.L1Loss())
+
+    return models, inputs, targets, {}
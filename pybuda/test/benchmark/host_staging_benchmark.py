@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure the host-side cost of preparing inputs for a direct push (format conversion, padding to tiles,
+descriptor creation) with and without the per-queue staging buffers in DirectPusherDeviceConnector.
+
+Only the host preparation is run, no device is needed. Bytes are counted with the torch profiler: every
+intermediate tensor allocated during a push is a full-size copy of (part of) the input. With staging, the input
+is written once into a recycled buffer, which doesn't show up as an allocation: add one input size of copying
+to the "after" column.
+
+Run from the repository root:
+
+    pybuda/test/benchmark/host_staging_benchmark.py --iterations 50
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import torch
+
+sys.path.insert(1, "pybuda")
+
+from pybuda import Tensor
+from pybuda._C import DataFormat
+from pybuda._C.graph import RuntimeTensorTransform
+from pybuda.device_connector import DirectPusherDeviceConnector
+
+# name: (shape, torch dtype, queue data format)
+INPUTS = {
+    "bert_act_fp32_to_bf16": ((64, 384, 1024), torch.float32, DataFormat.Float16_b),
+    "bert_act_fp32_to_fp16": ((64, 384, 1024), torch.float32, DataFormat.Float16),
+    "resnet_act_unaligned": ((64, 3, 224, 224), torch.float32, DataFormat.Float16_b),
+    "llm_tokens_int32": ((64, 1, 1, 2047), torch.int32, DataFormat.Int32),
+}
+
+def make_connector(q_format, staging, microbatch):
+    connector = DirectPusherDeviceConnector(None, sequential=True, microbatch=microbatch)
+    connector.enable_staging = staging
+    # Only the data format of the destination queue is used on the host side
+    connector.set_dram_io_push_queues([SimpleNamespace(data_format=q_format)], [[]], [RuntimeTensorTransform()])
+    return connector
+
+def bytes_allocated(f):
+    with torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU], profile_memory=True) as prof:
+        f()
+    return sum(e.cpu_memory_usage for e in prof.events() if e.cpu_memory_usage > 0)
+
+def benchmark_input(shape, dtype, q_format, iterations):
+    if dtype.is_floating_point:
+        value = torch.rand(shape, dtype=dtype)
+    else:
+        value = torch.randint(0, 32000, shape, dtype=dtype)
+    tensor = Tensor.create_from_torch(value)
+    results = {}
+    for mode, staging in [("before", False), ("after", True)]:
+        connector = make_connector(q_format, staging, microbatch=shape[0])
+        push = lambda: connector._prepare_push_tensors([tensor])
+        push(); push() # warm up both staging buffers
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            push()
+        elapsed = (time.perf_counter() - start) / iterations
+
+        results[mode] = (elapsed, bytes_allocated(push))
+    return value.numel() * value.element_size(), results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark host-side input staging for direct pushes")
+    parser.add_argument("--iterations", type=int, default=20, help="Number of timed pushes per input")
+    parser.add_argument("--inputs", nargs="*", default=list(INPUTS.keys()), choices=list(INPUTS.keys()), help="Inputs to run")
+    args = parser.parse_args()
+
+    if "PYBUDA_DISABLE_HOST_STAGING" in os.environ:
+        print("Note: PYBUDA_DISABLE_HOST_STAGING is set, but this benchmark toggles staging itself")
+
+    print(f"{'input':<24} {'input MB':>9} {'before ms':>10} {'after ms':>9} {'before MB/push':>15} {'after MB/push':>14}")
+    for name in args.inputs:
+        input_bytes, results = benchmark_input(*INPUTS[name], args.iterations)
+        (before_s, before_bytes), (after_s, after_bytes) = results["before"], results["after"]
+        mb = 1024 * 1024
+        print(f"{name:<24} {input_bytes / mb:>9.1f} {before_s * 1000:>10.2f} {after_s * 1000:>9.2f} {before_bytes / mb:>15.1f} {after_bytes / mb:>14.1f}")
+
+if __name__ == "__main__":
+    main()
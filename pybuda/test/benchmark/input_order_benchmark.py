@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure how long it takes to record the input order of a generated module, for a decoder with a KV cache.
+
+The inputs are the token ids, the attention mask, and a key and a value tensor per layer. The past cache is
+zero-initialized, as it is at the start of generation, so most inputs hold identical values. Matching inputs by
+value is quadratic in the number of inputs and reads every byte of every pair. It also maps all of the
+zero-filled inputs onto the same position.
+
+    pybuda/test/benchmark/input_order_benchmark.py --layers 32 --seq-len 1024
+"""
+import argparse
+import json
+import sys
+import time
+
+import torch
+
+sys.path.insert(1, "pybuda")
+
+from pybuda.tvm_to_python import get_input_indices
+
+def decoder_inputs(layers, heads, seq_len, head_dim):
+    inputs = [torch.randint(0, 32000, (1, 1)), torch.ones((1, seq_len + 1))]
+    for _ in range(layers):
+        inputs.append(torch.zeros((1, heads, seq_len, head_dim)))
+        inputs.append(torch.zeros((1, heads, seq_len, head_dim)))
+    return inputs
+
+def get_input_indices_by_value(inputs, sorted_inputs):
+    """ Previous behaviour: compare every pair of inputs by value """
+    input_indices = {}
+    for index, unsorted_input in enumerate(inputs):
+        for sorted_index, sorted_input in enumerate(sorted_inputs):
+            if sorted_input.dtype == unsorted_input.dtype and torch.equal(sorted_input, unsorted_input):
+                input_indices[index] = sorted_index
+    return input_indices
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark input order reconstruction for a many-input decoder")
+    parser.add_argument("--layers", type=int, default=32, help="Number of decoder layers, each with a key and a value cache input")
+    parser.add_argument("--heads", type=int, default=16, help="Number of attention heads")
+    parser.add_argument("--seq-len", type=int, default=512, help="Past cache sequence length")
+    parser.add_argument("--head-dim", type=int, default=64, help="Attention head size")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output json file to write results to")
+    args = parser.parse_args()
+
+    inputs = decoder_inputs(args.layers, args.heads, args.seq_len, args.head_dim)
+    sorted_inputs = list(inputs)
+    expected = {index: index for index in range(len(inputs))}
+
+    results = {"num_inputs": len(inputs)}
+    start = time.perf_counter()
+    by_value = get_input_indices_by_value(inputs, sorted_inputs)
+    results["by_value_s"] = time.perf_counter() - start
+    results["by_value_correct"] = by_value == expected
+
+    start = time.perf_counter()
+    by_identity = get_input_indices(inputs, sorted_inputs)
+    results["by_identity_s"] = time.perf_counter() - start
+    results["by_identity_correct"] = by_identity == expected
+
+    for key, value in results.items():
+        print(f"{key:24}{value}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
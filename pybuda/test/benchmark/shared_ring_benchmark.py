@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure inference throughput of a multi-process pipeline with tensors sent between processes through the
+shared-memory tensor rings, and pickled through multiprocessing queues (PYBUDA_DISABLE_SHARED_TENSOR_RING).
+
+The default pipeline is CPU -> TT -> CPU, where the ring carries the inputs pushed by the user into the first
+CPU device. The "cpu-cpu" pipeline doesn't need a device, and also sends activations between the two CPU
+processes through a ring. Each transport runs in its own process, since the pipeline is set up once per process.
+
+    pybuda/test/benchmark/shared_ring_benchmark.py --pipeline cpu-tt-cpu --loop-count 256 --hidden 1024
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import torch
+
+sys.path.insert(1, "pybuda")
+
+TRANSPORTS = ["ring", "queue"]
+
+class Linear(torch.nn.Module):
+    def __init__(self, hidden):
+        super().__init__()
+        self.linear = torch.nn.Linear(hidden, hidden)
+
+    def forward(self, x):
+        return self.linear(x)
+
+class Identity(torch.nn.Module):
+    def forward(self, x):
+        return x
+
+def run_transport(args):
+    import pybuda
+
+    pybuda.set_configuration_options(default_df_override=pybuda.DataFormat.Float16_b)
+    cpu_pre = pybuda.CPUDevice("cpu-pre", module=pybuda.PyTorchModule("pre", Linear(args.hidden)))
+    if args.pipeline == "cpu-tt-cpu":
+        tt0 = pybuda.TTDevice("tt0")
+        tt0.place_module(pybuda.PyTorchModule("tt", Linear(args.hidden)))
+    pybuda.CPUDevice("cpu-post", module=pybuda.PyTorchModule("post", Identity()))
+
+    inputs = [torch.rand(args.microbatch, args.seq_len, args.hidden) for _ in range(args.loop_count)]
+    output_q = pybuda.initialize_pipeline(training=False, sample_inputs=(inputs[0],))
+
+    # Warm up, so that ring allocation isn't part of the measurement
+    for t in inputs[:args.warmup]:
+        cpu_pre.push_to_inputs((t,))
+    pybuda.run_forward(input_count=args.warmup)
+    for _ in range(args.warmup):
+        output_q.get(timeout=120)
+
+    start = time.perf_counter()
+    for t in inputs:
+        cpu_pre.push_to_inputs((t,))
+        pybuda.run_forward(input_count=1)
+    for _ in inputs:
+        output_q.get(timeout=120)
+    elapsed = time.perf_counter() - start
+
+    pybuda.shutdown()
+    input_mb = inputs[0].numel() * inputs[0].element_size() / (1024 * 1024)
+    return {"elapsed_s": elapsed, "inputs_per_s": args.loop_count / elapsed, "input_mb": input_mb, "mb_per_s": input_mb * args.loop_count / elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared-memory tensor rings against pickling through queues")
+    parser.add_argument("--pipeline", choices=["cpu-tt-cpu", "cpu-cpu"], default="cpu-tt-cpu", help="Devices in the pipeline")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=None, help="Run only this transport, in this process")
+    parser.add_argument("--loop-count", type=int, default=128, help="Number of timed inputs")
+    parser.add_argument("--warmup", type=int, default=8, help="Number of inputs run before timing")
+    parser.add_argument("--microbatch", type=int, default=64, help="Microbatch size")
+    parser.add_argument("--seq-len", type=int, default=128, help="Second dimension of each input")
+    parser.add_argument("--hidden", type=int, default=768, help="Hidden size of each input")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output json file to write results to")
+    args = parser.parse_args()
+
+    if args.transport is not None:
+        if args.transport == "queue":
+            os.environ["PYBUDA_DISABLE_SHARED_TENSOR_RING"] = "1"
+        else:
+            os.environ.pop("PYBUDA_DISABLE_SHARED_TENSOR_RING", None)
+        result = run_transport(args)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=4)
+        else:
+            print(json.dumps(result))
+        return
+
+    results = {}
+    for transport in TRANSPORTS:
+        cmd = [
+            sys.executable, __file__, "--transport", transport, "--pipeline", args.pipeline,
+            "--loop-count", str(args.loop_count), "--warmup", str(args.warmup), "--microbatch", str(args.microbatch),
+            "--seq-len", str(args.seq_len), "--hidden", str(args.hidden),
+        ]
+        out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+        results[transport] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{'transport':<10} {'inputs/s':>10} {'MB/s':>10} {'elapsed s':>10}")
+    for transport, result in results.items():
+        print(f"{transport:<10} {result['inputs_per_s']:>10.1f} {result['mb_per_s']:>10.1f} {result['elapsed_s']:>10.2f}")
+    results["speedup"] = results["ring"]["inputs_per_s"] / results["queue"]["inputs_per_s"]
+    print(f"speedup {results['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
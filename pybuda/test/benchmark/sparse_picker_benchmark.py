@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark of the sparse picker builders used by conv/pool decompose, comparing the original per-element
+implementations (kept in test/test_sparse_utils.py) against the vectorized ones in op/eval/sparse_utils.py.
+
+Run from the repository root:
+
+    pybuda/test/benchmark/sparse_picker_benchmark.py --repeat 3
+"""
+import argparse
+import sys
+import time
+
+import torch
+
+sys.path.insert(1, "pybuda")
+
+from pybuda.op.eval.sparse_utils import (
+    create_conv2d_sparse_picker_matrix,
+    get_sparse_picker_matrix_max_span,
+    num_sparse_tiles_in_strip,
+    sparse_coo_zslices,
+)
+from test.test_sparse_utils import (
+    conv_pickers,
+    reference_create_conv2d_sparse_picker_matrix,
+    reference_get_sparse_picker_matrix_max_span,
+    reference_num_sparse_tiles_in_strip,
+    reference_sparse_coo_zslices,
+)
+
+# iH, iW, kH, kW, stride, padding, dilation
+SHAPES = {
+    "resnet_3x3_56": (56, 56, 3, 3, 1, 1, 1),
+    "resnet_7x7_224": (224, 224, 7, 7, 2, 3, 1),
+    "unet_3x3_256": (256, 256, 3, 3, 1, 1, 1),
+    "yolo_3x3_512": (512, 512, 3, 3, 1, 1, 1),
+    "yolo_3x3_s2_512": (512, 512, 3, 3, 2, 1, 1),
+}
+
+def _time(f, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# Time the builder itself, not the picker matrix cache in front of it
+build_conv2d_sparse_picker_matrix = create_conv2d_sparse_picker_matrix.__wrapped__
+
+def benchmark_shape(shape, repeat):
+    reference = conv_pickers(reference_create_conv2d_sparse_picker_matrix, *shape)
+    sparse = conv_pickers(create_conv2d_sparse_picker_matrix, *shape)
+    assert torch.equal(reference.coalesce().indices(), sparse.coalesce().indices())
+
+    zslice = sparse[0][0]
+    cases = {
+        "conv2d_picker": (
+            lambda: conv_pickers(reference_create_conv2d_sparse_picker_matrix, *shape),
+            lambda: conv_pickers(build_conv2d_sparse_picker_matrix, *shape),
+        ),
+        "conv2d_picker (cached)": (
+            lambda: conv_pickers(reference_create_conv2d_sparse_picker_matrix, *shape),
+            lambda: conv_pickers(create_conv2d_sparse_picker_matrix, *shape),
+        ),
+        "zslices (create_sparse_buda)": (
+            lambda: reference_sparse_coo_zslices(sparse),
+            lambda: sparse_coo_zslices(sparse),
+        ),
+        "num_sparse_tiles_in_strip": (
+            lambda: reference_num_sparse_tiles_in_strip(zslice),
+            lambda: num_sparse_tiles_in_strip(zslice),
+        ),
+        "max_span": (
+            lambda: reference_get_sparse_picker_matrix_max_span(sparse),
+            lambda: get_sparse_picker_matrix_max_span(sparse),
+        ),
+    }
+    return {name: (_time(old, repeat), _time(new, repeat)) for name, (old, new) in cases.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sparse picker matrix builders")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed repetitions, best is reported")
+    parser.add_argument("--shapes", nargs="*", default=list(SHAPES.keys()), choices=list(SHAPES.keys()), help="Conv shapes to run")
+    args = parser.parse_args()
+
+    print(f"{'shape':<18} {'builder':<30} {'old (s)':>10} {'new (s)':>10} {'speedup':>8}")
+    for name in args.shapes:
+        for builder, (old, new) in benchmark_shape(SHAPES[name], args.repeat).items():
+            print(f"{name:<18} {builder:<30} {old:>10.4f} {new:>10.4f} {old / max(new, 1e-9):>7.1f}x")
+
+if __name__ == "__main__":
+    main()
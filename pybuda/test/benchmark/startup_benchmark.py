@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure `import pybuda` startup cost for a PyTorch-only process: wall-clock import time, peak RSS
+and which optional frameworks ended up loaded. Each sample runs in a fresh interpreter.
+
+    pybuda/test/benchmark/startup_benchmark.py --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+FRAMEWORKS = ["tensorflow", "mxnet", "jax", "jaxlib", "onnx", "onnxruntime", "transformers"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import torch
+torch_done = time.perf_counter()
+import pybuda
+end = time.perf_counter()
+print(json.dumps({
+    "torch_import_s": torch_done - start,
+    "pybuda_import_s": end - torch_done,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded_frameworks": [m for m in %r if m in sys.modules],
+}))
+""" % (FRAMEWORKS, )
+
+def run_once():
+    out = subprocess.check_output([sys.executable, "-c", PROBE], text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pybuda import time and memory for a PyTorch-only process")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to sample")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output json file to write results to")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    result = {
+        "runs": args.runs,
+        "torch_import_s": statistics.median(s["torch_import_s"] for s in samples),
+        "pybuda_import_s": statistics.median(s["pybuda_import_s"] for s in samples),
+        "max_rss_mb": statistics.median(s["max_rss_mb"] for s in samples),
+        "loaded_frameworks": samples[-1]["loaded_frameworks"],
+    }
+
+    print(f"torch import:   {result['torch_import_s']:.3f}s")
+    print(f"pybuda import:  {result['pybuda_import_s']:.3f}s (on top of torch)")
+    print(f"peak RSS:       {result['max_rss_mb']:.1f} MB")
+    print(f"frameworks:     {', '.join(result['loaded_frameworks']) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=4)
+
+if __name__ == "__main__":
+    main()
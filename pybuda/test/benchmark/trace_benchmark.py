@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compare pybuda_compile time and peak RSS of a full trace (reference values evaluated for every op) against
+a shapes-only trace (CompilerConfig.trace_shapes_only), on stacks of BERT encoders sized like real models.
+Golden outputs are read separately after the compile, since that is where a shapes-only trace pays for its values.
+Each mode runs in a fresh interpreter so peak RSS is not polluted by the other.
+
+Run from the repository root:
+
+    pybuda/test/benchmark/trace_benchmark.py --models bert_large
+    pybuda/test/benchmark/trace_benchmark.py --models falcon_7b --layers 4 --compile-depth generate_initial_graph
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+sys.path.insert(1, "pybuda")
+
+# hidden, heads, seq_len, layers
+MODELS = {
+    "bert_large": (1024, 16, 384, 24),
+    "falcon_7b": (4544, 71, 128, 32),
+}
+
+def trace(hidden_dim, num_heads, seq_len, layers, shapes_only, compile_depth):
+    import math
+    import resource
+    import time
+
+    import torch
+
+    from pybuda import TTDevice, Tensor, CompilerConfig, BackendType, CompileDepth, VerifyConfig, pybuda_compile
+    from test.bert.modules import PyBudaBertEncoder, get_bert_parameters
+
+    dev = TTDevice("tt0", devtype=BackendType.Golden)
+    param_bytes = 0
+    for encoder_index in range(layers):
+        params = get_bert_parameters("encoder", hidden_dim=hidden_dim, encoder_index=encoder_index)
+        for name, p in params.items():
+            if name.startswith("reciprocal_of_sqrt_of_head_size"):
+                p.set_value(torch.full((1, 1, 1, 1), 1 / math.sqrt(hidden_dim // num_heads)))
+            else:
+                p.set_value(torch.rand(p.shape.get_pytorch_shape()) * 0.02)
+            param_bytes += p.value().numel() * p.value().element_size()
+        config = {"num_heads": num_heads, "encoder_index": encoder_index, "passthrough_attn_mask": encoder_index != layers - 1}
+        dev.place_module(PyBudaBertEncoder(f"encoder{encoder_index}", params, config))
+
+    inputs = (
+        Tensor.create_from_torch(torch.rand(1, 1, seq_len, hidden_dim)),
+        Tensor.create_from_torch(torch.zeros(1, 1, 1, seq_len)),
+    )
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    compiler_cfg = CompilerConfig(
+        enable_training=False,
+        trace_shapes_only=shapes_only,
+        compile_depth=CompileDepth.from_json(compile_depth),
+    )
+    start = time.perf_counter()
+    results = pybuda_compile(dev, "trace_benchmark", *inputs, compiler_cfg=compiler_cfg, verify_cfg=VerifyConfig.disabled())
+    compile_s = time.perf_counter() - start
+    rss_compile = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # Reading the goldens is what verification would do
+    start = time.perf_counter()
+    results.golden_outputs
+    golden_s = time.perf_counter() - start
+    rss_golden = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return {
+        "compile_s": compile_s,
+        "golden_s": golden_s,
+        "param_mb": param_bytes / (1024 * 1024),
+        "max_rss_before_compile_mb": rss_before,
+        "max_rss_after_compile_mb": rss_compile,
+        "max_rss_after_golden_mb": rss_golden,
+    }
+
+def run_mode(model, layers, shapes_only, compile_depth):
+    cmd = [sys.executable, __file__, "--child", model, "--layers", str(layers), "--compile-depth", compile_depth]
+    if shapes_only:
+        cmd.append("--shapes-only")
+    out = subprocess.check_output(cmd, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiles with full vs shapes-only graph tracing")
+    parser.add_argument("--models", nargs="*", default=list(MODELS.keys()), choices=list(MODELS.keys()), help="Model sizes to run")
+    parser.add_argument("--layers", type=int, default=None, help="Override number of encoder layers")
+    parser.add_argument("--compile-depth", type=str, default="full", help="CompileDepth to stop the compile at")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--shapes-only", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output json file to write results to")
+    args = parser.parse_args()
+
+    if args.child is not None:
+        hidden_dim, num_heads, seq_len, layers = MODELS[args.child]
+        print(json.dumps(trace(hidden_dim, num_heads, seq_len, args.layers or layers, args.shapes_only, args.compile_depth)))
+        return
+
+    results = {}
+    print(f"{'model':<12} {'mode':<12} {'compile (s)':>12} {'golden (s)':>11} {'params MB':>10} {'compile RSS MB':>15} {'peak RSS MB':>12}")
+    for model in args.models:
+        layers = args.layers or MODELS[model][3]
+        results[model] = {}
+        for mode, shapes_only in [("full", False), ("shapes_only", True)]:
+            r = run_mode(model, layers, shapes_only, args.compile_depth)
+            results[model][mode] = r
+            compile_rss = r["max_rss_after_compile_mb"] - r["max_rss_before_compile_mb"]
+            print(f"{model:<12} {mode:<12} {r['compile_s']:>12.2f} {r['golden_s']:>11.2f} {r['param_mb']:>10.0f} {compile_rss:>15.0f} {r['max_rss_after_golden_mb']:>12.0f}")
+
+        full, lazy = results[model]["full"], results[model]["shapes_only"]
+        print(f"{model:<12} compile time {full['compile_s'] / max(lazy['compile_s'], 1e-9):.1f}x faster, "
+              f"compile RSS {full['max_rss_after_compile_mb'] - lazy['max_rss_after_compile_mb']:.0f} MB lower")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure cold-start (nothing extracted yet) and warm-start (extracted directory is current) load time of a TTI image.
+
+With --tti, a real image is loaded through TTDeviceImage.load_from_disk and all of its post-consteval tensors are
+materialized. Without it, a synthetic image of --size-gb pickled tensors is written with TTIArchiveWriter and
+loaded through the archive index, and compared against extracting everything and reading tensors from files.
+
+    pybuda/test/benchmark/tti_load_benchmark.py --size-gb 4
+    pybuda/test/benchmark/tti_load_benchmark.py --tti device_images/bert.tti
+
+Note that "cold" here only means that the image hasn't been extracted; the OS page cache is not dropped.
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+
+import torch
+
+sys.path.insert(1, "pybuda")
+
+from pybuda.tti.archive import TTIArchive, TTIArchiveWriter, TTDeviceImageJsonDecoder
+
+def _time(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+def write_synthetic_image(path, size_gb, tensor_mb):
+    numel = tensor_mb * 1024 * 1024 // 4
+    num_tensors = max(1, int(size_gb * 1024 // tensor_mb))
+    names = {}
+    writer = TTIArchiveWriter(path, TTIArchive.TTI_UNZIPPED_DIR_NAME, num_threads=os.cpu_count() or 1)
+    writer.add_directory("tensors")
+    for i in range(num_tensors):
+        name = f"tensors/torch.Tensor.param_{i}.pkl"
+        writer.submit(name, lambda: pickle.dumps(torch.rand(numel), pickle.HIGHEST_PROTOCOL))
+        names[f"param_{i}"] = name
+    writer.add_bytes("device.json", json.dumps(names).encode("utf-8"))
+    writer.close()
+    return names
+
+def load_extract_all(path, directory):
+    """ Previous behaviour: extract the whole archive, then read each tensor back from its file """
+    with tarfile.open(path) as tar:
+        tar.extractall(directory)
+    with open(os.path.join(directory, TTIArchive.TTI_UNZIPPED_DIR_NAME, "device.json")) as f:
+        d = json.load(f)
+    return TTDeviceImageJsonDecoder.postprocess_keys(d, os.path.join(directory, TTIArchive.TTI_UNZIPPED_DIR_NAME))
+
+def load_indexed(path, directory, index=None):
+    unzipped_tti_directory = os.path.join(directory, TTIArchive.TTI_UNZIPPED_DIR_NAME)
+    if index is None:
+        index = TTIArchive._extract_tti_archive(path, directory)
+    with open(os.path.join(unzipped_tti_directory, "device.json")) as f:
+        d = json.load(f)
+    return TTDeviceImageJsonDecoder.postprocess_keys(d, unzipped_tti_directory, index), index
+
+def benchmark_synthetic(size_gb, tensor_mb):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.tti")
+        results["save_s"], _ = _time(lambda: write_synthetic_image(path, size_gb, tensor_mb))
+        results["size_gb"] = os.path.getsize(path) / 1024**3
+
+        extract_dir = os.path.join(tmp, "extract_all")
+        results["extract_all_s"], _ = _time(lambda: load_extract_all(path, extract_dir))
+        shutil.rmtree(extract_dir)
+
+        indexed_dir = os.path.join(tmp, "indexed")
+        results["cold_s"], (_, index) = _time(lambda: load_indexed(path, indexed_dir))
+        results["warm_s"], _ = _time(lambda: load_indexed(path, indexed_dir, index))
+    return results
+
+def benchmark_tti(tti_path):
+    from pybuda import TTDeviceImage
+
+    def load():
+        device_image = TTDeviceImage.load_from_disk(tti_path)
+        state = device_image.compiled_graph_state
+        for name in list(state.post_const_eval_parameters.keys()):
+            state.get_parameter_tensor(name)
+        for name in list(state.post_const_eval_constants.keys()):
+            state.get_constant_tensor(name)
+
+    unzipped_tti_directory = os.path.join(os.path.dirname(os.path.realpath(tti_path)), TTIArchive.TTI_UNZIPPED_DIR_NAME)
+    shutil.rmtree(unzipped_tti_directory, ignore_errors=True)
+    results = {"size_gb": os.path.getsize(tti_path) / 1024**3}
+    results["cold_s"], _ = _time(load)
+    results["warm_s"], _ = _time(load)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm TTI image load time")
+    parser.add_argument("--tti", type=str, default=None, help="Existing TTI image to load. A synthetic image is generated if not set.")
+    parser.add_argument("--size-gb", type=float, default=2.0, help="Size of the synthetic image")
+    parser.add_argument("--tensor-mb", type=int, default=64, help="Size of each tensor in the synthetic image")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output json file to write results to")
+    args = parser.parse_args()
+
+    results = benchmark_tti(args.tti) if args.tti else benchmark_synthetic(args.size_gb, args.tensor_mb)
+    for key, value in results.items():
+        print(f"{key:16}{value:10.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
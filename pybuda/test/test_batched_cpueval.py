@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for batched (whole-microbatch) golden evaluation in TTDevice.cpueval_forward
+#
+import pytest
+import torch
+
+import pybuda
+from pybuda import PyBudaModule, TTDevice, Tensor, BackendType
+from pybuda._C.graph import eval as graph_eval
+from pybuda.op.eval.pybuda import is_batch_safe
+
+
+class BatchSafeModule(PyBudaModule):
+    def __init__(self, name):
+        super().__init__(name)
+        self.weights = pybuda.Parameter(torch.rand(64, 64), requires_grad=False)
+
+    def forward(self, act):
+        mm = pybuda.op.Matmul("mm", act, self.weights)
+        sm = pybuda.op.Softmax("sm", mm, dim=-1)
+        return pybuda.op.ReduceSum("rs", sm, dim=-2)
+
+
+class ConcatParameterModule(PyBudaModule):
+    def __init__(self, name):
+        super().__init__(name)
+        self.cls_token = pybuda.Parameter(torch.rand(1, 1, 64), requires_grad=False)
+
+    def forward(self, act):
+        return pybuda.op.Concatenate("concat", self.cls_token, act, axis=-2)
+
+
+class BatchUnsafeModule(PyBudaModule):
+    def forward(self, act):
+        return pybuda.op.Reshape("reshape", act, (1, 32, 64 * 2))
+
+
+@pytest.mark.parametrize("op_name, attrs, named_attrs, shapes, expected", [
+    ("add", (), {}, [(1, 32, 32), (1, 32, 32)], True),
+    ("matmul", (), {}, [(1, 32, 64), (64, 32)], True),
+    ("reshape", (1, 64, 32), {}, [(1, 32, 64)], False),
+    ("softmax", (-1, True), {}, [(1, 32, 32)], True),
+    ("softmax", (0, True), {}, [(1, 32, 32)], False),
+    ("reduce_sum", (-3,), {}, [(1, 32, 32)], False),
+    ("reduce_sum", (-3,), {}, [(1, 4, 32, 32)], True),
+    ("unsqueeze", (0, 3), {}, [(1, 32, 32)], False),
+    ("unsqueeze", (-4, 3), {}, [(1, 32, 32)], False),
+    ("unsqueeze", (1, 3), {}, [(1, 32, 32)], True),
+    ("argmax", (), {}, [(1, 32, 32)], False),
+    ("transpose", (), {"dim0": -2, "dim1": -1, "z_dim_slice": -1}, [(1, 32, 64)], True),
+    ("transpose", (), {"dim0": 0, "dim1": 1, "z_dim_slice": -1}, [(1, 32, 64)], False),
+])
+def test_is_batch_safe(op_name, attrs, named_attrs, shapes, expected):
+    assert is_batch_safe(op_name, attrs, named_attrs, shapes) == expected
+
+
+def _generate_graph(module, shape):
+    dev = TTDevice("tt0", devtype=BackendType.Golden)
+    dev.place_module(module)
+    act = Tensor.create_from_torch(torch.rand(shape))
+    graph, *_ = dev.generate_graph(act)
+    return dev, graph
+
+
+def test_batched_cpueval_matches_per_sample():
+    microbatch_size = 8
+    module = BatchSafeModule("batch_safe")
+    dev, graph = _generate_graph(module, (1, 32, 64))
+    assert dev._can_cpueval_batched()
+
+    graph.set_microbatch(microbatch_size)
+    inputs = (torch.rand(microbatch_size, 32, 64),)
+    parameters = {p.get_name(): p.value() for p in module.get_parameters()}
+
+    batched, *_ = graph_eval(graph, inputs, parameters, dev, 0.1, 1.00, allow_modified_shapes=True)
+    per_sample = [graph_eval(graph, (inputs[0][i:i+1],), parameters, dev, 0.1, 1.00)[0] for i in range(microbatch_size)]
+
+    for out, golden in zip(batched, zip(*per_sample)):
+        assert torch.allclose(out, torch.cat(golden, 0))
+
+
+def test_batched_cpueval_falls_back_on_unsafe_ops():
+    dev, _ = _generate_graph(BatchUnsafeModule("batch_unsafe"), (1, 64, 64))
+    assert dev._batch_unsafe_ops == {"reshape"}
+    assert not dev._can_cpueval_batched()
+
+
+def test_batched_cpueval_falls_back_on_error():
+    from pybuda.compile import CompileResults
+
+    microbatch_size = 4
+    module = ConcatParameterModule("concat_parameter")
+    dev, graph = _generate_graph(module, (1, 32, 64))
+    assert dev._can_cpueval_batched()
+
+    # The parameter's leading dim doesn't match the microbatch, so only per-sample evaluation works
+    graph.set_microbatch(microbatch_size)
+    dev._compile_output = CompileResults()
+    dev._compile_output.initial_graph = graph
+    inputs = [torch.rand(microbatch_size, 32, 64)]
+    parameters = {p.get_name(): p.value() for p in module.get_parameters()}
+
+    outputs = dev.cpueval_forward(inputs, parameters, save_for_backward=False)
+    golden = torch.cat([module.cls_token.value().expand(microbatch_size, 1, 64), inputs[0]], dim=-2)
+    assert torch.allclose(outputs[0], golden)
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for the benchmark harness, run on a CPU device so no silicon is needed
+#
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from test.benchmark.benchmark.common.results import IterationRecorder, compare_results, distribution
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+BENCHMARK = os.path.join("pybuda", "test", "benchmark", "benchmark.py")
+
+
+def test_distribution():
+    d = distribution([float(v) for v in range(1, 101)])
+    assert d["count"] == 100
+    assert d["p50"] == 50.0
+    assert d["p90"] == 90.0
+    assert d["p99"] == 99.0
+    assert d["min"] == 1.0 and d["max"] == 100.0
+    assert distribution([])["p99"] == 0.0
+
+
+def test_iteration_recorder():
+    recorder = IterationRecorder(samples_per_output=4, throughput_window=1.0)
+    recorder.start()
+    start = recorder.start_time
+
+    # First input was pushed before the timed run started
+    recorder.push_times = [start - 1.0, start + 0.5, start + 1.0]
+    recorder.output_times = [start + 0.25, start + 0.75, start + 1.5]
+    recorder.stop()
+
+    assert recorder.latencies_ms() == pytest.approx([250.0, 250.0, 500.0])
+    assert recorder.iteration_ms() == pytest.approx([250.0, 500.0, 750.0])
+    assert recorder.throughput_over_time() == [
+        {"time_s": 0.0, "samples_per_sec": 8.0},
+        {"time_s": 1.0, "samples_per_sec": 4.0},
+    ]
+    assert recorder.summary()["host_cpu"]["process_percent"] >= 0.0
+
+
+def test_compare_results():
+    baseline = {"args": {"model": "simple_linear", "config": "default"}, "samples_per_sec": 100.0, "latency_ms": {"p50": 10.0, "p99": 20.0}}
+    current = copy.deepcopy(baseline)
+    current["samples_per_sec"] = 97.0
+    current["latency_ms"]["p99"] = 25.0
+
+    comparisons, regressions = compare_results([baseline], [current], threshold=5.0)
+    assert len(comparisons) == 3
+    assert [r["metric"] for r in regressions] == ["latency_ms.p99"]
+
+    # Runs with different arguments aren't compared
+    current["args"]["config"] = "other"
+    assert compare_results([baseline], [current], threshold=5.0) == ([], [])
+
+
+def run_benchmark(*args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, BENCHMARK, *args], cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+@pytest.mark.parametrize("single_thread", [False, True], ids=["multi_thread", "single_thread"])
+def test_benchmark_cpu(tmp_path, single_thread):
+    output = str(tmp_path / "perf.json")
+    args = ["-m", "simple_linear", "--device", "cpu", "-mb", "4", "--loop_count", "8", "--warmup_count", "2", "-o", output]
+    if single_thread:
+        args.append("--single-thread")
+    ret = run_benchmark(*args)
+    assert ret.returncode == 0, ret.stdout
+
+    with open(output) as f:
+        result = json.load(f)[-1]
+    assert "error" not in result
+    assert result["total_samples"] == 8 * 4
+    assert result["latency_ms"]["count"] == 8
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+    assert result["iteration_ms"]["count"] == 8
+    assert sum(w["samples_per_sec"] for w in result["throughput_over_time"]) > 0
+
+    # A result doesn't regress against itself, but does against a faster baseline
+    assert run_benchmark("compare", output, output).returncode == 0
+
+    faster = str(tmp_path / "faster.json")
+    result["samples_per_sec"] *= 2
+    with open(faster, "w") as f:
+        json.dump([result], f)
+    ret = run_benchmark("compare", faster, output)
+    assert ret.returncode == 1
+    assert "REGRESSION" in ret.stdout
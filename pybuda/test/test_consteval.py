@@ -185,3 +185,63 @@ def test_consteval_binary_fork(test_kind, test_device):
         torch.rand((1, 1, 256, 32), requires_grad=test_kind.is_training())
     )
     consteval_binary_fork(x, a=a, b=b)
+
+
+def _consteval_graph(name):
+    # param -> exp -> multiply(exp, exp) -> add(multiply, param) -> output
+    def op(op_type, input_nodes):
+        return {"opcode": "PyBudaOp", "epoch_type": "Forward", "input_nodes": input_nodes, "op_type": {"type": op_type, "attrs": [], "named_attrs": {}}}
+    nodes = {
+        name: {"opcode": "Input", "epoch_type": "Forward", "input_nodes": [], "cache": {"shape": [1, 1, 32, 32]}},
+        f"{name}_exp": op("exp", [name]),
+        f"{name}_mul": op("multiply", [f"{name}_exp", f"{name}_exp"]),
+        f"{name}_add": op("add", [f"{name}_mul", name]),
+        f"{name}_out": {"opcode": "Output", "epoch_type": "Forward", "input_nodes": [f"{name}_add"]},
+    }
+    return {"nodes": nodes, "topological_sorted_nodes": list(nodes.keys())}
+
+
+def test_consteval_parallel(monkeypatch):
+    from pybuda._C.graph import Graph
+    from pybuda.tensor import get_post_const_eval_tensors
+
+    names = [f"param_{i}" for i in range(16)]
+    params = {name: torch.rand(1, 1, 32, 32) for name in names}
+    consteval_trace = {name: _consteval_graph(name) for name in names}
+
+    monkeypatch.setenv("PYBUDA_CONSTEVAL_THREADS", "4")
+    parallel = get_post_const_eval_tensors(Graph("consteval"), params, consteval_trace, {}, names, is_buda=False)
+
+    assert list(parallel.keys()) == names
+    for name in names:
+        golden = torch.exp(params[name]) * torch.exp(params[name]) + params[name]
+        assert torch.allclose(parallel[name], golden)
+
+
+def test_consteval_disk_cache(monkeypatch, tmp_path):
+    from pybuda._C.graph import Graph
+    from pybuda.tensor import get_post_const_eval_tensors, get_consteval_disk_cache
+
+    names = [f"param_{i}" for i in range(4)]
+    params = {name: torch.rand(1, 1, 32, 32) for name in names}
+    consteval_trace = {name: _consteval_graph(name) for name in names}
+
+    monkeypatch.setenv("PYBUDA_CONSTEVAL_CACHE_DIR", str(tmp_path))
+    first = get_post_const_eval_tensors(Graph("consteval"), params, consteval_trace, {}, names, is_buda=False)
+    assert get_consteval_disk_cache().stats() == {"hits": 0, "misses": 4}
+
+    second = get_post_const_eval_tensors(Graph("consteval"), params, consteval_trace, {}, names, is_buda=False)
+    assert get_consteval_disk_cache().stats() == {"hits": 4, "misses": 4}
+    for name in names:
+        assert torch.equal(first[name], second[name])
+
+    # Changed weights miss the cache
+    params[names[0]] = torch.rand(1, 1, 32, 32)
+    third = get_post_const_eval_tensors(Graph("consteval"), params, consteval_trace, {}, names, is_buda=False)
+    assert get_consteval_disk_cache().stats() == {"hits": 7, "misses": 5}
+    assert not torch.equal(first[names[0]], third[names[0]])
+
+    # Oldest entries are evicted until the cache fits its size cap
+    monkeypatch.setenv("PYBUDA_CONSTEVAL_CACHE_SIZE_MB", "0")
+    get_consteval_disk_cache().evict()
+    assert len(list(tmp_path.glob("*.pt"))) == 0
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for shutdown wake-ups and dispatch latency of device loops
+#
+import queue
+import threading
+import time
+
+from pybuda.dispatch import ShutdownEvent, DispatchStats, WAKEUP, get_or_shutdown, register_queue
+
+
+def test_shutdown_wakes_waiter():
+    event = ShutdownEvent()
+    q = queue.Queue()
+    register_queue(event, q)
+
+    result = {}
+    def waiter():
+        start = time.monotonic()
+        result["item"] = get_or_shutdown(q, event)
+        result["elapsed"] = time.monotonic() - start
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    time.sleep(0.1)
+    event.set()
+    t.join(timeout=2)
+
+    assert not t.is_alive()
+    assert result["item"] is None
+    assert result["elapsed"] < 2
+
+    # Sentinel is put back, so the next wait returns right away too
+    assert get_or_shutdown(q, event) is None
+
+
+def test_items_before_shutdown():
+    event = ShutdownEvent()
+    q = queue.Queue()
+    register_queue(event, q)
+
+    q.put(1)
+    event.set()
+    assert get_or_shutdown(q, event) == 1
+    assert get_or_shutdown(q, event) is None
+
+
+def test_stale_wakeup_skipped():
+    # Sentinel left over from an earlier shutdown doesn't end a wait on a new event
+    q = queue.Queue()
+    q.put(WAKEUP)
+    q.put(2)
+    event = ShutdownEvent()
+    register_queue(event, q)
+    assert get_or_shutdown(q, event) == 2
+
+
+def test_local_queue_woken():
+    event = ShutdownEvent()
+    shared = queue.Queue()
+    local = queue.Queue()
+    register_queue(event, shared)
+    register_queue(event, local, local=True)
+
+    event.set()
+    assert get_or_shutdown(local, event) is None
+
+    # Registered after the shutdown, and woken straight away
+    late = queue.Queue()
+    register_queue(event, late, local=True)
+    assert late.get(timeout=1) == WAKEUP
+
+
+def test_dispatch_stats():
+    stats = DispatchStats(window=4)
+    now = time.monotonic()
+    for i in range(8):
+        stats.record("RUN_FORWARD", now - i / 1000)
+    stats.record("QUIT", now)
+
+    s = stats.stats()
+    assert s["RUN_FORWARD"]["count"] == 4
+    assert s["QUIT"]["count"] == 1
+    assert s["RUN_FORWARD"]["p50_ms"] <= s["RUN_FORWARD"]["p99_ms"]
+    assert s["RUN_FORWARD"]["mean_ms"] >= 4
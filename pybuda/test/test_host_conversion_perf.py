@@ -0,0 +1,231 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Micro-benchmarks of host-side tensor conversions on the inference path
+#
+# Each case measures time per call (best mean over several rounds) and bytes allocated per call (torch profiler).
+# Environment variables:
+#   PYBUDA_HOST_PERF_OUTPUT=<file.json>     write results of this run, to be used as a baseline later
+#   PYBUDA_HOST_PERF_BASELINE=<file.json>   fail cases that regressed against the baseline
+#   PYBUDA_HOST_PERF_THRESHOLD=<percent>    allowed regression of time and bytes, default 20
+#
+import json
+import os
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+import pytest
+import torch
+
+from pybuda import Tensor
+from pybuda._C import DataFormat
+from pybuda.device_connector import DirectPusherDeviceConnector
+from pybuda.op.eval.common import calculate_tile_size
+from pybuda.tensor import (
+    compile_narrow_plan,
+    pad_pytorch_tensor_to_buda,
+    narrow_buda_tensor_to_pytorch,
+    pytorch_tensor_to_tensor_desc,
+    to_pt_tensors,
+    to_buda_tensors,
+    remove_microbatch,
+)
+from pybuda.utils import align_up
+
+RESULTS: Dict[str, Dict[str, float]] = {}
+
+ROUNDS = 5
+MIN_ROUND_TIME = 0.01 # seconds
+
+# name: shape, including the microbatch dimension
+SHAPES = {
+    "bert_act": (8, 128, 768),
+    "image": (8, 3, 224, 224),
+    "unaligned": (8, 1, 30, 70),
+    "vector": (8, 1000),
+}
+
+DTYPES = [torch.float32, torch.bfloat16, torch.int32]
+
+
+def make_tensor(shape, dtype):
+    if dtype.is_floating_point:
+        return torch.rand(shape, dtype=dtype)
+    return torch.randint(0, 32000, shape, dtype=dtype)
+
+
+def bytes_allocated(fn: Callable) -> int:
+    with torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU], profile_memory=True) as prof:
+        fn()
+    return sum(e.cpu_memory_usage for e in prof.events() if e.cpu_memory_usage > 0)
+
+
+def time_per_call(fn: Callable) -> float:
+    # Calibrate the number of calls per round, then keep the best round, which is the least disturbed by noise
+    fn()
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_ROUND_TIME:
+            break
+        calls *= 2
+
+    best = elapsed / calls
+    for _ in range(ROUNDS - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def load_baseline():
+    path = os.environ.get("PYBUDA_HOST_PERF_BASELINE")
+    if not path:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_results():
+    yield
+    path = os.environ.get("PYBUDA_HOST_PERF_OUTPUT")
+    if path and len(RESULTS) > 0:
+        with open(path, "w") as f:
+            json.dump(RESULTS, f, indent=4, sort_keys=True)
+
+
+def run_benchmark(name: str, fn: Callable):
+    result = {"time_us": time_per_call(fn) * 1e6, "bytes": bytes_allocated(fn)}
+    RESULTS[name] = result
+
+    baseline = load_baseline()
+    if baseline is None or name not in baseline:
+        return
+
+    threshold = float(os.environ.get("PYBUDA_HOST_PERF_THRESHOLD", "20"))
+    base = baseline[name]
+    limit = 1 + threshold / 100
+    assert result["time_us"] <= base["time_us"] * limit, \
+        f"{name}: {result['time_us']:.1f}us per call, baseline {base['time_us']:.1f}us (+{threshold}% allowed)"
+    assert result["bytes"] <= base["bytes"] * limit, \
+        f"{name}: {result['bytes']} bytes per call, baseline {base['bytes']} (+{threshold}% allowed)"
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=lambda d: str(d).split(".")[-1])
+@pytest.mark.parametrize("shape", SHAPES.values(), ids=SHAPES.keys())
+@pytest.mark.parametrize("small_tiles", [False, True], ids=["tile32", "small_tile"])
+def test_pad_pytorch_tensor_to_buda(request, shape, dtype, small_tiles):
+    t = make_tensor(shape, dtype)
+    tile_r = calculate_tile_size(shape[-2]) if small_tiles and len(shape) > 2 else 32
+
+    out = pad_pytorch_tensor_to_buda(t, [], squeeze=True, microbatch=shape[0], tile_r=tile_r)
+    assert out.shape[-1] == align_up(shape[-1], 32)
+    run_benchmark(request.node.name, lambda: pad_pytorch_tensor_to_buda(t, [], squeeze=True, microbatch=shape[0], tile_r=tile_r))
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=lambda d: str(d).split(".")[-1])
+@pytest.mark.parametrize("shape", SHAPES.values(), ids=SHAPES.keys())
+def test_narrow_buda_tensor_to_pytorch(request, shape, dtype):
+    padded = pad_pytorch_tensor_to_buda(make_tensor(shape, dtype), [], squeeze=True, microbatch=shape[0])
+
+    out = narrow_buda_tensor_to_pytorch(padded, list(shape), has_microbatch_dim=True)
+    assert tuple(out.shape) == shape
+    run_benchmark(request.node.name, lambda: narrow_buda_tensor_to_pytorch(padded, list(shape), has_microbatch_dim=True))
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=lambda d: str(d).split(".")[-1])
+@pytest.mark.parametrize("contiguous", [True, False], ids=["contiguous", "transposed"])
+def test_pytorch_tensor_to_tensor_desc(request, dtype, contiguous):
+    t = make_tensor((8, 1, 128, 768), dtype)
+    if not contiguous:
+        t = t.transpose(-1, -2)
+    run_benchmark(request.node.name, lambda: pytorch_tensor_to_tensor_desc(t))
+
+
+@pytest.mark.parametrize("microbatch", [1, 8, 64])
+def test_to_pt_tensors(request, microbatch):
+    tensors = (
+        make_tensor((microbatch, 128, 768), torch.float32),
+        Tensor.create_from_torch(make_tensor((microbatch, 128, 768), torch.float32)),
+        make_tensor((microbatch, 128), torch.int32),
+        Tensor.create_from_torch(make_tensor((microbatch, 1, 128), torch.bfloat16)),
+    )
+    assert all(isinstance(t, torch.Tensor) for t in to_pt_tensors(tensors))
+    run_benchmark(request.node.name, lambda: to_pt_tensors(tensors))
+
+
+@pytest.mark.parametrize("microbatch", [1, 8, 64])
+def test_to_buda_tensors(request, microbatch):
+    tensors = (
+        make_tensor((microbatch, 128, 768), torch.float32),
+        Tensor.create_from_torch(make_tensor((microbatch, 128, 768), torch.float32)),
+        make_tensor((microbatch, 128), torch.int32),
+    )
+    assert all(isinstance(t, Tensor) for t in to_buda_tensors(tensors))
+    run_benchmark(request.node.name, lambda: to_buda_tensors(tensors))
+
+
+@pytest.mark.parametrize("microbatch", [1, 8, 64])
+def test_remove_microbatch(request, microbatch):
+    tensors = (
+        make_tensor((microbatch, 128, 768), torch.float32),
+        make_tensor((microbatch, 3, 224, 224), torch.float32),
+        make_tensor((microbatch, 128), torch.int32),
+    )
+    assert all(t.shape[0] == 1 for t in remove_microbatch(tensors))
+    run_benchmark(request.node.name, lambda: remove_microbatch(tensors))
+
+
+@pytest.mark.parametrize("seq_len", [128, 1000, 2048])
+@pytest.mark.parametrize("microbatch", [1, 8, 64])
+def test_embedding_index(request, microbatch, seq_len):
+    connector = DirectPusherDeviceConnector(None, sequential=True, microbatch=microbatch)
+    tokens = make_tensor((microbatch, seq_len), torch.int32)
+
+    # One tile row per 1024 token indices, one tile column
+    rows = align_up(seq_len, 1024) // 1024
+    q = SimpleNamespace(
+        data_format=DataFormat.RawUInt32, t=1,
+        bufq_grid_dim_r=1, mblock_m=1, ublock_rt=rows,
+        bufq_grid_dim_c=1, mblock_n=1, ublock_ct=1)
+
+    out = connector._embedding_index(tokens, (1, seq_len), q)
+    assert tuple(out.shape) == (microbatch, 1, rows * 32, 32)
+    embedding_index = connector._compile_embedding_index((1, seq_len), q)
+    run_benchmark(request.node.name, lambda: embedding_index(tokens))
+
+
+@pytest.mark.parametrize("wrapped", [False, True], ids=["pytorch", "buda_tensor"])
+@pytest.mark.parametrize("inputs", [1, 16, 128])
+def test_prepare_push_tensors(request, inputs, wrapped):
+    # Many small inputs, where Python overhead per input and per push dominates the cost of copying data
+    connector = DirectPusherDeviceConnector(None, sequential=True, microbatch=1)
+    connector.set_dram_io_push_queues([SimpleNamespace(data_format=DataFormat.Float16_b) for _ in range(inputs)], [[] for _ in range(inputs)], None)
+    tensors = [make_tensor((1, 1, 1, 64), torch.float32) for _ in range(inputs)]
+    if wrapped:
+        tensors = [Tensor.create_from_torch(t) for t in tensors]
+
+    _, descs = connector._prepare_push_tensors(tensors)
+    assert len(descs) == inputs
+    run_benchmark(request.node.name, lambda: connector._prepare_push_tensors(tensors))
+
+
+@pytest.mark.parametrize("shape", SHAPES.values(), ids=SHAPES.keys())
+@pytest.mark.parametrize("planned", [False, True], ids=["narrow_to_original_shape", "narrow_plan"])
+def test_narrow_output(request, shape, planned):
+    padded = Tensor.create_from_torch(pad_pytorch_tensor_to_buda(make_tensor(shape, torch.float32), [], squeeze=True, microbatch=shape[0]))
+    if planned:
+        narrow = compile_narrow_plan(shape, has_microbatch_dim=True)
+        fn = lambda: narrow(padded)
+    else:
+        fn = lambda: padded.narrow_to_original_shape(shape, has_microbatch_dim=True)
+
+    assert tuple(fn().value().shape) == shape
+    run_benchmark(request.node.name, fn)
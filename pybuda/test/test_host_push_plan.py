@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for per-queue host conversion plans of pushed inputs and read outputs
+#
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from pybuda import Tensor
+from pybuda._C import DataFormat
+from pybuda._C.graph import RuntimeTensorTransform, RuntimeTensorTransformType, Shape
+from pybuda.device_connector import DirectPusherDeviceConnector
+from pybuda.tensor import _embedding_index, compile_narrow_plan, pad_pytorch_tensor_to_buda
+
+
+def make_connector(transform, q, microbatch, staging, constant=None):
+    connector = DirectPusherDeviceConnector(None, sequential=True, microbatch=microbatch)
+    connector.enable_staging = staging
+    connector.set_dram_io_push_queues([q], [[]], [transform], [constant])
+    return connector
+
+
+def push(connector, t):
+    tensors, _ = connector._prepare_push_tensors([t])
+    return tensors[0].value() if isinstance(tensors[0], Tensor) else tensors[0]
+
+
+@pytest.mark.parametrize("staging", [False, True], ids=["regular", "staged"])
+@pytest.mark.parametrize("wrapped", [False, True], ids=["pytorch", "buda_tensor"])
+def test_push_plan_pads(staging, wrapped):
+    t = torch.rand(2, 50, 70)
+    connector = make_connector(RuntimeTensorTransform(), SimpleNamespace(data_format=DataFormat.Float16), microbatch=2, staging=staging)
+
+    # Only wrapped tensors are converted on the host
+    golden = pad_pytorch_tensor_to_buda(t, [], squeeze=True, microbatch=2)
+    if wrapped:
+        golden = golden.to(torch.float16)
+        t = Tensor.create_from_torch(t)
+
+    for _ in range(3):
+        out = push(connector, t)
+        assert out.dtype == golden.dtype
+        assert torch.equal(out, golden)
+
+
+@pytest.mark.parametrize("staging", [False, True], ids=["regular", "staged"])
+@pytest.mark.parametrize("wrapped", [False, True], ids=["pytorch", "buda_tensor"])
+def test_push_plan_reinterprets(staging, wrapped):
+    t = torch.rand(2, 2048)
+    transform = RuntimeTensorTransform()
+    transform.type = RuntimeTensorTransformType.ReinterpretShape
+    transform.reinterpreted_shape = Shape.create([2, 1, 64, 32])
+    connector = make_connector(transform, SimpleNamespace(data_format=DataFormat.Float32), microbatch=2, staging=staging)
+
+    out = push(connector, Tensor.create_from_torch(t) if wrapped else t)
+    assert torch.equal(out, t.view(2, 1, 64, 32))
+
+
+@pytest.mark.parametrize("seq_len", [128, 1000, 2048])
+def test_push_plan_embedding_index(seq_len):
+    tokens = torch.randint(0, 32000, (4, seq_len), dtype=torch.int32)
+    original = tokens.clone()
+    rows = (seq_len + 1023) // 1024
+    q = SimpleNamespace(
+        data_format=DataFormat.RawUInt32, t=1,
+        bufq_grid_dim_r=1, mblock_m=1, ublock_rt=rows,
+        bufq_grid_dim_c=1, mblock_n=1, ublock_ct=1)
+    connector = make_connector(RuntimeTensorTransform.EmbeddingIndex(Shape.create([1, seq_len])), q, microbatch=4, staging=True)
+
+    tensors, descs = connector._prepare_push_tensors([tokens])
+    assert torch.equal(tensors[0], _embedding_index(tokens, (1, seq_len), q))
+    assert descs[0].format == DataFormat.RawUInt32
+    assert torch.equal(tokens, original)
+
+
+def test_push_plan_constant():
+    transform = RuntimeTensorTransform()
+    transform.type = RuntimeTensorTransformType.ConstantInput
+    constant = torch.rand(1, 30, 30)
+    connector = make_connector(transform, SimpleNamespace(data_format=DataFormat.Float32), microbatch=1, staging=True, constant=constant)
+
+    first = push(connector, torch.rand(1, 30, 30))
+    assert torch.equal(first, pad_pytorch_tensor_to_buda(constant, [], squeeze=True))
+    # Padded once, when the plan is made
+    assert push(connector, torch.rand(1, 30, 30)) is first
+
+
+@pytest.mark.parametrize("shape, reinterpret_shape", [
+    ((2, 50, 70), None),
+    ((4, 3, 224, 224), None),
+    ((8, 1000), None),
+    ((2, 64, 32), None),
+    ((2, 2048), [2, 1, 64, 32]),
+    ((1, 1, 30, 70), [1, 30, 70]),
+])
+@pytest.mark.parametrize("with_out", [False, True], ids=["allocated", "out_buffer"])
+def test_narrow_plan_matches_narrow_to_original_shape(shape, reinterpret_shape, with_out):
+    source = torch.rand(reinterpret_shape if reinterpret_shape is not None else shape)
+    padded = Tensor.create_from_torch(pad_pytorch_tensor_to_buda(source, [], squeeze=True, microbatch=shape[0]))
+
+    golden = padded.narrow_to_original_shape(shape, reinterpret_shape, has_microbatch_dim=True).value()
+    narrow = compile_narrow_plan(shape, reinterpret_shape, has_microbatch_dim=True)
+    for _ in range(2):
+        out = torch.empty(shape) if with_out else None
+        result = narrow(padded, out).value()
+        assert tuple(result.shape) == shape
+        assert torch.equal(result, golden)
+        if with_out:
+            assert result.data_ptr() == out.data_ptr()
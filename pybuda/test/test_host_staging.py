@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for staging of pushed inputs into reusable tile-aligned host buffers
+#
+import pytest
+import torch
+
+from pybuda.tensor import pad_pytorch_tensor_to_buda, stage_pytorch_tensor_to_buda
+
+
+@pytest.mark.parametrize("shape, microbatch", [
+    ((2, 50, 70), 2),
+    ((4, 3, 224, 224), 4),
+    ((1, 1, 1, 2047), 1),
+    ((8, 100), 8),
+    ((1, 33, 64), 4),
+])
+@pytest.mark.parametrize("dtype", [torch.float32, torch.bfloat16, torch.float16])
+def test_stage_matches_pad(shape, microbatch, dtype):
+    t = torch.rand(shape)
+    golden = pad_pytorch_tensor_to_buda(t, [], squeeze=True, microbatch=microbatch).to(dtype)
+    staged = stage_pytorch_tensor_to_buda(t, [], None, dtype, squeeze=True, microbatch=microbatch)
+    assert staged.shape == golden.shape
+    assert staged.dtype == dtype
+    assert torch.equal(staged, golden)
+
+
+def test_stage_reuses_buffer():
+    first = stage_pytorch_tensor_to_buda(torch.rand(2, 50, 70), [], None, torch.float32, squeeze=True, microbatch=2)
+    t = torch.rand(2, 50, 70)
+    second = stage_pytorch_tensor_to_buda(t, [], first, torch.float32, squeeze=True, microbatch=2)
+    assert second is first
+    assert torch.equal(second[..., :50, :70], t)
+    assert torch.count_nonzero(second[..., 50:, :]) == 0
+    assert torch.count_nonzero(second[..., 70:]) == 0
+
+    # Different type needs a new buffer
+    third = stage_pytorch_tensor_to_buda(t, [], first, torch.bfloat16, squeeze=True, microbatch=2)
+    assert third is not first
+
+
+def test_stage_keeps_integers_exact():
+    t = torch.full((1, 1, 1, 100), 2**24 + 1, dtype=torch.int32)
+    staged = stage_pytorch_tensor_to_buda(t, [], None, torch.int32, squeeze=True, microbatch=1)
+    assert torch.equal(staged[..., :100], t)
+
+
+def test_stage_skips_tensors_pushed_as_is():
+    t = torch.rand(1, 1, 64, 64)
+    assert stage_pytorch_tensor_to_buda(t, [], None, torch.float32, squeeze=True, microbatch=1) is None
+    assert stage_pytorch_tensor_to_buda(torch.rand(1, 1, 1, 64), [-2], None, torch.float32, squeeze=True, microbatch=1) is None
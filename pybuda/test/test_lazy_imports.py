@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Check that optional frameworks are only imported when they are used. These run in a fresh interpreter,
+# since conftest and other tests import TensorFlow into the test process.
+#
+import subprocess
+import sys
+
+import pytest
+
+LAZY_FRAMEWORKS = ["tensorflow", "mxnet", "jax", "jaxlib", "onnx", "transformers"]
+
+def _loaded_frameworks(script: str):
+    check = f"""
+import sys
+{script}
+print(",".join(m for m in {LAZY_FRAMEWORKS!r} if m in sys.modules))
+"""
+    out = subprocess.check_output([sys.executable, "-c", check], text=True)
+    loaded = out.strip().splitlines()[-1] if out.strip() else ""
+    return [m for m in loaded.split(",") if m]
+
+
+def test_import_pybuda_is_pytorch_only():
+    assert _loaded_frameworks("import pybuda") == []
+
+
+def test_pytorch_tensor_conversion_is_pytorch_only():
+    script = """
+import torch
+import pybuda
+from pybuda.tensor import to_pt_tensors, to_buda_tensors, remove_microbatch
+t = torch.rand(2, 32, 32)
+to_pt_tensors(to_buda_tensors((t,)))
+remove_microbatch((t,))
+"""
+    assert _loaded_frameworks(script) == []
+
+
+def test_tf_loaded_on_first_use():
+    pytest.importorskip("tensorflow")
+    script = """
+import torch
+import pybuda
+from pybuda.tensor import to_tf_tensors
+to_tf_tensors((torch.rand(1, 32, 32),))
+"""
+    assert "tensorflow" in _loaded_frameworks(script)
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for user-registered output buffer rings on direct popper device connectors
+#
+import threading
+
+import pytest
+import torch
+
+from pybuda import Tensor
+from pybuda.tensor import pytorch_tensor_to_tensor_desc
+from pybuda.device_connector import DirectPopperDeviceConnector, OutputBufferRing
+
+
+@pytest.mark.parametrize("original_shape", [(2, 50, 70), (2, 1, 64, 64), (2, 1, 50, 100)])
+@pytest.mark.parametrize("out_dtype", [torch.float32, torch.bfloat16])
+def test_narrow_into_output_buffer(original_shape, out_dtype):
+    padded = torch.rand(2, 1, 64, 128)
+    tensor = Tensor.create_from_tensor_descriptor(pytorch_tensor_to_tensor_desc(padded))
+
+    golden = tensor.narrow_to_original_shape(original_shape, has_microbatch_dim=True).value()
+    out = torch.zeros(original_shape, dtype=out_dtype)
+    narrowed = tensor.narrow_to_original_shape(original_shape, has_microbatch_dim=True, out=out)
+
+    assert narrowed.value().data_ptr() == out.data_ptr()
+    assert torch.equal(out, golden.to(out_dtype))
+
+
+def test_output_buffer_ring():
+    buffers = [torch.zeros(2, 32) for _ in range(2)]
+    ring = OutputBufferRing(buffers)
+
+    first = ring.acquire(None)
+    second = ring.acquire(None)
+    assert {first.data_ptr(), second.data_ptr()} == {b.data_ptr() for b in buffers}
+
+    # Ring is exhausted, acquire blocks until shutdown
+    shutdown = threading.Event()
+    shutdown.set()
+    assert ring.acquire(shutdown) is None
+
+    ring.release(first)
+    assert ring.acquire(None) is first
+
+    with pytest.raises(AssertionError):
+        ring.release(torch.zeros(2, 32))
+
+
+def test_connector_release_output_buffer():
+    dc = DirectPopperDeviceConnector(None)
+    buffers = [torch.zeros(4, 4) for _ in range(3)]
+    dc.register_output_buffers(0, buffers)
+
+    ring = dc.output_buffer_rings[0]
+    t = Tensor.create_from_torch(ring.acquire(None))
+    assert dc.is_output_buffer(t)
+    assert not dc.is_output_buffer(torch.zeros(4, 4))
+
+    dc.release_output_buffer(t)
+    assert ring.free.qsize() == 3
+
+    with pytest.raises(RuntimeError):
+        dc.release_output_buffer(torch.zeros(4, 4))
+
+
+def test_connector_read_gives_buffers_back(monkeypatch):
+    from pybuda.backend import BackendAPI
+
+    shutdown = threading.Event()
+    dc = DirectPopperDeviceConnector(shutdown)
+    dc.direct_pop_queues = [object(), object()]
+    dc.original_shapes = [(2, 32), (2, 32)]
+    dc.requires_grad = [False, False]
+    dc.register_output_buffers(0, [torch.zeros(2, 32) for _ in range(2)])
+    dc.register_output_buffers(1, [torch.zeros(2, 32)])
+
+    def failing_read_queues(*args, **kwargs):
+        raise RuntimeError("read failed")
+    monkeypatch.setattr(BackendAPI, "read_queues", failing_read_queues)
+
+    with pytest.raises(RuntimeError, match="read failed"):
+        dc.read()
+    assert dc.output_buffer_rings[0].free.qsize() == 2
+    assert dc.output_buffer_rings[1].free.qsize() == 1
+
+    # Second ring is exhausted, so the read gives up on shutdown after taking a buffer from the first one
+    held = dc.output_buffer_rings[1].acquire(None)
+    shutdown.set()
+    assert dc.read() == []
+    assert dc.output_buffer_rings[0].free.qsize() == 2
+    dc.release_output_buffer(held)
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for shapes-only tracing (CompilerConfig.trace_shapes_only), where op reference values are evaluated lazily
+#
+import torch
+
+import pybuda
+from pybuda import PyBudaModule, TTDevice, Tensor, BackendType, CompilerConfig
+from pybuda.tensor import TensorFromTrace
+
+
+class ChainModule(PyBudaModule):
+    def __init__(self, name):
+        super().__init__(name)
+        self.weights = pybuda.Parameter(torch.rand(64, 64), requires_grad=False)
+
+    def forward(self, act):
+        mm = pybuda.op.Matmul("mm", act, self.weights)
+        gelu = pybuda.op.Gelu("gelu", mm)
+        add = pybuda.op.Add("add", gelu, mm)
+        return pybuda.op.Softmax("sm", add, dim=-1)
+
+
+class ForkModule(PyBudaModule):
+    def __init__(self, name):
+        super().__init__(name)
+        self.weights = pybuda.Parameter(torch.rand(64, 64), requires_grad=False)
+
+    def forward(self, act):
+        mm = pybuda.op.Matmul("mm", act, self.weights)
+        return pybuda.op.Gelu("gelu", mm), pybuda.op.Exp("exp", mm)
+
+
+def _trace(shapes_only, return_intermediate=False, module_cls=None):
+    torch.manual_seed(0)
+    module = (module_cls or ChainModule)("chain")
+    dev = TTDevice("tt0", devtype=BackendType.Golden)
+    dev.place_module(module)
+    act = Tensor.create_from_torch(torch.rand(1, 32, 64))
+    _, outputs, intermediate, *_ = dev.generate_graph(act, compiler_cfg=CompilerConfig(trace_shapes_only=shapes_only), return_intermediate=return_intermediate)
+    return outputs, intermediate
+
+
+def test_shapes_only_trace_defers_values():
+    outputs, _ = _trace(shapes_only=True)
+    out = outputs[0]
+    assert out.has_value()
+    assert out._value is None, "Reference value shouldn't be evaluated during a shapes-only trace"
+
+    golden, _ = _trace(shapes_only=False)
+    assert torch.allclose(out.value(), golden[0].value())
+    assert out._value is not None
+
+    # Operands of the output stay deferred after the output is read
+    assert all(o._value is None for o in out.src_op.operands)
+
+
+def test_shapes_only_trace_with_intermediates():
+    outputs, intermediate = _trace(shapes_only=True, return_intermediate=True)
+    assert outputs[0]._value is not None
+    assert len(intermediate) > 0
+
+
+def test_shapes_only_trace_evaluates_outputs_together():
+    outputs, _ = _trace(shapes_only=True, module_cls=ForkModule)
+    TensorFromTrace.evaluate_deferred(outputs)
+
+    golden, _ = _trace(shapes_only=False, module_cls=ForkModule)
+    for out, g in zip(outputs, golden):
+        assert out._value is not None
+        assert torch.allclose(out.value(), g.value())
+
+    # The shared matmul was only needed during evaluation
+    mm = outputs[0].src_op.operands[0]
+    assert mm is outputs[1].src_op.operands[0]
+    assert mm._value is None
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for shared-memory tensor rings between device connector processes
+#
+import queue
+
+import torch
+
+from pybuda import Tensor, DataFormat
+from pybuda.device_connector import DeviceConnector, TransferType, SharedTensorRing, SharedRingSlot, SharedRingTensors
+
+
+def make_ring(num_slots):
+    # Producer and consumer each get their own copy of the ring, sharing only the queue of free slots
+    free_queue = queue.Queue()
+    return SharedTensorRing(num_slots, free_queue), SharedTensorRing(num_slots, free_queue)
+
+
+def test_shared_tensor_ring_round_trip():
+    producer, consumer = make_ring(2)
+    a = torch.rand(2, 32, 32)
+    b = Tensor.create_from_torch(torch.randint(0, 100, (2, 8), dtype=torch.int32), dev_data_format=DataFormat.RawUInt32)
+
+    item = producer.encode([a, b])
+    assert isinstance(item, SharedRingSlot)
+    assert item.slots is not None
+
+    tensors = consumer.decode(item)
+    assert isinstance(tensors, SharedRingTensors)
+    assert torch.equal(tensors[0], a)
+    assert torch.equal(tensors[1].value(), b.value())
+    assert tensors[1].data_format == DataFormat.RawUInt32
+
+    # Slots are only sent with the first descriptor of a ring
+    assert producer.encode([a, b]).slots is None
+
+    # Anything that isn't a descriptor passes through
+    tensors = [a]
+    assert consumer.decode(tensors) is tensors
+
+
+def test_shared_tensor_ring_exhausted():
+    producer, consumer = make_ring(2)
+    t = torch.rand(4, 4)
+
+    first = consumer.decode(producer.encode([t]))
+    consumer.decode(producer.encode([t]))
+
+    # No free slot, so tensors are sent as they are
+    tensors = [t]
+    assert producer.encode(tensors) is tensors
+
+    consumer.release(first.ring_slot)
+    item = producer.encode([t])
+    assert isinstance(item, SharedRingSlot)
+    assert item.index == first.ring_slot[1]
+
+
+def test_shared_tensor_ring_shape_change():
+    producer, consumer = make_ring(2)
+    old = consumer.decode(producer.encode([torch.rand(4, 4)]))
+
+    item = producer.encode([torch.rand(8, 8)])
+    assert item.generation == old.ring_slot[0] + 1
+    assert item.slots is not None
+    assert consumer.decode(item)[0].shape == (8, 8)
+
+    # Releasing a slot of the replaced ring doesn't hand it out again
+    consumer.release(old.ring_slot)
+    assert isinstance(producer.encode([torch.rand(8, 8)]), SharedRingSlot)
+    tensors = [torch.rand(8, 8)]
+    assert producer.encode(tensors) is tensors
+
+
+def test_connector_shared_tensor_ring():
+    dc = DeviceConnector(TransferType.MP_QUEUE, TransferType.MP_QUEUE, None, queue=queue.Queue())
+    dc.enable_shared_tensor_ring(1)
+
+    t = torch.rand(2, 16)
+    dc.push([t])
+    inputs = dc.read()
+    assert isinstance(inputs, SharedRingTensors)
+    assert torch.equal(inputs[0], t)
+
+    # Outputs that alias the slot are copied before it's released
+    view = inputs[0][0]
+    fresh = torch.rand(2, 16)
+    outputs = dc.detach_from_ring((view, fresh))
+    assert outputs[0].data_ptr() != view.data_ptr()
+    assert outputs[1] is fresh
+
+    # Popping hands the slot back to the producer
+    dc.pop()
+    assert dc.read_ring_tensors is None
+    assert dc.ring.free_queue.get(timeout=5) == inputs.ring_slot
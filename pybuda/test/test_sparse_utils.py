@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Equivalence tests for the vectorized sparse picker builders in op/eval/sparse_utils.py. The reference_* functions
+# are the original per-element/per-slice implementations, kept here as the golden (and as the baseline for
+# test/benchmark/sparse_picker_benchmark.py).
+#
+import pytest
+import torch
+
+from pybuda._C import SparseCOO
+from pybuda.pybudaglobal import TILE_DIM
+from pybuda.utils import align_up_tile
+from pybuda.op.eval.sparse_utils import (
+    calculate_conv2d_output_dimensions,
+    clear_picker_matrix_cache,
+    conv2d_padding_to_canonical,
+    create_conv2d_sparse_picker_matrix,
+    get_picker_matrix_cache_stats,
+    get_sparse_picker_matrix_max_span,
+    num_sparse_tiles_in_strip,
+    sparse_coo_zslices,
+    transpose_sparse_picker_matrix,
+)
+
+
+def reference_create_conv2d_sparse_picker_matrix(
+    y, x, y_shift, x_shift, k_y, k_x, stride, padding, dilation, tile_align=False, pad_x_only=False, sparse_r_pad=0, sparse_c_pad=0
+):
+    cols = torch.arange(start=1, end=y * x + 1).view(y, x)
+    cols = torch.nn.functional.pad(cols, padding)
+    shift_y = dilation * ((k_y - 1) // 2 - y_shift)
+    shift_x = dilation * ((k_x - 1) // 2 - x_shift)
+    cols = torch.nn.functional.pad(cols, (-shift_x, shift_x, -shift_y, shift_y))
+    cols = cols[::stride[0], ::stride[1]]
+    out_y, out_x = calculate_conv2d_output_dimensions(y, x, [k_y, k_x], stride, padding, dilation)
+    cols = torch.nn.functional.pad(cols, (0, out_x - cols.shape[1], 0, out_y - cols.shape[0]))
+
+    cols = cols.reshape(-1)
+    rows = torch.arange(cols.shape[0])
+    rows = rows.index_select(0, cols.nonzero().flatten())
+    cols = cols.index_select(0, cols.nonzero().flatten())
+    cols -= 1
+
+    if pad_x_only:
+        sparse_r = align_up_tile(out_x) * out_y
+        sparse_c = align_up_tile(x) * y
+    elif tile_align:
+        sparse_r = align_up_tile(out_y * out_x)
+        sparse_c = align_up_tile(y * x)
+        if sparse_r_pad:
+            sparse_r = (align_up_tile(out_y * out_x) // 32 + sparse_r_pad) * 32
+        if sparse_c_pad:
+            sparse_c += sparse_c_pad * 32
+    else:
+        sparse_r = out_y * out_x
+        sparse_c = y * x
+    return torch.sparse_coo_tensor(
+        [rows.tolist(), cols.tolist()],
+        torch.ones(cols.shape[0]),
+        (sparse_r, sparse_c),
+        dtype=torch.float32,
+    ).coalesce()
+
+
+def reference_sparse_coo_zslices(sparse):
+    sparse_zs = []
+    for z in range(sparse.shape[1]):
+        zslice = sparse[0][z].coalesce()
+        rows, cols = zslice.indices()
+        vals = zslice.values()
+        sparse_zs.append(SparseCOO(rows.tolist(), cols.tolist(), vals.tolist(), list(zslice.shape)))
+    return sparse_zs
+
+
+def reference_num_sparse_tiles_in_strip(sparse):
+    rt = align_up_tile(sparse.shape[-2]) // TILE_DIM
+    ct = align_up_tile(sparse.shape[-1]) // TILE_DIM
+    rows, cols = sparse.coalesce().indices().tolist()
+    out = torch.zeros((rt, ct), dtype=torch.int32)
+    for r, c in zip(rows, cols):
+        out[r // TILE_DIM, c // TILE_DIM] = 1
+    return out.sum(dim=-2)
+
+
+def reference_get_sparse_picker_matrix_max_span(sparse):
+    while len(sparse.shape) < 4:
+        sparse = sparse.unsqueeze(0)
+    max_span = -1
+    sparse = sparse.select(dim=0, index=0)
+    for z in range(sparse.shape[0]):
+        rows, cols = sparse.select(dim=0, index=z).coalesce().indices().tolist()
+        non_zero_tiles = {(rows[i] // TILE_DIM, cols[i] // TILE_DIM) for i in range(len(rows))}
+        d = dict()
+        for k, _ in non_zero_tiles:
+            d[k] = d.get(k, 0) + 1
+        max_span = max(max_span, max(d.values()))
+    return max_span
+
+
+def reference_transpose_sparse_picker_matrix(sparse):
+    sparse_r, sparse_c = sparse.shape[-2], sparse.shape[-1]
+    transposed = []
+    for z in range(sparse.shape[0]):
+        s = sparse.select(0, z).coalesce()
+        rows, cols = s.indices()
+        transposed.append(torch.sparse_coo_tensor([cols.tolist(), rows.tolist()], s.values(), (sparse_c, sparse_r), dtype=s.dtype))
+    return torch.stack(transposed)
+
+
+def conv_pickers(builder, iH, iW, kH, kW, stride, padding, dilation):
+    padding = conv2d_padding_to_canonical(padding, (kH, kW))
+    pickers = []
+    for kY in range(kH):
+        for kX in range(kW):
+            y_shift = ((kH - 1) // 2) - kY
+            x_shift = ((kW - 1) // 2) - kX
+            pickers.append(builder(iH, iW, y_shift, x_shift, kH, kW, [stride, stride], padding, dilation, tile_align=True))
+    return torch.stack(pickers).unsqueeze(0)
+
+
+CONV_SHAPES = [
+    # iH, iW, kH, kW, stride, padding, dilation
+    (7, 7, 3, 3, 1, "same", 1),
+    (25, 25, 5, 5, 2, 1, 1),
+    (32, 48, 3, 3, 2, 1, 2),
+    (64, 64, 7, 7, 2, 3, 1),
+    (56, 56, 1, 1, 1, 0, 1),
+]
+
+def _shape_id(shape):
+    return "x".join(str(s) for s in shape)
+
+
+@pytest.mark.parametrize("shape", CONV_SHAPES, ids=_shape_id)
+def test_conv2d_sparse_picker_matrix(shape):
+    iH, iW, kH, kW, stride, padding, dilation = shape
+    padding = conv2d_padding_to_canonical(padding, (kH, kW))
+    for kY in range(kH):
+        for kX in range(kW):
+            args = (iH, iW, ((kH - 1) // 2) - kY, ((kW - 1) // 2) - kX, kH, kW, [stride, stride], padding, dilation)
+            for kwargs in [dict(tile_align=True), dict(tile_align=False), dict(pad_x_only=True), dict(tile_align=True, sparse_r_pad=2, sparse_c_pad=1)]:
+                golden = reference_create_conv2d_sparse_picker_matrix(*args, **kwargs)
+                calculated = create_conv2d_sparse_picker_matrix(*args, **kwargs)
+                assert golden.shape == calculated.shape
+                assert torch.equal(golden.indices(), calculated.indices())
+                assert torch.equal(golden.values(), calculated.values())
+
+
+@pytest.mark.parametrize("shape", CONV_SHAPES, ids=_shape_id)
+def test_sparse_coo_zslices(shape):
+    sparse = conv_pickers(create_conv2d_sparse_picker_matrix, *shape)
+    golden = reference_sparse_coo_zslices(sparse)
+    calculated = sparse_coo_zslices(sparse)
+    assert len(golden) == len(calculated)
+    for g, c in zip(golden, calculated):
+        assert g.rows == c.rows
+        assert g.cols == c.cols
+        assert g.vals == c.vals
+        assert g.shape == c.shape
+
+
+@pytest.mark.parametrize("shape", CONV_SHAPES, ids=_shape_id)
+def test_sparse_tile_counts(shape):
+    sparse = conv_pickers(create_conv2d_sparse_picker_matrix, *shape)
+    assert get_sparse_picker_matrix_max_span(sparse) == reference_get_sparse_picker_matrix_max_span(sparse)
+    for z in range(sparse.shape[1]):
+        zslice = sparse[0][z]
+        assert torch.equal(num_sparse_tiles_in_strip(zslice), reference_num_sparse_tiles_in_strip(zslice))
+
+
+@pytest.mark.parametrize("shape", CONV_SHAPES, ids=_shape_id)
+def test_transpose_sparse_picker_matrix(shape):
+    sparse = conv_pickers(create_conv2d_sparse_picker_matrix, *shape).select(0, 0)
+    golden = reference_transpose_sparse_picker_matrix(sparse)
+    calculated = transpose_sparse_picker_matrix(sparse)
+    assert golden.shape == calculated.shape
+    assert torch.equal(golden.to_dense(), calculated.to_dense())
+
+
+def test_picker_matrix_cache():
+    clear_picker_matrix_cache()
+    args = (28, 28, 0, 0, 3, 3, [1, 1], [1, 1, 1, 1], 1)
+    first = create_conv2d_sparse_picker_matrix(*args, tile_align=True)
+    second = create_conv2d_sparse_picker_matrix(*args, tile_align=True)
+    other = create_conv2d_sparse_picker_matrix(*args, tile_align=False)
+
+    assert torch.equal(first.to_dense(), second.to_dense())
+    assert get_picker_matrix_cache_stats() == {"hits": 1, "misses": 2, "entries": 2}
+
+    # Callers get their own copy, so modifying one in place doesn't leak into the cache
+    assert first is not second
+    first.mul_(0)
+    third = create_conv2d_sparse_picker_matrix(*args, tile_align=True)
+    assert torch.equal(third.to_dense(), second.to_dense())
+    assert third.to_dense().abs().sum() > 0
+
+    clear_picker_matrix_cache()
+    assert get_picker_matrix_cache_stats() == {"hits": 0, "misses": 0, "entries": 0}
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+
+# SPDX-License-Identifier: Apache-2.0
+#
+# Tests for timeline tracing exported as Chrome trace JSON
+#
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+# Tracing is set up on import, so it's driven from a separate interpreter with the environment set
+SCRIPT = textwrap.dedent("""
+    import multiprocessing
+    import os
+    import threading
+    from pybuda import timeline
+
+    @timeline.traced()
+    def convert():
+        pass
+
+    def child():
+        with timeline.span("child_work", index=1):
+            pass
+
+    if __name__ == "__main__":
+        assert timeline.enabled == (os.environ["PYBUDA_TIMELINE_TRACE"] != "")
+        convert()
+        t = threading.Thread(target=convert, name="worker")
+        t.start()
+        t.join()
+
+        p = multiprocessing.get_context("spawn").Process(target=child, name="cpu0")
+        p.start()
+        p.join()
+        assert p.exitcode == 0
+""")
+
+
+def run_script(tmp_path, env):
+    script = tmp_path / "trace_script.py"
+    script.write_text(SCRIPT)
+    subprocess.run([sys.executable, str(script)], check=True, env={**os.environ, **env}, cwd=tmp_path)
+
+
+def test_timeline_trace(tmp_path):
+    trace_file = tmp_path / "timeline.json"
+    run_script(tmp_path, {"PYBUDA_TIMELINE_TRACE": str(trace_file)})
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert sorted(e["name"] for e in spans) == ["child_work", "convert", "convert"]
+    assert all(e["dur"] >= 0 for e in spans)
+
+    child = next(e for e in spans if e["name"] == "child_work")
+    assert child["args"] == {"index": "1"}
+
+    # One track per process and thread
+    convert_spans = [e for e in spans if e["name"] == "convert"]
+    assert len({e["tid"] for e in convert_spans}) == 2
+    assert child["pid"] != convert_spans[0]["pid"]
+
+    process_names = {e["pid"]: e["args"]["name"] for e in events if e["name"] == "process_name"}
+    assert process_names[child["pid"]] == "cpu0"
+    thread_names = {e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert "worker" in thread_names
+
+    # Parts are cleaned up once merged
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".parts")] == []
+
+
+def test_timeline_disabled(tmp_path):
+    run_script(tmp_path, {"PYBUDA_TIMELINE_TRACE": ""})
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".json" or p.name.endswith(".parts")] == []
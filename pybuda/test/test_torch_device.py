@@ -105,6 +105,57 @@ def test_linear():
 
     assert pybuda.op.eval.compare_tensor_to_golden(f"linear", golden, result, is_buda=True, pcc=0.99)
 
+def test_compile_cache(monkeypatch, tmp_path):
+    from pybuda.torch_compile import reset_state, get_compile_cache
+
+    class Linear(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = nn.Linear(32, 64, bias=True)
+
+        def forward(self, x1):
+            return self.linear(x1)
+
+    os.environ["PYBUDA_DEVMODE"] = "1"
+    monkeypatch.setenv("PYBUDA_COMPILE_CACHE_DIR", str(tmp_path))
+    model = Linear()
+    inputs = [torch.rand(1, 32, 32)]
+    golden = model(*inputs)
+
+    def run(model):
+        # Start from a clean process state, so only the on-disk cache can be hit
+        torch._dynamo.reset()
+        reset_state()
+        result = torch.compile(model, backend=compile_torch)(*inputs)
+        return result.to("cpu")
+
+    run(model)
+    assert get_compile_cache().stats() == {"hits": 0, "misses": 1}
+
+    # Same graph and weights in a fresh module hit the cache
+    model_copy = Linear()
+    model_copy.load_state_dict(model.state_dict())
+    result = run(model_copy)
+    assert get_compile_cache().stats() == {"hits": 1, "misses": 1}
+    assert pybuda.op.eval.compare_tensor_to_golden(f"linear", golden, result, is_buda=True, pcc=0.99)
+
+    # Changed weights are recompiled
+    run(Linear())
+    assert get_compile_cache().stats() == {"hits": 1, "misses": 2}
+
+def test_compile_cache_evicts_corrupt_entry(tmp_path):
+    from pybuda.torch_compile import CompileCache
+
+    cache = CompileCache(str(tmp_path), max_bytes=1 << 30)
+    entry_dir = tmp_path / "entry"
+    entry_dir.mkdir()
+    # Truncated pickle, as left by a crash while the entry was written
+    (entry_dir / CompileCache.STATE_FILE_NAME).write_bytes(b"\x80\x04\x95")
+
+    assert cache.get("entry", "digest") is None
+    assert cache.stats() == {"hits": 0, "misses": 1}
+    assert not entry_dir.exists()
+
 def test_bert():
     os.environ["PYBUDA_DEVMODE"] = "1"
     compile_cfg = pybuda.config._get_global_compiler_config()
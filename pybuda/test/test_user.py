@@ -295,6 +295,171 @@ def test_setup_forward_calls():
         print(_safe_read(output_q))
 
 
+#
+# Run inference from asyncio code, with many requests in flight
+#
+def test_async_inference_cpu():
+    import asyncio
+
+    model = PyTorchTestModule()
+    cpu0 = pybuda.CPUDevice("cpu0", module=pybuda.PyTorchModule("stage0", model))
+
+    inputs = [(torch.rand(4, 32, 32), torch.rand(4, 32, 32)) for _ in range(8)]
+    pipeline = pybuda.AsyncInferencePipeline(sample_inputs=inputs[0], max_in_flight=4, _sequential=True)
+
+    async def run():
+        async with pipeline:
+            return await asyncio.gather(*[pipeline.infer(i) for i in inputs])
+
+    results = asyncio.run(run())
+    for (act1, act2), outputs in zip(inputs, results):
+        golden = model(act1, act2)[0]
+        assert torch.allclose(pybuda.tensor.to_pt_tensors(outputs)[0], golden)
+
+
+#
+# A failed forward pass fails the pipeline, rather than leaving outputs unmatched to requests
+#
+def test_async_inference_run_forward_error(monkeypatch):
+    import asyncio
+
+    model = PyTorchTestModule()
+    cpu0 = pybuda.CPUDevice("cpu0", module=pybuda.PyTorchModule("stage0", model))
+
+    inputs = (torch.rand(4, 32, 32), torch.rand(4, 32, 32))
+    pipeline = pybuda.AsyncInferencePipeline(sample_inputs=inputs, _sequential=True)
+
+    def failing_run_forward(*args, **kwargs):
+        raise RuntimeError("run_forward failed")
+    monkeypatch.setattr(pybuda.run.async_api, "run_forward", failing_run_forward)
+
+    async def run():
+        async with pipeline:
+            with pytest.raises(RuntimeError, match="run_forward failed"):
+                await pipeline.infer(inputs)
+            assert pipeline.in_flight() == 0
+            with pytest.raises(RuntimeError, match="run_forward failed"):
+                await pipeline.infer(inputs)
+
+    asyncio.run(run())
+
+
+#
+# Batch single-row requests into the compiled microbatch
+#
+def test_dynamic_batching_cpu():
+    import asyncio
+
+    model = PyTorchTestModule()
+    cpu0 = pybuda.CPUDevice("cpu0", module=pybuda.PyTorchModule("stage0", model))
+
+    microbatch_size = 4
+    pipeline = pybuda.AsyncInferencePipeline(sample_inputs=(torch.rand(microbatch_size, 32, 32), torch.rand(microbatch_size, 32, 32)), _sequential=True)
+    batcher = pybuda.DynamicBatcher(pipeline, microbatch_size=microbatch_size, max_wait_ms=20)
+
+    # 10 requests don't divide into microbatches of 4, so at least one batch is padded
+    inputs = [(torch.rand(1, 32, 32), torch.rand(1, 32, 32)) for _ in range(10)]
+
+    async def run():
+        async with pipeline:
+            results = await asyncio.gather(*[batcher.infer(i) for i in inputs])
+            await batcher.close()
+            return results
+
+    results = asyncio.run(run())
+    for (act1, act2), outputs in zip(inputs, results):
+        assert outputs[0].shape[0] == 1
+        assert torch.allclose(outputs[0], model(act1, act2)[0], atol=1e-5)
+
+    stats = batcher.stats()
+    assert stats["requests"] == 10
+    assert stats["batches"] >= 3
+    assert 0 < stats["fill_ratio"] <= 1
+    assert stats["latency_ms_p50"] <= stats["latency_ms_p99"]
+
+
+#
+# Closing the batcher cancels requests it has collected but not dispatched yet
+#
+def test_dynamic_batching_close_while_collecting():
+    import asyncio
+
+    class IdlePipeline:
+        max_in_flight = 1
+
+        async def infer(self, inputs):
+            assert False, "Batch shouldn't be dispatched"
+
+    batcher = pybuda.DynamicBatcher(IdlePipeline(), microbatch_size=4, max_wait_ms=60000)
+
+    async def run():
+        request = asyncio.ensure_future(batcher.infer((torch.rand(1, 32, 32),)))
+        await asyncio.sleep(0.1) # taken off the queue, waiting for more rows
+        await batcher.close()
+        return await asyncio.wait_for(asyncio.gather(request, return_exceptions=True), 5)
+
+    result, = asyncio.run(run())
+    assert isinstance(result, asyncio.CancelledError)
+
+
+#
+# Requests that wait for a batch slot past their deadline are still batched together
+#
+def test_dynamic_batching_fills_batches_under_load():
+    import asyncio
+
+    class BlockingPipeline:
+        max_in_flight = 1
+
+        def __init__(self):
+            self.release = asyncio.Event()
+            self.batch_rows = []
+
+        async def infer(self, inputs):
+            # Padding rows are zeros, request rows are ones
+            self.batch_rows.append(int(inputs[0].sum().item()))
+            await self.release.wait()
+            return [inputs[0]]
+
+    async def run():
+        pipeline = BlockingPipeline()
+        batcher = pybuda.DynamicBatcher(pipeline, microbatch_size=4, max_wait_ms=1)
+
+        # The first batch holds the only slot until it's released
+        first = asyncio.ensure_future(batcher.infer((torch.ones(1, 1),)))
+        await asyncio.sleep(0.05)
+        queued = [asyncio.ensure_future(batcher.infer((torch.ones(1, 1),))) for _ in range(4)]
+        await asyncio.sleep(0.05)
+
+        pipeline.release.set()
+        await asyncio.wait_for(asyncio.gather(first, *queued), 5)
+        await batcher.close()
+        return pipeline.batch_rows
+
+    assert asyncio.run(run()) == [1, 4]
+
+
+#
+# Command dispatch latency is recorded on each device
+#
+@pytest.mark.parametrize("sequential", [True, False], ids=["sequential", "concurrent"])
+def test_dispatch_stats_cpu(sequential):
+    model = PyTorchTestModule()
+    cpu0 = pybuda.CPUDevice("cpu0", module=pybuda.PyTorchModule("stage0", model))
+
+    inputs = [(torch.rand(4, 32, 32), torch.rand(4, 32, 32)) for _ in range(4)]
+    output_q = pybuda.initialize_pipeline(training=False, sample_inputs=inputs[0], _sequential=sequential)
+    for i in inputs:
+        cpu0.push_to_inputs(i)
+        pybuda.run_forward(input_count=1, _sequential=sequential)
+    for _ in inputs:
+        output_q.get(timeout=30)
+
+    stats = pybuda.get_dispatch_stats()["cpu0"]
+    assert stats["RUN_FORWARD"]["count"] >= len(inputs)
+    assert 0 <= stats["RUN_FORWARD"]["p50_ms"] <= stats["RUN_FORWARD"]["p99_ms"]
+
+
 #
 # Run inference in concurrent mode, then push more inputs afterwards (won't work on Golden)
 #
@@ -496,6 +496,92 @@ def test_tti_bert_encoder(test_device):
         ),
     )
 
+
+def test_tti_archive_writer(tmp_path):
+    import tarfile
+    from pybuda.tti.archive import TTIArchive, TTIArchiveWriter
+
+    src_dir = tmp_path / "build"
+    (src_dir / "sub").mkdir(parents=True)
+    (src_dir / "netlist.yaml").write_text("netlist")
+    (src_dir / "run.log").write_text("log")
+    (src_dir / "sub" / "kernel.bin").write_bytes(b"kernel")
+
+    archive_path = tmp_path / "image.tti"
+    writer = TTIArchiveWriter(str(archive_path), TTIArchive.TTI_UNZIPPED_DIR_NAME, num_threads=4)
+    writer.add_tree("backend_build_binaries", str(src_dir), exclude=TTIArchive.BACKEND_BUILD_FILES_EXCLUDE)
+    for i in range(8):
+        writer.submit(f"tensors/t{i}.pkl", lambda i=i: bytes([i]) * 64)
+    writer.submit_file("tensors/t.bin", lambda path: open(path, "wb").write(b"bin"))
+    writer.close()
+
+    with tarfile.open(archive_path) as tar:
+        names = set(tar.getnames())
+        assert "unzipped_tti/backend_build_binaries/netlist.yaml" in names
+        assert "unzipped_tti/backend_build_binaries/sub/kernel.bin" in names
+        assert "unzipped_tti/backend_build_binaries/run.log" not in names
+        for i in range(8):
+            assert tar.extractfile(f"unzipped_tti/tensors/t{i}.pkl").read() == bytes([i]) * 64
+        assert tar.extractfile("unzipped_tti/tensors/t.bin").read() == b"bin"
+
+
+def test_tti_archive_tensors_mapped_in_place(tmp_path, monkeypatch):
+    import pickle
+    import struct
+    from pybuda.tti import TTDeviceImage
+    from pybuda.tti.archive import TTIArchive, TTIArchiveWriter, TTDeviceImageJsonDecoder
+
+    weights = torch.rand(2, 3, 4)
+    legacy = torch.arange(12, dtype=torch.float32)
+
+    archive_path = tmp_path / "image.tti"
+    writer = TTIArchiveWriter(str(archive_path), TTIArchive.TTI_UNZIPPED_DIR_NAME, num_threads=2)
+    writer.add_bytes("device.json", b"{}")
+    writer.submit("tensors/weights.pkl", lambda: pickle.dumps(weights))
+    writer.submit("tensors/legacy.bin", lambda: b"".join(struct.pack("f", v) for v in legacy.tolist()))
+    writer.close()
+
+    index = TTIArchive._extract_tti_archive(str(archive_path), str(tmp_path))
+    unzipped_tti_directory = tmp_path / TTIArchive.TTI_UNZIPPED_DIR_NAME
+    assert (unzipped_tti_directory / "device.json").exists()
+    assert not (unzipped_tti_directory / "tensors" / "weights.pkl").exists()
+
+    d = {"weights": "tensors/weights.pkl"}
+    TTDeviceImageJsonDecoder.postprocess_keys(d, str(unzipped_tti_directory), index)
+    assert torch.equal(d["weights"], weights)
+
+    monkeypatch.setattr(TTDeviceImage, "TTI_VERSION", "1.0.0")
+    value = {"bin": "tensors/legacy.bin", "format": "Float32", "shape": [3, 4]}
+    assert torch.equal(TTDeviceImageJsonDecoder.rehash_as_tensor(value, str(unzipped_tti_directory), index), legacy.reshape(3, 4))
+
+
+def test_tti_blob_store(tmp_path, monkeypatch):
+    import pickle
+    from pybuda.tti.archive import TTIArchive, TTIArchiveWriter
+    from pybuda.tti.blob_store import get_tti_blob_store, read_manifest_from_tti
+
+    monkeypatch.setenv("PYBUDA_TTI_BLOB_STORE", str(tmp_path / "blobs"))
+    weights = torch.rand(4, 4)
+
+    # Two variants of the same checkpoint share the weights blob
+    for variant in ["a", "b"]:
+        writer = TTIArchiveWriter(str(tmp_path / f"{variant}.tti"), TTIArchive.TTI_UNZIPPED_DIR_NAME, num_threads=2, blob_store=get_tti_blob_store())
+        writer.submit("tensors/weights.pkl", lambda: pickle.dumps(weights))
+        writer.submit("tensors/bias.pkl", lambda: pickle.dumps(torch.full((4,), ord(variant))))
+        writer.close()
+
+    store = get_tti_blob_store()
+    assert len(list(store.digests())) == 3
+
+    index = TTIArchive._extract_tti_archive(str(tmp_path / "a.tti"), str(tmp_path / "a"))
+    assert torch.equal(pickle.loads(index.view("tensors/weights.pkl")), weights)
+
+    # Only blobs referenced by the remaining image survive gc
+    referenced = set(read_manifest_from_tti(str(tmp_path / "a.tti"))["blobs"].values())
+    assert store.gc(referenced, min_age_secs=0)["removed"] == 1
+    assert set(store.digests()) == referenced
+
+
 if __name__ == "__main__":
     import os
 
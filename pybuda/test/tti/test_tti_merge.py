@@ -5,7 +5,37 @@ import subprocess as sp
 import argparse
 import os
 from loguru import logger
-from pybuda.tools.tti_merge import merge_models
+import pytest
+from pybuda.tools.tti_merge import merge_models, get_dynamic_queue_lifetimes, pack_dram_buffers
+
+@pytest.mark.parametrize("policy", ["best_fit", "coloring"])
+def test_pack_dram_buffers(policy):
+    align = lambda addr: (addr + 31) // 32 * 32
+    programs = []
+    buffers = []
+    for model in range(4):
+        # Three dynamic queues per model, each live for a different part of the program
+        instructions = []
+        for q in range(3):
+            queue = f"model_{model}_dyn_{q}"
+            instructions += [{"allocate_queue": [queue]}, {"execute": {}}, {"deallocate_queue": [queue]}]
+            buffers.append({"queue": queue, "size": 1000, "channel": 0})
+        programs.append({f"model_{model}_run": instructions})
+        buffers.append({"queue": f"model_{model}_weights", "size": 4000, "channel": 0})
+
+    lifetimes = get_dynamic_queue_lifetimes({"programs": programs})
+    for buffer in buffers:
+        buffer["lifetime"] = lifetimes.get(buffer["queue"], None)
+
+    channel_bases = {chan: 0 for chan in range(4)}
+    footprint = pack_dram_buffers(buffers, channel_bases, 2**31, align, policy, allow_channel_switch=True)
+
+    # Weights spread over all channels, and all dynamic queues share a single slot
+    assert sorted(footprint.values()) == [4000, 4000, 4000, align(4000 + 1000)]
+    for a in buffers:
+        for b in buffers:
+            if a is not b and a["channel"] == b["channel"] and (a["lifetime"] is None or b["lifetime"] is None or a["lifetime"] == b["lifetime"]):
+                assert a["addr"] + a["size"] <= b["addr"] or b["addr"] + b["size"] <= a["addr"]
 
 if __name__ == "__main__":
     try:
@@ -89,6 +89,81 @@ def test_linear():
     evaluate_framework_vs_pybuda(model, res, act1)
 
 
+def test_tvm_codegen_cache(monkeypatch, tmp_path):
+    import pybuda.tvm_to_python as tvm_to_python
+
+    class Linear(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.l1 = nn.Linear(64, 64, bias=True)
+
+        def forward(self, x1):
+            return nn.functional.gelu(self.l1(x1))
+
+    monkeypatch.setenv("PYBUDA_TVM_CODEGEN_CACHE_DIR", str(tmp_path))
+    model = Linear()
+    act1 = torch.rand((1, 128, 64))
+    compiler_cfg = CompilerConfig(enable_training=False)
+
+    mods, _, _ = tvm_to_python.generate_pybuda_module(PyTorchModule("codegen_cache", model), (act1,), compiler_cfg=compiler_cfg, verify_cfg=None)
+    assert tvm_to_python.get_tvm_codegen_cache().stats() == {"hits": 0, "misses": 1}
+
+    # Same graph, weights and inputs are restored from the cache without running TVM
+    def compile_tvm_to_python(*args, **kwargs):
+        assert False, "Expected a TVM codegen cache hit"
+
+    monkeypatch.setattr(tvm_to_python, "compile_tvm_to_python", compile_tvm_to_python)
+    cached_mods, _, _ = tvm_to_python.generate_pybuda_module(PyTorchModule("codegen_cache", model), (act1,), compiler_cfg=compiler_cfg, verify_cfg=None)
+    assert tvm_to_python.get_tvm_codegen_cache().stats() == {"hits": 1, "misses": 1}
+    for param, cached_param in zip(mods[0].get_parameters(), cached_mods[0].get_parameters()):
+        assert torch.equal(param.value(), cached_param.value())
+    # Restored under the name this compile would have used, so earlier modules and their params stay intact
+    assert cached_mods[0].get_name() != mods[0].get_name()
+
+    # Attributes that change forward are part of the key
+    model.approximate = True
+    with pytest.raises(AssertionError, match="Expected a TVM codegen cache hit"):
+        tvm_to_python.generate_pybuda_module(PyTorchModule("codegen_cache", model), (act1,), compiler_cfg=compiler_cfg, verify_cfg=None)
+    del model.approximate
+
+    # Different input shapes miss the cache
+    monkeypatch.undo()
+    monkeypatch.setenv("PYBUDA_TVM_CODEGEN_CACHE_DIR", str(tmp_path))
+    tvm_to_python.generate_pybuda_module(PyTorchModule("codegen_cache", model), (torch.rand((1, 64, 64)),), compiler_cfg=compiler_cfg, verify_cfg=None)
+    assert tvm_to_python.get_tvm_codegen_cache().stats() == {"hits": 1, "misses": 3}
+
+
+def test_param_hand_off(tmp_path):
+    from pybuda.tensor import load_serialized_params, replace_inf_values
+
+    params = {
+        "finite": torch.rand(64, 64),
+        "inf": torch.tensor([1.0, float("inf"), -float("inf")]),
+        "nan_and_inf": torch.tensor([float("nan"), float("inf")]),
+        "int": torch.arange(4),
+    }
+    param_file_name = str(tmp_path / "params.pt")
+    torch.save(params, param_file_name)
+    loaded = load_serialized_params(param_file_name)
+
+    replaced = replace_inf_values(loaded)
+    # Tensors without infinities aren't copied
+    assert replaced["finite"] is loaded["finite"]
+    assert replaced["int"] is loaded["int"]
+    assert torch.equal(replaced["inf"], torch.tensor([1.0, 1e4, -1e4]))
+    assert torch.isnan(replaced["nan_and_inf"][0]) and replaced["nan_and_inf"][1] == 1e4
+
+
+def test_input_indices_with_equal_values():
+    from pybuda.tvm_to_python import get_input_indices
+
+    # Zero-filled past caches hold equal values, but are still distinct inputs
+    past = [torch.zeros(1, 4, 32, 32) for _ in range(4)]
+    inputs = [torch.ones(1, 32)] + past + [past[0]]
+    assert get_input_indices(inputs, inputs) == {i: i for i in range(len(inputs))}
+    assert get_input_indices(inputs, [None, past[1], None, None, None, None]) == {2: 1}
+
+
 def test_linear_tf():
     
     class DoubleLinear(tf.keras.Model):